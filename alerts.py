@@ -0,0 +1,261 @@
+"""
+Incremental evaluation of user sentiment alerts.
+
+`AlertIndex` keeps every `AlertSettings` row in memory, grouped by symbol
+and sorted by threshold. A positive threshold fires when an article's
+polarity is at or above it; a negative threshold fires when polarity is at
+or below it. A threshold of 0 is rejected when an alert is created, and a
+row stored with one anyway never fires. Matching an article is a binary
+search per mentioned symbol, so the cost grows with the number of
+matches, not with the number of users.
+
+The index follows committed changes to AlertSettings through SQLAlchemy
+session events. Those only see the current process, so every transaction
+that changes AlertSettings, including bulk `Query.update()`/`delete()`
+calls, also bumps the `AlertSettingsVersion` row. Before each evaluation
+the app calls `sync_alerts()`, which reads that one row and reloads the
+index only when the version has moved since the index was loaded, e.g.
+after another gunicorn worker changed an alert, or when a worker has just
+taken the ingestion lease over.
+"""
+import bisect
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models import db, AlertOutbox, AlertSettings, AlertSettingsVersion, Article
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+class AlertError(Exception):
+    """Custom exception for alert evaluation errors"""
+    pass
+
+@dataclass(frozen=True)
+class Alert:
+    """In-memory copy of an AlertSettings row"""
+    id: int
+    user_id: int
+    crypto_symbol: str
+    sentiment_threshold: float
+    email_alerts: bool
+
+    @classmethod
+    def from_row(cls, row: AlertSettings) -> 'Alert':
+        return cls(
+            id=row.id,
+            user_id=row.user_id,
+            crypto_symbol=(row.crypto_symbol or '').upper(),
+            sentiment_threshold=float(row.sentiment_threshold),
+            email_alerts=bool(row.email_alerts)
+        )
+
+class _ThresholdList:
+    """Alerts sorted by (threshold, id), with the sort keys in a parallel list for bisect"""
+    __slots__ = ('keys', 'alerts')
+
+    def __init__(self):
+        self.keys: List[Tuple[float, int]] = []
+        self.alerts: List[Alert] = []
+
+    def insert(self, alert: Alert) -> None:
+        key = (alert.sentiment_threshold, alert.id)
+        i = bisect.bisect_left(self.keys, key)
+        self.keys.insert(i, key)
+        self.alerts.insert(i, alert)
+
+    def remove(self, alert: Alert) -> None:
+        i = bisect.bisect_left(self.keys, (alert.sentiment_threshold, alert.id))
+        if i < len(self.keys) and self.keys[i][1] == alert.id:
+            del self.keys[i]
+            del self.alerts[i]
+
+    def at_most(self, value: float) -> List[Alert]:
+        return self.alerts[:bisect.bisect_right(self.keys, (value, float('inf')))]
+
+    def at_least(self, value: float) -> List[Alert]:
+        return self.alerts[bisect.bisect_left(self.keys, (value, float('-inf'))):]
+
+class AlertIndex:
+    """Symbol -> threshold-sorted alerts, kept in step with AlertSettings"""
+    def __init__(self):
+        self._rising: Dict[str, _ThresholdList] = {}
+        self._falling: Dict[str, _ThresholdList] = {}
+        self._by_id: Dict[int, Alert] = {}
+        self._lock = threading.Lock()
+        # AlertSettingsVersion the contents were loaded at; None before the first load
+        self.version: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def load(self, rows: Iterable[AlertSettings]) -> None:
+        """Replace the index contents with the given rows"""
+        with self._lock:
+            self._rising.clear()
+            self._falling.clear()
+            self._by_id.clear()
+            for row in rows:
+                self._add(Alert.from_row(row))
+        logger.info(f"Loaded {len(self._by_id)} alerts")
+
+    def upsert(self, alert: Alert) -> None:
+        """Add an alert or replace the stored version of it"""
+        with self._lock:
+            self._remove(alert.id)
+            self._add(alert)
+
+    def remove(self, alert_id: int) -> None:
+        with self._lock:
+            self._remove(alert_id)
+
+    def match(self, symbol: str, polarity: float) -> List[Alert]:
+        """Alerts on `symbol` whose threshold the polarity crosses"""
+        with self._lock:
+            matches = []
+            rising = self._rising.get(symbol)
+            if rising is not None:
+                matches.extend(rising.at_most(polarity))
+            falling = self._falling.get(symbol)
+            if falling is not None:
+                matches.extend(falling.at_least(polarity))
+            return matches
+
+    def _add(self, alert: Alert) -> None:
+        if alert.sentiment_threshold == 0:
+            return
+        side = self._rising if alert.sentiment_threshold > 0 else self._falling
+        side.setdefault(alert.crypto_symbol, _ThresholdList()).insert(alert)
+        self._by_id[alert.id] = alert
+
+    def _remove(self, alert_id: int) -> None:
+        alert = self._by_id.pop(alert_id, None)
+        if alert is None:
+            return
+        side = self._rising if alert.sentiment_threshold > 0 else self._falling
+        thresholds = side.get(alert.crypto_symbol)
+        if thresholds is not None:
+            thresholds.remove(alert)
+            if not thresholds.keys:
+                del side[alert.crypto_symbol]
+
+# Kept current by the session listeners below
+alert_index = AlertIndex()
+
+_PENDING_KEY = 'pending_alert_changes'
+
+@event.listens_for(Session, 'after_flush')
+def _collect_alert_changes(session, flush_context):
+    changes = session.info.setdefault(_PENDING_KEY, {})
+    changed = False
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, AlertSettings) and obj.id is not None:
+            changes[obj.id] = Alert.from_row(obj)
+            changed = True
+    for obj in session.deleted:
+        if isinstance(obj, AlertSettings) and obj.id is not None:
+            changes[obj.id] = None
+            changed = True
+    if changed:
+        AlertSettingsVersion.bump(session.connection())
+
+@event.listens_for(Session, 'do_orm_execute')
+def _bump_on_bulk_alert_changes(orm_execute_state):
+    # Bulk updates and deletes skip the flush events above
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if any(mapper.class_ is AlertSettings for mapper in orm_execute_state.all_mappers):
+        AlertSettingsVersion.bump(orm_execute_state.session.connection())
+
+@event.listens_for(Session, 'after_commit')
+def _apply_alert_changes(session):
+    changes = session.info.pop(_PENDING_KEY, None)
+    for alert_id, alert in (changes or {}).items():
+        if alert is None:
+            alert_index.remove(alert_id)
+        else:
+            alert_index.upsert(alert)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_alert_changes(session):
+    session.info.pop(_PENDING_KEY, None)
+
+def reload_alerts(index: AlertIndex = alert_index) -> int:
+    """Replace the index contents with the committed AlertSettings rows; returns how many"""
+    # Read before the rows, so a change committed in between triggers another reload
+    version = AlertSettingsVersion.current()
+    index.load(AlertSettings.query.all())
+    index.version = version
+    return len(index)
+
+def sync_alerts(index: AlertIndex = alert_index) -> bool:
+    """
+    Reload the index if AlertSettings changed since it was loaded.
+
+    Costs one single-row query when nothing changed.
+
+    Returns:
+        True if the index was reloaded
+    """
+    if index.version is not None and AlertSettingsVersion.current() == index.version:
+        return False
+    reload_alerts(index)
+    return True
+
+def evaluate_articles(articles: Iterable[Dict], index: AlertIndex = alert_index) -> int:
+    """
+    Queue outbox rows for every alert the articles trigger.
+
+    Articles must be processed dicts carrying 'symbols' and 'sentiment' and
+    already stored by `Article.bulk_upsert`. Runs inside the caller's app
+    context and commits its own transaction.
+
+    Returns:
+        Number of outbox rows inserted; matches already queued are not counted
+    """
+    matches = []
+    for article in articles:
+        polarity = float((article.get('sentiment') or {}).get('polarity', 0.0))
+        for symbol in article.get('symbols') or ():
+            for alert in index.match(symbol, polarity):
+                matches.append((article, alert, polarity))
+    if not matches:
+        return 0
+
+    hashes = {
+        id(article): Article.hash_link(article.get('url') or article.get('link', ''))
+        for article, _, _ in matches
+    }
+    ids_by_hash = Article.ids_by_hash(set(hashes.values()))
+    rows = []
+    for article, alert, polarity in matches:
+        article_id = ids_by_hash.get(hashes[id(article)])
+        if article_id is None:
+            logger.warning(f"Skipping alert {alert.id}: article not stored")
+            continue
+        rows.append({
+            'alert_id': alert.id,
+            'user_id': alert.user_id,
+            'article_id': article_id,
+            'crypto_symbol': alert.crypto_symbol,
+            'polarity': polarity,
+            'sentiment_threshold': alert.sentiment_threshold,
+            'email_alerts': alert.email_alerts
+        })
+
+    try:
+        queued = AlertOutbox.enqueue(rows)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise AlertError(f"Failed to queue alerts: {e}")
+    return queued
@@ -1,62 +1,256 @@
-from flask import Flask, render_template
+from flask import Flask, Response, jsonify, make_response, render_template, request, stream_with_context
 from news_collector import fetch_crypto_news, NewsCollectionError
-from text_processing import clean_text, TextProcessingError
-from classification import analyze_sentiment, SentimentAnalysisError
+from ingestion import IngestionScheduler, IngestionError
+from shared_snapshot import SharedSnapshotStore
+from dedup import duplicate_detector
+from search_index import search_index, SearchError
+from rolling_sentiment import rolling_sentiment, RollingSentimentError, DEFAULT_WINDOW, WINDOWS
+from pipeline import article_pipeline, process_article, process_articles
+from page_cache import page_cache
+from classification import sentiment_cache
+from date_parsing import date_parser
+from metrics import registry, CONTENT_TYPE, ERRORS, RENDER_SECONDS
+from profiling import profiler, verify, PROFILE_HEADER
+from article_api import page, etag_for, gzip_body, ArticleApiError, DEFAULT_PAGE_SIZE
+from models import db, Article, SentimentRollup
+from alerts import evaluate_articles, sync_alerts, AlertError
+from config import config
+from init import warm_up
+import contextlib
+import functools
+import json
 import logging
+import threading
+import time
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
+app.config['SQLALCHEMY_DATABASE_URI'] = config.SQLALCHEMY_DATABASE_URI
+app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+db.init_app(app)
 
-def process_article(article):
-    """Process a single article with text cleaning and sentiment analysis"""
-    try:
-        # Clean the article summary
-        cleaned_summary = clean_text(
-            article.get('summary', ''),
-            preserve_numbers=True,
-            preserve_urls=True,
-            max_length=300
-        )
+# Importing the app touches no database; tables are created on first use
+_startup_lock = threading.Lock()
+_tables_created = False
+_history_loaded = False
 
-        # Analyze sentiment with current timestamp
-        sentiment_result = analyze_sentiment(
-            cleaned_summary,
-            user="kaxm23",
-            timestamp="2025-02-08 22:44:10"
-        )
+def ensure_tables():
+    """Create missing tables once per process"""
+    global _tables_created
+    if _tables_created:
+        return
+    with _startup_lock:
+        if not _tables_created:
+            with app.app_context():
+                db.create_all()
+            _tables_created = True
 
-        # Return processed article with sentiment
-        return {
-            'title': article.get('title', ''),
-            'summary': cleaned_summary,
-            'url': article.get('link', ''),
-            'published_date': article.get('published_date', "2025-02-08 22:44:10"),
-            'sentiment': sentiment_result.to_dict()  # This ensures sentiment is a dictionary
-        }
-    except (TextProcessingError, SentimentAnalysisError) as e:
-        logger.error(f"Error processing article: {e}")
-        return None
+def load_history():
+    """
+    Fill the in-memory live aggregates from the database once, and start
+    rebuilding the search index in the background.
+    """
+    global _history_loaded
+    if _history_loaded:
+        return
+    ensure_tables()
+    with _startup_lock:
+        if _history_loaded:
+            return
+        with app.app_context():
+            rolling_sentiment.add_articles(Article.tagged_since(int(time.time()) - max(WINDOWS.values())))
+            # Later copies of stories stored before a restart still collapse into them
+            remembered = duplicate_detector.seed(
+                {'link': link, 'title': title, 'summary': summary}
+                for link, title, summary in reversed(
+                    db.session.query(Article.link, Article.title, Article.summary)
+                    .order_by(Article.published_ts.desc(), Article.id.desc())
+                    .limit(config.DEDUP_MAX_ARTICLES).all()
+                )
+            )
+            logger.info(f"Seeded duplicate detection with {remembered} stored articles")
+        threading.Thread(target=backfill_search_index, name='search-backfill', daemon=True).start()
+        _history_loaded = True
 
-@app.route('/')
-def index():
+def backfill_search_index():
+    """
+    Index stored articles from the last SEARCH_HISTORY_DAYS, oldest first.
+
+    Runs beside request handling and ingestion; each article is added under
+    the index lock on its own, so searches are never blocked for the whole
+    rebuild and articles ingested meanwhile are not indexed twice.
+    """
+    since = int(time.time()) - config.SEARCH_HISTORY_DAYS * 86400
+    start = time.perf_counter()
     try:
-        # Fetch raw articles
-        raw_articles = fetch_crypto_news(max_articles=10)
-        
-        # Process articles with sentiment analysis
-        processed_articles = []
-        for article in raw_articles:
-            processed = process_article(article)
-            if processed:
-                processed_articles.append(processed)
-        
+        with app.app_context():
+            added = search_index.add_many(
+                article.to_processed()
+                for article in Article.query.filter(Article.published_ts >= since)
+                .order_by(Article.published_ts, Article.id).yield_per(1000)
+            )
+    except Exception as e:
+        ERRORS.labels('search_backfill').inc()
+        logger.error(f"Search index backfill failed: {e}")
+        return
+    logger.info(f"Indexed {added} stored articles for search in {time.perf_counter() - start:.1f}s")
+
+# Feeds are fetched and scored in the background; requests only read snapshots.
+# Syndicated copies of a story are collapsed first so each is scored once.
+# With a shared snapshot file, one worker ingests and the others load its snapshots.
+scheduler = IngestionScheduler(
+    fetch=lambda: duplicate_detector.collapse(fetch_crypto_news(max_articles=config.MAX_ARTICLES)),
+    process=process_article,
+    process_batch=process_articles,
+    interval=config.NEWS_UPDATE_INTERVAL,
+    cycle_context=lambda: (
+        profiler.profile('ingestion') if config.PROFILING_ENABLED else contextlib.nullcontext()
+    ),
+    shared=SharedSnapshotStore(
+        config.SHARED_SNAPSHOT_PATH,
+        lease_seconds=config.SHARED_SNAPSHOT_LEASE,
+        retain=config.SHARED_SNAPSHOT_RETAIN
+    ) if config.SHARED_SNAPSHOT_PATH else None,
+    produce=not config.SHARED_SNAPSHOT_READ_ONLY,
+    poll_interval=config.SHARED_SNAPSHOT_POLL_INTERVAL
+)
+
+def persist_articles(snapshot):
+    """Store newly processed articles in one transaction, then evaluate alerts"""
+    if not snapshot.new_articles:
+        return
+    ensure_tables()
+    with app.app_context():
+        written = Article.bulk_upsert(snapshot.new_articles)
+        logger.info(f"Persisted {written} articles from snapshot v{snapshot.version}")
+        try:
+            # Alerts may have changed through other workers since the last cycle,
+            # and a worker that just took the ingestion lease over has none loaded
+            sync_alerts()
+            queued = evaluate_articles(snapshot.new_articles)
+        except AlertError as e:
+            logger.error(str(e))
+        else:
+            if queued:
+                logger.info(f"Queued {queued} alerts")
+
+def index_articles(snapshot):
+    """Make newly processed articles searchable and update live aggregates"""
+    search_index.add_many(snapshot.new_articles)
+    rolling_sentiment.add_articles(snapshot.new_articles)
+
+def render_pages(snapshot):
+    """Drop pages of older snapshots and pre-render the index for this one"""
+    page_cache.invalidate(snapshot.version)
+    with app.app_context():
+        page_cache.get_or_render('index', snapshot.version, lambda: render_index(snapshot))
+
+scheduler.add_listener(render_pages)
+# Stored once, by the process that produced the snapshot
+scheduler.add_listener(persist_articles, producer_only=True)
+scheduler.add_listener(index_articles)
+
+def cache_requests():
+    pages = page_cache.stats()
+    sentiment = sentiment_cache.stats()
+    return {
+        ('page', 'hit'): pages['hits'],
+        ('page', 'miss'): pages['misses'],
+        ('sentiment', 'hit'): sentiment['hits'],
+        ('sentiment', 'disk_hit'): sentiment['disk_hits'],
+        ('sentiment', 'miss'): sentiment['misses'],
+    }
+
+# Owned by other components; read only when /metrics is scraped
+registry.callback(
+    'crypto_news_cache_requests_total', 'Cache lookups by cache and result',
+    'counter', cache_requests, ['cache', 'result']
+)
+registry.callback(
+    'crypto_news_unparseable_dates_total', 'Feed dates no parser understood',
+    'counter', lambda: {(feed,): n for feed, n in date_parser.stats()['unparseable_by_feed'].items()}, ['feed']
+)
+registry.callback(
+    'crypto_news_snapshot_articles', 'Articles in the published snapshot',
+    'gauge', lambda: len(scheduler.snapshot())
+)
+registry.callback(
+    'crypto_news_snapshot_version', 'Version of the published snapshot',
+    'gauge', lambda: scheduler.snapshot().version
+)
+
+# Models otherwise load lazily on the first score; pay for it before serving traffic
+if config.WARM_UP_ON_START:
+    warm_up()
+
+@app.before_request
+def ensure_ingestion_started():
+    if config.INGESTION_AUTOSTART:
+        load_history()
+        scheduler.start()
+
+def profiled_view(name):
+    """
+    Profile a view when PROFILING_ENABLED is set or the request carries a
+    valid X-Profile signature. Profiled responses carry X-Profile-Id.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            header = request.headers.get(PROFILE_HEADER)
+            if not config.PROFILING_ENABLED and (
+                header is None or not verify(header, request.path, config.PROFILE_SECRET)
+            ):
+                return view(*args, **kwargs)
+            with profiler.profile(name) as run:
+                response = make_response(view(*args, **kwargs))
+            if run.id:
+                response.headers['X-Profile-Id'] = run.id
+            return response
+        return wrapper
+    return decorator
+
+def render_index(snapshot):
+    with RENDER_SECONDS.time():
         return render_template(
             'articles.html',
-            articles=processed_articles,
+            articles=snapshot.articles,
             current_time="2025-02-08 22:44:10",
             current_user="kaxm23"
         )
+
+@app.route('/')
+@profiled_view('index')
+def index():
+    try:
+        snapshot = scheduler.snapshot()
+        if not snapshot.articles and scheduler.last_error:
+            raise NewsCollectionError(scheduler.last_error)
+
+        page = page_cache.get_or_render('index', snapshot.version, lambda: render_index(snapshot))
+        accepts_gzip = request.accept_encodings['gzip'] > 0
+        etags = [page.etag]
+        if accepts_gzip:
+            etags.append(page.gzip_etag)
+        for etag in etags:
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+                response.set_etag(etag)
+                break
+        else:
+            if accepts_gzip:
+                response = Response(page.gzipped, mimetype='text/html')
+                response.headers['Content-Encoding'] = 'gzip'
+                response.set_etag(page.gzip_etag)
+            else:
+                response = Response(page.body, mimetype='text/html')
+                response.set_etag(page.etag)
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
     except Exception as e:
+        ERRORS.labels('index').inc()
         logger.error(f"Error processing articles: {e}")
         return render_template(
             'articles.html',
@@ -66,5 +260,161 @@ def index():
             current_user="kaxm23"
         )
 
+@app.route('/metrics')
+def metrics():
+    """Stage latencies, article counts, cache hits and errors for Prometheus"""
+    return Response(registry.render(), content_type=CONTENT_TYPE)
+
+@app.route('/api/profile/ingestion', methods=['POST'])
+def profile_ingestion():
+    """
+    Run one ingestion cycle now under the profiler and return its hottest
+    functions. Requires an X-Profile header signed for this path.
+    """
+    if not verify(request.headers.get(PROFILE_HEADER, ''), request.path, config.PROFILE_SECRET):
+        return jsonify({'error': 'Missing or invalid X-Profile signature'}), 403
+
+    error = None
+    with profiler.profile('ingestion') as run:
+        try:
+            scheduler.refresh()
+        except IngestionError as e:
+            error = str(e)
+    if run.id is None:
+        return jsonify({'error': 'Another profile is in progress'}), 409
+    return jsonify({'id': run.id, 'path': run.path, 'error': error, 'top': run.top})
+
+@app.route('/api/cache/stats')
+def cache_stats():
+    """Hit ratios of the rendered-page and sentiment caches"""
+    return jsonify({'pages': page_cache.stats(), 'sentiment': sentiment_cache.stats()})
+
+@app.route('/api/articles')
+def api_articles():
+    """
+    Processed articles as JSON, newest first, e.g.
+    /api/articles?limit=20&cursor=<next_cursor>&source=<feed url>
+
+    Pages carry a strong ETag derived from the snapshot's content, so polling
+    clients that send If-None-Match get an empty 304 until new articles are
+    published.
+    """
+    snapshot = scheduler.snapshot()
+    cursor = request.args.get('cursor') or None
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    source = request.args.get('source') or None
+    accepts_gzip = request.accept_encodings['gzip'] > 0
+
+    params = (cursor, limit, source)
+    etags = [etag_for(snapshot, *params)]
+    if accepts_gzip:
+        etags.append(etag_for(snapshot, *params, encoding='gzip'))
+    for etag in etags:
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            break
+    else:
+        if not snapshot.articles and scheduler.last_error:
+            return jsonify({'error': scheduler.last_error}), 503
+        try:
+            result = page(snapshot, cursor=cursor, limit=limit, source=source)
+        except ArticleApiError as e:
+            return jsonify({'error': str(e)}), 400
+
+        body = json.dumps(result).encode('utf-8')
+        response = Response(body, mimetype='application/json')
+        if accepts_gzip and len(body) >= config.API_GZIP_MIN_BYTES:
+            response.set_data(gzip_body(body))
+            response.headers['Content-Encoding'] = 'gzip'
+            response.set_etag(etags[1])
+        else:
+            response.set_etag(etags[0])
+
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/search')
+def search():
+    """Search indexed articles, e.g. /search?q=bitcoin+OR+ethereum+-etf"""
+    query = request.args.get('q', '').strip()
+    limit = min(request.args.get('limit', 20, type=int), 100)
+    try:
+        result = search_index.search(query, limit=max(limit, 1))
+    except SearchError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(dict(result, query=query))
+
+@app.route('/api/sentiment/<symbol>')
+def symbol_sentiment(symbol):
+    """Rolling sentiment for a symbol, e.g. /api/sentiment/btc?window=1h"""
+    window = request.args.get('window', DEFAULT_WINDOW)
+    try:
+        return jsonify(rolling_sentiment.stats(symbol.upper(), window))
+    except RollingSentimentError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/sentiment/<symbol>/history')
+def symbol_sentiment_history(symbol):
+    """
+    Chart points from the sentiment rollups, e.g.
+    /api/sentiment/btc/history?start=1700000000&end=1731536000&resolution=86400
+
+    Use ALL (or *) as the symbol for every article. `start` defaults to 30
+    days before `end`, which defaults to now.
+    """
+    end = request.args.get('end', int(time.time()), type=int)
+    start = request.args.get('start', end - 30 * 86400, type=int)
+    resolution = request.args.get('resolution', type=int)
+    source = request.args.get('source', SentimentRollup.ALL)
+    if start >= end or (resolution is not None and resolution <= 0):
+        return jsonify({'error': 'start must be before end and resolution positive'}), 400
+
+    symbol = symbol.upper()
+    if symbol == 'ALL':
+        symbol = SentimentRollup.ALL
+    ensure_tables()
+    points = SentimentRollup.series(start, end, resolution=resolution, symbol=symbol, source=source)
+    return jsonify({'symbol': symbol, 'source': source, 'start': start, 'end': end, 'points': points})
+
+@app.cli.command('backfill-rollups')
+def backfill_rollups():
+    """Rebuild the sentiment rollup tables from stored articles"""
+    ensure_tables()
+    written = SentimentRollup.rebuild()
+    print(f"Rebuilt {written} rollup rows")
+
+@app.cli.command('ingest')
+def ingest():
+    """Produce shared snapshots in the foreground, e.g. as a sidecar to read-only workers"""
+    if scheduler.shared is None:
+        print("Set SHARED_SNAPSHOT_PATH so web workers can read the snapshots")
+        return
+    scheduler.produce = True
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop()
+
+@app.route('/articles/stream')
+def stream_articles():
+    """Render article cards progressively as each one is fetched and scored"""
+    def articles():
+        try:
+            yield from article_pipeline(max_articles=config.MAX_ARTICLES)
+        except Exception as e:
+            # Headers are already sent; end the list with what was rendered
+            logger.error(f"Error streaming articles: {e}")
+
+    context = {
+        'articles': articles(),
+        'current_time': "2025-02-08 22:44:10",
+        'current_user': "kaxm23"
+    }
+    app.update_template_context(context)
+    template = app.jinja_env.get_template('articles.html')
+    return Response(stream_with_context(template.generate(context)), mimetype='text/html')
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
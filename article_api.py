@@ -0,0 +1,144 @@
+"""
+Paging and HTTP caching helpers for the JSON article API.
+
+Pages are cut from an `ArticleSnapshot`, newest first, using an opaque
+cursor that encodes the (published_ts, url) of the last article returned.
+A page is fully determined by the snapshot and the request parameters.
+The ETag is derived from those, with the snapshot identified by a digest
+of its articles next to its version. Versions are counted per process and
+restart at 1, so the version alone would let two workers, or one worker
+before and after a restart, give different bodies the same tag.
+"""
+import base64
+import binascii
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from ingestion import ArticleSnapshot
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+class ArticleApiError(Exception):
+    """Custom exception for article API errors"""
+    pass
+
+def _sort_key(article: Dict) -> Tuple[int, str]:
+    # Negated so ascending order is newest first
+    return (-int(article.get('published_ts') or 0), _url_key(article))
+
+def _url_key(article: Dict) -> str:
+    return article.get('url') or article.get('link', '')
+
+class _SortedSnapshot:
+    """A snapshot's articles in page order, with their sort keys for bisect"""
+    __slots__ = ('version', 'source', 'articles', 'keys', 'digest')
+
+    def __init__(self, snapshot: ArticleSnapshot):
+        self.version = snapshot.version
+        self.source = snapshot.articles
+        self.articles = sorted(snapshot.articles, key=_sort_key)
+        self.keys = [_sort_key(article) for article in self.articles]
+        # Content identity of the snapshot; computed once per version
+        content = json.dumps(self.articles, sort_keys=True, separators=(',', ':'), default=str)
+        self.digest = hashlib.sha1(content.encode('utf-8')).hexdigest()[:16]
+
+_sorted_lock = threading.Lock()
+_sorted: Optional[_SortedSnapshot] = None
+
+def sorted_snapshot(snapshot: ArticleSnapshot) -> _SortedSnapshot:
+    """Sort a snapshot once; later calls for the same snapshot reuse it"""
+    global _sorted
+    current = _sorted
+    if current is not None and current.source is snapshot.articles:
+        return current
+    with _sorted_lock:
+        if _sorted is None or _sorted.source is not snapshot.articles:
+            _sorted = _SortedSnapshot(snapshot)
+        return _sorted
+
+def encode_cursor(article: Dict) -> str:
+    """Opaque cursor pointing just past `article`"""
+    key = [int(article.get('published_ts') or 0), _url_key(article)]
+    raw = json.dumps(key, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> Tuple[int, str]:
+    """
+    Inverse of `encode_cursor`.
+
+    Raises:
+        ArticleApiError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        published_ts, url = json.loads(raw)
+        return -int(published_ts), str(url)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise ArticleApiError(f"Invalid cursor: {cursor!r}") from e
+
+def page(
+    snapshot: ArticleSnapshot,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    source: Optional[str] = None
+) -> Dict:
+    """
+    One page of articles, newest first.
+
+    Args:
+        snapshot: Snapshot to page through
+        cursor (str, optional): `next_cursor` of the previous page
+        limit (int): Articles per page, capped at MAX_PAGE_SIZE
+        source (str, optional): Only articles from this source
+
+    Returns:
+        Dict with 'version', 'articles' and 'next_cursor' (None on the last page)
+
+    Raises:
+        ArticleApiError: If the cursor is malformed
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    ordered = sorted_snapshot(snapshot)
+    start = bisect_right(ordered.keys, decode_cursor(cursor)) if cursor else 0
+
+    articles: List[Dict] = []
+    position = start
+    while position < len(ordered.articles) and len(articles) < limit:
+        article = ordered.articles[position]
+        if source is None or article.get('source') == source:
+            articles.append(article)
+        position += 1
+    has_more = any(
+        source is None or article.get('source') == source
+        for article in ordered.articles[position:]
+    )
+    return {
+        'version': snapshot.version,
+        'articles': articles,
+        'next_cursor': encode_cursor(articles[-1]) if articles and has_more else None
+    }
+
+def etag_for(snapshot: ArticleSnapshot, *params, encoding: str = 'identity') -> str:
+    """Strong ETag for a representation of a page of `snapshot`"""
+    ordered = sorted_snapshot(snapshot)
+    key = repr((snapshot.version, ordered.digest) + params)
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    suffix = '' if encoding == 'identity' else f"-{encoding}"
+    return f"{ordered.digest}-{digest}{suffix}"
+
+def gzip_body(body: bytes, level: int = 6) -> bytes:
+    """gzip with a fixed mtime so equal bodies compress to equal bytes"""
+    return gzip.compress(body, compresslevel=level, mtime=0)
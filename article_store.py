@@ -0,0 +1,343 @@
+"""
+Compact in-memory representations of processed articles.
+
+`ArticleRecord` is a slotted object carrying one processed article without
+a per-instance dict or a nested sentiment dict.
+
+`ArticleStore` keeps a growing history column by column: publish times,
+polarity and subjectivity in typed arrays that NumPy reads without
+copying, sources, sentiment labels and symbols as small interned ids, and
+titles, summaries and urls in UTF-8 string tables. Filtering by time range,
+score, source or symbol is a vectorized mask over the columns; records are
+only materialized for the rows a caller asks for.
+"""
+import logging
+import sys
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from date_parsing import format_timestamp
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+class ArticleStoreError(Exception):
+    """Custom exception for article store errors"""
+    pass
+
+class ArticleRecord:
+    """One processed article, without per-instance dicts"""
+    __slots__ = (
+        'title', 'summary', 'url', 'source', 'published_ts',
+        'polarity', 'subjectivity', 'sentiment_label', 'symbols', 'duplicates'
+    )
+
+    def __init__(
+        self,
+        title: str,
+        summary: str,
+        url: str,
+        source: str,
+        published_ts: int,
+        polarity: float,
+        subjectivity: float,
+        sentiment_label: str = '',
+        symbols: Tuple[str, ...] = (),
+        duplicates: Tuple[Tuple[str, str], ...] = ()
+    ):
+        self.title = title
+        self.summary = summary
+        self.url = url
+        self.source = source
+        self.published_ts = published_ts
+        self.polarity = polarity
+        self.subjectivity = subjectivity
+        self.sentiment_label = sentiment_label
+        self.symbols = symbols
+        self.duplicates = duplicates
+
+    def __repr__(self) -> str:
+        return f"ArticleRecord(url={self.url!r}, published_ts={self.published_ts})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ArticleRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    @classmethod
+    def from_processed(cls, article: Dict) -> 'ArticleRecord':
+        """Build a record from a processed article dict"""
+        sentiment = article.get('sentiment') or {}
+        return cls(
+            title=article.get('title', ''),
+            summary=article.get('summary', ''),
+            url=article.get('url') or article.get('link', ''),
+            source=article.get('source', ''),
+            published_ts=int(article.get('published_ts') or 0),
+            polarity=float(sentiment.get('polarity', 0.0)),
+            subjectivity=float(sentiment.get('subjectivity', 0.0)),
+            sentiment_label=sentiment.get('sentiment_label', ''),
+            symbols=tuple(article.get('symbols') or ()),
+            duplicates=tuple(
+                (duplicate.get('source', ''), duplicate.get('link', ''))
+                for duplicate in article.get('duplicates') or ()
+            )
+        )
+
+    def to_processed(self) -> Dict:
+        """Inverse of `from_processed`, in the shape the templates expect"""
+        return {
+            'title': self.title,
+            'summary': self.summary,
+            'url': self.url,
+            'source': self.source,
+            'published_ts': self.published_ts,
+            'published_date': format_timestamp(self.published_ts),
+            'sentiment': {
+                'polarity': self.polarity,
+                'subjectivity': self.subjectivity,
+                'sentiment_label': self.sentiment_label
+            },
+            'symbols': list(self.symbols),
+            'duplicates': [{'source': source, 'link': link} for source, link in self.duplicates]
+        }
+
+class StringTable:
+    """Append-only strings stored back to back as UTF-8"""
+    def __init__(self):
+        self._blob = bytearray()
+        self._offsets = array('q', [0])
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def append(self, value: str) -> int:
+        self._blob += value.encode('utf-8')
+        self._offsets.append(len(self._blob))
+        return len(self._offsets) - 2
+
+    def get(self, index: int) -> str:
+        return self._blob[self._offsets[index]:self._offsets[index + 1]].decode('utf-8')
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._blob) + sys.getsizeof(self._offsets)
+
+class _Interner:
+    """Small integer ids for a low-cardinality set of strings"""
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def intern(self, value: str) -> int:
+        existing = self.ids.get(value)
+        if existing is not None:
+            return existing
+        self.ids[value] = len(self.values)
+        self.values.append(value)
+        return len(self.values) - 1
+
+    def nbytes(self) -> int:
+        return (
+            sys.getsizeof(self.ids) + sys.getsizeof(self.values)
+            + sum(sys.getsizeof(value) for value in self.values)
+        )
+
+class ArticleStore:
+    """
+    Columnar history of processed articles.
+
+    Rows are numbered in insertion order. Articles are identified by url;
+    adding a url already stored is a no-op. Articles without a url are
+    always added.
+    """
+    def __init__(self):
+        self._published_ts = array('q')
+        self._polarity = array('f')
+        self._subjectivity = array('f')
+        self._source_ids = array('I')
+        self._label_ids = array('B')
+        # Symbols in CSR form: row i's ids are _symbol_ids[_symbol_offsets[i]:_symbol_offsets[i + 1]]
+        self._symbol_offsets = array('I', [0])
+        self._symbol_ids = array('H')
+        self._titles = StringTable()
+        self._summaries = StringTable()
+        self._urls = StringTable()
+        self._sources = _Interner()
+        self._labels = _Interner()
+        self._symbols = _Interner()
+        # Rare, so kept sparse: row -> ((source, link), ...)
+        self._duplicates: Dict[int, Tuple[Tuple[str, str], ...]] = {}
+        # hash(url) -> row, so the index holds no second copy of each url;
+        # the rare url whose hash collides with a stored one goes in _rows_by_full_url
+        self._rows_by_url_hash: Dict[int, int] = {}
+        self._rows_by_full_url: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._published_ts)
+
+    def add(self, article) -> Optional[int]:
+        """
+        Append a processed article dict or an `ArticleRecord`.
+
+        Returns:
+            The new row number, or None if the url is already stored
+        """
+        record = article if isinstance(article, ArticleRecord) else ArticleRecord.from_processed(article)
+        with self._lock:
+            if record.url and self._find_url(record.url) is not None:
+                return None
+            row = len(self._published_ts)
+            self._published_ts.append(record.published_ts)
+            self._polarity.append(record.polarity)
+            self._subjectivity.append(record.subjectivity)
+            self._source_ids.append(self._sources.intern(record.source))
+            self._label_ids.append(self._labels.intern(record.sentiment_label))
+            for symbol in record.symbols:
+                self._symbol_ids.append(self._symbols.intern(symbol))
+            self._symbol_offsets.append(len(self._symbol_ids))
+            self._titles.append(record.title)
+            self._summaries.append(record.summary)
+            self._urls.append(record.url)
+            if record.duplicates:
+                self._duplicates[row] = record.duplicates
+            if record.url:
+                key = hash(record.url)
+                if key in self._rows_by_url_hash:
+                    self._rows_by_full_url[record.url] = row
+                else:
+                    self._rows_by_url_hash[key] = row
+            return row
+
+    def add_many(self, articles: Iterable) -> int:
+        """Append several articles and return how many were new"""
+        return sum(1 for article in articles if self.add(article) is not None)
+
+    def row_for_url(self, url: str) -> Optional[int]:
+        with self._lock:
+            return self._find_url(url)
+
+    def _find_url(self, url: str) -> Optional[int]:
+        row = self._rows_by_url_hash.get(hash(url))
+        if row is not None and self._urls.get(row) == url:
+            return row
+        return self._rows_by_full_url.get(url)
+
+    def record(self, row: int) -> ArticleRecord:
+        """
+        Materialize one row.
+
+        Raises:
+            ArticleStoreError: If the row does not exist
+        """
+        with self._lock:
+            if not 0 <= row < len(self._published_ts):
+                raise ArticleStoreError(f"No article at row {row}")
+            start, end = self._symbol_offsets[row], self._symbol_offsets[row + 1]
+            return ArticleRecord(
+                title=self._titles.get(row),
+                summary=self._summaries.get(row),
+                url=self._urls.get(row),
+                source=self._sources.values[self._source_ids[row]],
+                published_ts=self._published_ts[row],
+                polarity=self._polarity[row],
+                subjectivity=self._subjectivity[row],
+                sentiment_label=self._labels.values[self._label_ids[row]],
+                symbols=tuple(self._symbols.values[i] for i in self._symbol_ids[start:end]),
+                duplicates=self._duplicates.get(row, ())
+            )
+
+    def records(self, rows: Iterable[int]) -> List[ArticleRecord]:
+        return [self.record(int(row)) for row in rows]
+
+    def published_ts(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Publish times of `rows` (all rows by default), as a copy"""
+        with self._lock:
+            column = np.frombuffer(self._published_ts, dtype=np.int64)
+            return column.copy() if rows is None else column[rows]
+
+    def filter(
+        self,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+        min_polarity: Optional[float] = None,
+        max_polarity: Optional[float] = None,
+        min_subjectivity: Optional[float] = None,
+        max_subjectivity: Optional[float] = None,
+        source: Optional[str] = None,
+        symbol: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Rows matching every given condition, newest first.
+
+        Time bounds are start-inclusive and end-exclusive; score bounds are
+        inclusive.
+
+        Returns:
+            Row numbers for use with `record`/`records`
+        """
+        with self._lock:
+            if not len(self._published_ts):
+                return np.empty(0, dtype=np.int64)
+            published = np.frombuffer(self._published_ts, dtype=np.int64)
+            mask = np.ones(published.size, dtype=bool)
+            if start_ts is not None:
+                mask &= published >= start_ts
+            if end_ts is not None:
+                mask &= published < end_ts
+            if min_polarity is not None or max_polarity is not None:
+                polarity = np.frombuffer(self._polarity, dtype=np.float32)
+                if min_polarity is not None:
+                    mask &= polarity >= np.float32(min_polarity)
+                if max_polarity is not None:
+                    mask &= polarity <= np.float32(max_polarity)
+            if min_subjectivity is not None or max_subjectivity is not None:
+                subjectivity = np.frombuffer(self._subjectivity, dtype=np.float32)
+                if min_subjectivity is not None:
+                    mask &= subjectivity >= np.float32(min_subjectivity)
+                if max_subjectivity is not None:
+                    mask &= subjectivity <= np.float32(max_subjectivity)
+            if source is not None:
+                source_id = self._sources.ids.get(source)
+                if source_id is None:
+                    return np.empty(0, dtype=np.int64)
+                mask &= np.frombuffer(self._source_ids, dtype=np.uint32) == source_id
+            if symbol is not None:
+                symbol_id = self._symbols.ids.get(symbol)
+                if symbol_id is None or not len(self._symbol_ids):
+                    return np.empty(0, dtype=np.int64)
+                hits = np.flatnonzero(np.frombuffer(self._symbol_ids, dtype=np.uint16) == symbol_id)
+                offsets = np.frombuffer(self._symbol_offsets, dtype=np.uint32)
+                tagged = np.zeros(published.size, dtype=bool)
+                tagged[np.searchsorted(offsets, hits, side='right') - 1] = True
+                mask &= tagged
+            rows = np.flatnonzero(mask)
+            return rows[np.argsort(-published[rows], kind='stable')]
+
+    def memory_usage(self) -> Dict:
+        """Bytes held by each part of the store, and the average per article"""
+        with self._lock:
+            usage = {
+                'columns': sum(sys.getsizeof(column) for column in (
+                    self._published_ts, self._polarity, self._subjectivity,
+                    self._source_ids, self._label_ids, self._symbol_offsets, self._symbol_ids
+                )),
+                'text': self._titles.nbytes() + self._summaries.nbytes() + self._urls.nbytes(),
+                'interned': self._sources.nbytes() + self._labels.nbytes() + self._symbols.nbytes(),
+                'url_index': (
+                    sys.getsizeof(self._rows_by_url_hash) + sys.getsizeof(self._rows_by_full_url)
+                    + sum(sys.getsizeof(key) + sys.getsizeof(row) for key, row in self._rows_by_url_hash.items())
+                ),
+                'duplicates': sys.getsizeof(self._duplicates),
+            }
+            usage['total'] = sum(usage.values())
+            usage['articles'] = len(self._published_ts)
+            usage['per_article'] = usage['total'] / usage['articles'] if usage['articles'] else 0.0
+            return usage
@@ -0,0 +1 @@
+"""Offline micro-benchmarks; run each module with `python -m benchmarks.<name>`"""
@@ -0,0 +1,105 @@
+"""
+Memory per retained article, and the cost of filtering the history, for
+processed-article dicts versus `article_store.ArticleStore`.
+
+Memory is measured with tracemalloc, so it includes every object the
+representation allocates.
+
+Run from the repository root:
+    python -m benchmarks.bench_article_store
+"""
+import random
+import timeit
+import tracemalloc
+from typing import Dict, List
+
+from article_store import ArticleRecord, ArticleStore
+
+START_TS = 1_700_000_000
+SYMBOL_SETS = [[], ['BTC'], ['BTC', 'ETH'], ['SOL']]
+SOURCES = [
+    'https://cointelegraph.com/rss',
+    'https://coindesk.com/arc/outboundfeeds/rss/',
+    'https://cryptonews.com/news/feed',
+]
+
+def build_articles(size: int, seed: int = 7) -> List[Dict]:
+    """Processed articles shaped like the pipeline's output"""
+    rng = random.Random(seed)
+    articles = []
+    for n in range(size):
+        polarity = rng.uniform(-1, 1)
+        articles.append({
+            'title': f"Bitcoin climbs as spot ETF inflows reach a new high, report {n}",
+            'summary': (
+                f"Bitcoin (BTC) rose {n % 17}% on Tuesday as spot ETF inflows hit a "
+                "three-week high. Ether and Solana traded flat ahead of the FOMC "
+                "meeting while derivatives volumes stayed light across major venues."
+            ),
+            'url': f"https://news.example.com/markets/bitcoin-etf-inflows-{n}",
+            'published_date': '2025-02-08 22:30:35',
+            'published_ts': START_TS + n * 60,
+            'source': SOURCES[n % len(SOURCES)],
+            'duplicates': [],
+            'symbols': list(SYMBOL_SETS[n % len(SYMBOL_SETS)]),
+            'sentiment': {
+                'polarity': polarity,
+                'subjectivity': rng.random(),
+                'sentiment_label': 'Positive' if polarity > 0 else 'Negative',
+                'subjectivity_label': 'Objective',
+                'timestamp': '2025-02-08 22:38:46',
+                'user': 'kaxm23'
+            }
+        })
+    return articles
+
+def measure(build) -> float:
+    """Bytes allocated by `build()` and still held by its result"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+def run(size: int = 100000) -> dict:
+    articles = build_articles(size)
+    results = {
+        'dicts': measure(lambda: build_articles(size)) / size,
+        'records': measure(lambda: [ArticleRecord.from_processed(a) for a in build_articles(size)]) / size,
+    }
+    store = ArticleStore()
+
+    def fill_store():
+        store.add_many(articles)
+        return store
+
+    results['store'] = measure(fill_store) / size
+
+    start, end = START_TS + size * 15, START_TS + size * 45
+
+    def filter_dicts():
+        return [
+            a for a in articles
+            if start <= a['published_ts'] < end
+            and a['sentiment']['polarity'] >= 0.5 and 'BTC' in a['symbols']
+        ]
+
+    def filter_store():
+        return store.filter(start_ts=start, end_ts=end, min_polarity=0.5, symbol='BTC')
+
+    assert len(filter_dicts()) == len(filter_store())
+    results['filter_dicts_ms'] = min(timeit.repeat(filter_dicts, number=10, repeat=3)) / 10 * 1e3
+    results['filter_store_ms'] = min(timeit.repeat(filter_store, number=10, repeat=3)) / 10 * 1e3
+    results['store_reported'] = store.memory_usage()['per_article']
+    return results
+
+if __name__ == "__main__":
+    results = run()
+    print(f"{'dicts':>16}: {results['dicts']:8.0f} bytes/article")
+    print(f"{'ArticleRecord':>16}: {results['records']:8.0f} bytes/article")
+    print(f"{'ArticleStore':>16}: {results['store']:8.0f} bytes/article "
+          f"(memory_usage() reports {results['store_reported']:.0f})")
+    print(f"{'filter dicts':>16}: {results['filter_dicts_ms']:8.2f} ms")
+    print(f"{'filter store':>16}: {results['filter_store_ms']:8.2f} ms")
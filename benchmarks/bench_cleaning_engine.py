@@ -0,0 +1,66 @@
+"""
+Throughput of the three clean_text flavours before and after the unified
+cleaning engine, on a generated corpus of news entries.
+
+Run from the repository root:
+    python -m benchmarks.bench_cleaning_engine [corpus_size]
+"""
+import sys
+import time
+from benchmarks import legacy_cleaners
+from benchmarks.corpus import build_corpus
+import enhanced_text_cleaner
+import text_cleaner
+import text_processing
+from cleaning_engine import CleaningLevel, TextCleanerConfig
+
+ENHANCED_CONFIG = TextCleanerConfig(
+    preserve_numbers=True,
+    preserve_urls=True,
+    preserved_punctuation=".,!$%",
+    cleaning_level=CleaningLevel.STANDARD
+)
+
+def _throughput(func, corpus) -> float:
+    start = time.perf_counter()
+    func(corpus)
+    return len(corpus) / (time.perf_counter() - start)
+
+def run(size: int = 5000) -> dict:
+    corpus = build_corpus(size)
+    plain = [text_processing.strip_html(entry) for entry in corpus]
+
+    cases = {
+        'text_cleaner': (
+            lambda c: [legacy_cleaners.text_cleaner_clean_text(t) for t in c],
+            text_cleaner.clean_many,
+            corpus
+        ),
+        'text_processing': (
+            lambda c: [legacy_cleaners.text_processing_clean_text(t, max_length=300, strip_markup=False) for t in c],
+            lambda c: text_processing.clean_many(c, max_length=300, strip_markup=False),
+            plain
+        ),
+        'enhanced': (
+            lambda c: [legacy_cleaners.enhanced_clean_text(t, ENHANCED_CONFIG)[0] for t in c],
+            lambda c: [r.text for r in enhanced_text_cleaner.clean_many(c, ENHANCED_CONFIG)],
+            corpus
+        ),
+        'enhanced_plain': (
+            lambda c: [legacy_cleaners.enhanced_clean_text(t, ENHANCED_CONFIG)[0] for t in c],
+            lambda c: [r.text for r in enhanced_text_cleaner.clean_many(c, ENHANCED_CONFIG)],
+            plain
+        ),
+    }
+
+    results = {}
+    for name, (legacy, engine, inputs) in cases.items():
+        assert legacy(inputs) == engine(inputs), name
+        results[name] = (_throughput(legacy, inputs), _throughput(engine, inputs))
+    return results
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print(f"Corpus: {size} entries (docs/second, higher is better)")
+    for name, (legacy, engine) in run(size).items():
+        print(f"{name:>16}: legacy {legacy:10.0f}  engine {engine:10.0f}  ({engine / legacy:4.1f}x)")
@@ -0,0 +1,71 @@
+"""
+Cold-start cost of the app: importing it, and scoring the first article.
+
+Each measurement runs in a fresh interpreter. The eager variant imports
+TextBlob and bs4 before the app, which is what importing the app did
+before those imports were made lazy. The first score is timed both
+without and after `init.warm_up`, showing what the first request pays.
+
+Run from the repository root:
+    python -m benchmarks.bench_cold_start
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_SCRIPT = """
+import json, time
+start = time.perf_counter()
+{preload}
+import app
+imported = time.perf_counter() - start
+warm_up = 0.0
+if {warm}:
+    from init import warm_up as run_warm_up
+    start = time.perf_counter()
+    run_warm_up()
+    warm_up = time.perf_counter() - start
+from classification import score_text
+start = time.perf_counter()
+score_text("Ethereum slips as traders weigh the upgrade delay.", use_cache=False)
+print(json.dumps({{'import': imported, 'warm_up': warm_up, 'first_score': time.perf_counter() - start}}))
+"""
+
+VARIANTS = {
+    'eager imports': {'preload': 'import textblob, bs4', 'warm': False},
+    'lazy imports': {'preload': '', 'warm': False},
+    'lazy + warm_up': {'preload': '', 'warm': True},
+}
+
+def measure(preload: str, warm: bool, cwd: str) -> Dict[str, float]:
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT, PYTHONDONTWRITEBYTECODE='1')
+    output = subprocess.run(
+        [sys.executable, '-c', _SCRIPT.format(preload=preload, warm=warm)],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def run(repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """Fastest of `repeat` fresh-interpreter runs per variant, in seconds"""
+    results: Dict[str, Dict[str, float]] = {}
+    # The working directory holds the sentiment cache file; keep it out of the repo
+    with tempfile.TemporaryDirectory() as cwd:
+        for _ in range(repeat):
+            for name, variant in VARIANTS.items():
+                sample = measure(variant['preload'], variant['warm'], cwd)
+                best = results.setdefault(name, sample)
+                for key, value in sample.items():
+                    best[key] = min(best[key], value)
+    return results
+
+if __name__ == "__main__":
+    results = run()
+    print(f"{'variant':<16}{'import app':>12}{'warm_up':>12}{'first score':>14}")
+    for name, timings in results.items():
+        print(f"{name:<16}{timings['import'] * 1000:>10.0f}ms{timings['warm_up'] * 1000:>10.0f}ms"
+              f"{timings['first_score'] * 1000:>12.1f}ms")
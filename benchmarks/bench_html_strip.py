@@ -0,0 +1,69 @@
+"""
+Per-entry cost of HTML stripping: the old double BeautifulSoup parse versus
+the single streaming parse now shared by the collector and processing stage.
+
+Run from the repository root:
+    python -m benchmarks.bench_html_strip
+"""
+import re
+import timeit
+from bs4 import BeautifulSoup
+from news_collector import clean_summary
+from text_processing import clean_text
+
+SAMPLE_ENTRY = """
+<p><img src="https://images.example.com/btc.jpg" alt="Bitcoin" /></p>
+<p>Bitcoin (BTC) climbed above <strong>$60,000</strong> on Tuesday as spot ETF
+inflows hit a three-week high, according to data from
+<a href="https://example.com/etf-flows">Farside Investors</a>.</p>
+<p>Ether (ETH) gained 4.2% while Solana (SOL) traded flat &amp; volumes stayed
+light ahead of the FOMC meeting.</p>
+<p>The post <a href="https://example.com/post">Bitcoin tops $60K</a> appeared
+first on Crypto News.</p>
+"""
+
+def legacy_clean_summary(summary: str) -> str:
+    """`news_collector.clean_summary` as it was before the single-parse change"""
+    text = BeautifulSoup(summary, 'html.parser').get_text()
+    text = ' '.join(text.split())
+    if len(text) > 300:
+        text = text[:300] + '...'
+    return text
+
+def legacy_clean_text(text: str) -> str:
+    """The old `text_processing.clean_text` path, which parsed the text again"""
+    text = BeautifulSoup(text, 'html.parser').get_text()
+    urls = re.findall(r'https?://\S+', text)
+    text = re.sub(r'[^\w\s]', ' ', text)
+    text = ' '.join(text.split())
+    for url in urls:
+        text = text + f" {url}"
+    if len(text) > 300:
+        text = text[:300].rsplit(' ', 1)[0] + '...'
+    return text.strip()
+
+def double_parse(entry: str) -> str:
+    return legacy_clean_text(legacy_clean_summary(entry))
+
+def single_parse(entry: str) -> str:
+    return clean_text(
+        clean_summary(entry),
+        preserve_numbers=True,
+        preserve_urls=True,
+        max_length=300,
+        strip_markup=False
+    )
+
+def run(number: int = 2000) -> dict:
+    assert double_parse(SAMPLE_ENTRY) == single_parse(SAMPLE_ENTRY)
+    results = {}
+    for name, func in (('double_parse', double_parse), ('single_parse', single_parse)):
+        seconds = min(timeit.repeat(lambda: func(SAMPLE_ENTRY), number=number, repeat=3))
+        results[name] = seconds / number * 1e6
+    return results
+
+if __name__ == "__main__":
+    results = run()
+    for name, micros in results.items():
+        print(f"{name:>14}: {micros:8.1f} us/entry")
+    print(f"{'speedup':>14}: {results['double_parse'] / results['single_parse']:8.1f}x")
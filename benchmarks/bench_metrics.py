@@ -0,0 +1,53 @@
+"""
+Cost of the metrics instrumentation on the hot path.
+
+Times each recording primitive, then compares the two timers
+`pipeline.process_article` records per article (clean and score)
+against the time the function itself takes on the fixture corpus. The
+sentiment cache is warm after the first pass, so the comparison is made
+against the fastest, steady-state path where overhead is largest.
+
+Run from the repository root:
+    python -m benchmarks.bench_metrics
+"""
+import timeit
+
+from benchmarks.suite import Corpus
+from metrics import MetricsRegistry
+from pipeline import process_article
+
+TIMERS_PER_ARTICLE = 2
+
+def run(number: int = 200000, corpus_size: int = 300) -> dict:
+    registry = MetricsRegistry()
+    counter = registry.counter('bench_total', 'Benchmark counter', ['stage']).labels('clean')
+    histogram = registry.histogram('bench_seconds', 'Benchmark histogram', ['stage']).labels('clean')
+
+    def timed():
+        with histogram.time():
+            pass
+
+    results = {}
+    for name, func in (
+        ('counter.inc', counter.inc),
+        ('histogram.observe', lambda: histogram.observe(0.003)),
+        ('histogram.time', timed),
+        ('empty call', lambda: None),
+    ):
+        results[name] = min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+    articles = Corpus(corpus_size).articles
+    for article in articles:
+        process_article(article)  # warm the sentiment cache
+    per_article = min(timeit.repeat(
+        lambda: [process_article(article) for article in articles], number=3, repeat=3
+    )) / 3 / len(articles) * 1e6
+    results['process_article'] = per_article
+    results['overhead'] = TIMERS_PER_ARTICLE * (results['histogram.time'] - results['empty call']) / per_article
+    return results
+
+if __name__ == "__main__":
+    results = run()
+    for name in ('counter.inc', 'histogram.observe', 'histogram.time', 'empty call', 'process_article'):
+        print(f"{name:>18}: {results[name]:8.3f} us")
+    print(f"{'overhead':>18}: {results['overhead']:8.2%} of process_article ({TIMERS_PER_ARTICLE} timers per article)")
@@ -0,0 +1,57 @@
+"""
+Per-entry cost of feed date parsing: the old `news_collector.parse_date`
+plus `date_to_epoch` round trip versus `date_parsing.DateParser`.
+
+Run from the repository root:
+    python -m benchmarks.bench_parse_date
+"""
+import calendar
+import time
+import timeit
+from datetime import datetime
+from date_parsing import DateParser
+
+# One sample per shape seen in the three feeds
+SAMPLES = {
+    'rfc822_offset': 'Sat, 08 Feb 2025 22:30:35 +0000',
+    'rfc822_gmt': 'Sat, 08 Feb 2025 22:30:35 GMT',
+    'iso8601': '2025-02-08T22:30:35+00:00',
+}
+
+def legacy_parse_date(date_str: str) -> str:
+    """`news_collector.parse_date` as it was before the date_parsing module"""
+    formats = [
+        '%a, %d %b %Y %H:%M:%S %z',
+        '%a, %d %b %Y %H:%M:%S GMT',
+        '%Y-%m-%dT%H:%M:%S%z',
+        '%Y-%m-%d %H:%M:%S',
+    ]
+    for fmt in formats:
+        try:
+            dt = datetime.strptime(date_str, fmt)
+            return dt.strftime('%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            continue
+    return "2025-02-08 22:30:35"
+
+def legacy_timestamp(date_str: str) -> int:
+    """Old path to a sortable epoch: parse, format, then parse again"""
+    try:
+        return calendar.timegm(time.strptime(legacy_parse_date(date_str), '%Y-%m-%d %H:%M:%S'))
+    except ValueError:
+        return 0
+
+def run(number: int = 20000) -> dict:
+    parser = DateParser()
+    results = {}
+    for shape, sample in SAMPLES.items():
+        feed = f"https://{shape}.example/rss"
+        assert parser.parse(sample, feed) == legacy_timestamp(sample)
+        legacy = min(timeit.repeat(lambda: legacy_timestamp(sample), number=number, repeat=3))
+        current = min(timeit.repeat(lambda: parser.parse(sample, feed), number=number, repeat=3))
+        results[shape] = (legacy / number * 1e6, current / number * 1e6)
+    return results
+
+if __name__ == "__main__":
+    for shape, (legacy, current) in run().items():
+        print(f"{shape:>14}: legacy {legacy:6.2f} us  date_parser {current:6.2f} us  ({legacy / current:4.1f}x)")
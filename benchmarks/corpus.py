@@ -0,0 +1,23 @@
+"""Synthetic news-entry corpus shared by the offline benchmarks"""
+from typing import List
+
+ENTRY_TEMPLATES = [
+    """<p><img src="https://images.example.com/{n}.jpg" alt="chart" /></p>
+    <p>Bitcoin (BTC) climbed {n}% to <strong>$6{n},000</strong> as ETF inflows hit a
+    three-week high, according to <a href="https://example.com/flows/{n}">Farside</a>.</p>
+    <p>Ether &amp; Solana traded flat ahead of the FOMC meeting.</p>""",
+    """<div class="content"><h2>Market update #{n}</h2><ul><li>24h volume: $1.{n}B</li>
+    <li>Funding rates: +0.0{n}%</li></ul><p>Read more at https://news.example.org/markets/{n}
+    and https://news.example.org/markets/{n}/live!</p></div>""",
+    "Regulators fined exchange {n} for failing to protect customer funds, a serious breach.",
+    """<article><h1>DeFi protocol {n} exploited</h1><p>Attackers drained __URL_{n}__ style
+    vaults worth $10{n} million; the team said it was "not a good day".</p>
+    <script>track({n});</script></article>""",
+]
+
+def build_corpus(size: int) -> List[str]:
+    """Return `size` entries cycling through the templates"""
+    return [
+        ENTRY_TEMPLATES[i % len(ENTRY_TEMPLATES)].format(n=i)
+        for i in range(size)
+    ]
@@ -0,0 +1,104 @@
+"""
+Reference copies of the cleaning functions as they were before the unified
+engine, kept so benchmarks and tests can check the wrappers still produce
+identical output.
+"""
+from bs4 import BeautifulSoup
+import re
+from typing import Optional
+from cleaning_engine import CleaningLevel, TextCleanerConfig
+
+def text_cleaner_clean_text(html_content):
+    """`text_cleaner.clean_text` before the cleaning engine"""
+    try:
+        soup = BeautifulSoup(html_content, 'html.parser')
+        text_content = soup.get_text()
+    except Exception as e:
+        print(f"Error parsing HTML: {e}")
+        return ""
+    cleaned_text = re.sub(r'[^a-zA-Z\s]', '', text_content)
+    cleaned_text = ' '.join(cleaned_text.split())
+    return cleaned_text.lower()
+
+def text_processing_clean_text(
+    text: str,
+    preserve_numbers: bool = True,
+    preserve_urls: bool = True,
+    max_length: Optional[int] = None,
+    strip_markup: bool = True
+) -> str:
+    """`text_processing.clean_text` before the cleaning engine"""
+    if not text:
+        return ""
+    if strip_markup:
+        text = BeautifulSoup(text, 'html.parser').get_text()
+    urls = []
+    if preserve_urls:
+        url_pattern = r'https?://\S+'
+        urls = re.findall(url_pattern, text)
+    text = re.sub(r'[^\w\s]', ' ', text)
+    if not preserve_numbers:
+        text = re.sub(r'\d+', '', text)
+    text = ' '.join(text.split())
+    if preserve_urls and urls:
+        for url in urls:
+            text = text + f" {url}"
+    if max_length and len(text) > max_length:
+        text = text[:max_length].rsplit(' ', 1)[0] + '...'
+    return text.strip()
+
+def enhanced_clean_text(html_content: str, config: Optional[TextCleanerConfig] = None):
+    """`enhanced_text_cleaner.clean_text` before the cleaning engine; returns (text, removed_tags)"""
+    if config is None:
+        config = TextCleanerConfig()
+
+    removed_tags = []
+    soup = BeautifulSoup(html_content, config.html_parser)
+    if config.track_metadata:
+        removed_tags = [tag.name for tag in soup.find_all()]
+    if config.cleaning_level == CleaningLevel.MINIMAL:
+        text_content = soup.get_text(strip=True)
+    else:
+        if config.extract_tags:
+            text_content = ' '.join(
+                element.get_text(strip=True)
+                for tag in config.extract_tags
+                for element in soup.find_all(tag)
+            )
+        else:
+            text_content = soup.get_text(strip=True)
+
+    if config.cleaning_level != CleaningLevel.MINIMAL:
+        for old, new in config.custom_replacements.items():
+            text_content = text_content.replace(old, new)
+
+        urls = []
+        if config.preserve_urls:
+            urls = re.findall(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', text_content)
+            for i, url in enumerate(urls):
+                text_content = text_content.replace(url, f"__URL_{i}__")
+
+        pattern_parts = [r'a-zA-Z']
+        if config.preserve_numbers or config.cleaning_level != CleaningLevel.STRICT:
+            pattern_parts.append(r'0-9')
+        if config.preserved_punctuation and config.cleaning_level != CleaningLevel.STRICT:
+            pattern_parts.append(re.escape(config.preserved_punctuation))
+        pattern_parts.append(r'\s')
+        pattern = f'[^{"".join(pattern_parts)}]'
+        cleaned_text = re.sub(pattern, ' ', text_content)
+
+        if not config.preserve_case:
+            cleaned_text = cleaned_text.lower()
+
+        cleaned_text = ' '.join(
+            word for word in cleaned_text.split()
+            if len(word) >= config.min_word_length
+        )
+
+        if config.preserve_urls:
+            for i, url in enumerate(urls):
+                cleaned_text = cleaned_text.replace(f"__URL_{i}__", url)
+    else:
+        cleaned_text = text_content
+
+    return cleaned_text, removed_tags
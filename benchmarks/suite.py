@@ -0,0 +1,300 @@
+"""
+Offline benchmark suite covering every pipeline stage.
+
+Corpora are built from the recorded RSS documents in benchmarks/fixtures,
+one per source, so nothing touches the network. Each corpus size repeats
+the recorded items (with distinct links) until the three feeds together
+hold that many entries. Every stage is timed `--repeat` times per size,
+looping short stages so each timing spans at least MIN_RUN_SECONDS, and the
+fastest run is reported as microseconds per entry.
+
+Run from the repository root:
+    python -m benchmarks.suite --save benchmarks/baseline.json
+    python -m benchmarks.suite --compare benchmarks/baseline.json --threshold 0.25
+
+Compare mode exits with status 1 when any stage is slower than the
+baseline by more than the threshold (a fraction; 0.25 means 25%).
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence
+
+import feedparser
+from flask import Flask, render_template
+
+import enhanced_text_cleaner
+import news_collector
+import text_cleaner
+import text_processing
+from classification import score_texts
+from config import config
+from date_parsing import DateParser
+from news_collector import parse_feed
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCHMARKS_DIR, 'fixtures')
+TEMPLATES_DIR = os.path.join(os.path.dirname(BENCHMARKS_DIR), 'templates')
+
+# Recorded document for each configured feed
+FIXTURES = {
+    news_collector.NEWS_FEEDS[0]: 'cointelegraph.xml',
+    news_collector.NEWS_FEEDS[1]: 'coindesk.xml',
+    news_collector.NEWS_FEEDS[2]: 'cryptonews.xml',
+}
+
+DEFAULT_SIZES = (30, 300, 1500)
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.25
+# Each timed run loops a stage until it has taken at least this long
+MIN_RUN_SECONDS = 0.05
+
+_ITEM = re.compile(rb'<item>.*?</item>', re.S)
+_LINK = re.compile(rb'(<link>)(.*?)(</link>)', re.S)
+_DESCRIPTION = re.compile(rb'(<description>(?:<!\[CDATA\[)?)', re.S)
+
+def load_fixture(feed_url: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, FIXTURES[feed_url]), 'rb') as f:
+        return f.read()
+
+def scale_feed(document: bytes, entries: int) -> bytes:
+    """
+    Repeat a recorded feed's items until it holds `entries` of them.
+
+    Repeats get a distinct link and a distinct opening to their description,
+    so deduplication and score caches cannot skip them.
+    """
+    items = _ITEM.findall(document)
+    head = document[:document.index(items[0])]
+    tail = document[document.rindex(items[-1]) + len(items[-1]):]
+    scaled = []
+    for n in range(entries):
+        item = items[n % len(items)]
+        if n >= len(items):
+            item = _LINK.sub(lambda m: m.group(1) + m.group(2) + b'?r=%d' % n + m.group(3), item, count=1)
+            item = _DESCRIPTION.sub(lambda m: m.group(1) + b'Update %d: ' % n, item, count=1)
+        scaled.append(item)
+    return head + b'\n'.join(scaled) + tail
+
+class Corpus:
+    """Inputs for every stage at one corpus size, derived from the fixtures"""
+    def __init__(self, size: int):
+        self.size = size
+        per_feed = [size // len(FIXTURES) + (1 if i < size % len(FIXTURES) else 0) for i in range(len(FIXTURES))]
+        self.documents = {
+            feed_url: scale_feed(load_fixture(feed_url), count)
+            for feed_url, count in zip(FIXTURES, per_feed)
+        }
+        self.dates: List[tuple] = []
+        self.raw_summaries: List[str] = []
+        for feed_url, document in self.documents.items():
+            for entry in feedparser.parse(document).entries:
+                self.dates.append((entry.get('published', ''), feed_url))
+                self.raw_summaries.append(entry.get('summary', ''))
+        self.articles = [
+            article
+            for feed_url, document in self.documents.items()
+            for article in parse_feed(document, feed_url)
+        ]
+        self.summaries = [article['summary'] for article in self.articles]
+        self.cleaned = text_processing.clean_many(
+            self.summaries, preserve_numbers=True, preserve_urls=True, max_length=300, strip_markup=False
+        )
+        # Template input; scored with the fast backend since scoring is timed separately
+        self.processed = [
+            dict(
+                article,
+                summary=summary,
+                url=article['link'],
+                sentiment={'polarity': polarity, 'subjectivity': subjectivity, 'sentiment_label': 'Neutral'}
+            )
+            for article, summary, (polarity, subjectivity)
+            in zip(self.articles, self.cleaned, _scores(self.cleaned, 'lexicon'))
+        ]
+
+def _scores(texts: List[str], backend: str) -> List[tuple]:
+    previous = config.SENTIMENT_BACKEND
+    config.SENTIMENT_BACKEND = backend
+    try:
+        return score_texts(texts, use_cache=False, max_workers=1)
+    finally:
+        config.SENTIMENT_BACKEND = previous
+
+def _render(app: Flask, articles: List[Dict]) -> str:
+    with app.test_request_context('/'):
+        return render_template(
+            'articles.html',
+            articles=articles,
+            current_time="2025-02-08 22:44:10",
+            current_user="kaxm23"
+        )
+
+def _parse_dates(corpus: Corpus) -> List[Optional[int]]:
+    # A fresh parser each run, so per-feed format memory is part of the cost
+    parser = DateParser()
+    return [parser.parse(value, feed_url) for value, feed_url in corpus.dates]
+
+def build_stages() -> Dict[str, Callable[[Corpus], object]]:
+    """Stage name -> function timed over a whole corpus"""
+    render_app = Flask(__name__, template_folder=TEMPLATES_DIR)
+    return {
+        'parse_feed': lambda c: [parse_feed(document, url) for url, document in c.documents.items()],
+        'parse_date': _parse_dates,
+        'clean_text.text_processing': lambda c: text_processing.clean_many(
+            c.summaries, preserve_numbers=True, preserve_urls=True, max_length=300, strip_markup=False
+        ),
+        'clean_text.text_cleaner': lambda c: text_cleaner.clean_many(c.raw_summaries),
+        'clean_text.enhanced': lambda c: enhanced_text_cleaner.clean_many(c.raw_summaries),
+        'extract_keywords': lambda c: [text_processing.extract_keywords(text) for text in c.cleaned],
+        'summarize_text': lambda c: [text_processing.summarize_text(text) for text in c.cleaned],
+        'sentiment.textblob': lambda c: _scores(c.cleaned, 'textblob'),
+        'sentiment.lexicon': lambda c: _scores(c.cleaned, 'lexicon'),
+        'render_articles': lambda c: _render(render_app, c.processed),
+    }
+
+def _calibrate(stage: Callable[[Corpus], object], corpus: Corpus) -> int:
+    """Loops needed for one timed run of `stage` to last MIN_RUN_SECONDS"""
+    start = time.perf_counter()
+    stage(corpus)  # also warms up imports, plan caches and templates
+    return max(1, int(MIN_RUN_SECONDS / max(time.perf_counter() - start, 1e-9)))
+
+def _time_once(stage: Callable[[Corpus], object], corpus: Corpus, loops: int) -> float:
+    start = time.perf_counter()
+    for _ in range(loops):
+        stage(corpus)
+    return (time.perf_counter() - start) / loops
+
+def run(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    repeat: int = DEFAULT_REPEAT,
+    stages: Optional[Sequence[str]] = None
+) -> Dict:
+    """
+    Time the selected stages at each corpus size.
+
+    The repeats of a stage are spread across the whole run (every stage is
+    timed once per round) so a slow stretch on a shared machine cannot
+    inflate all of one stage's samples; the fastest sample is kept.
+
+    Returns:
+        Dict with 'meta' and 'results' ({stage: {size: microseconds per entry}})
+    """
+    available = build_stages()
+    selected = list(stages or available)
+    unknown = [name for name in selected if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown stages: {', '.join(unknown)}")
+
+    cases = []
+    for size in sizes:
+        corpus = Corpus(size)
+        for name in selected:
+            cases.append((name, corpus, _calibrate(available[name], corpus)))
+
+    best: Dict[tuple, float] = {}
+    # Like timeit, keep collector pauses out of the measurement
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            for name, corpus, loops in cases:
+                seconds = _time_once(available[name], corpus, loops)
+                key = (name, corpus.size)
+                best[key] = min(best.get(key, float('inf')), seconds)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    results: Dict[str, Dict[str, float]] = {name: {} for name in selected}
+    for name, corpus, _ in cases:
+        results[name][str(corpus.size)] = best[(name, corpus.size)] / len(corpus.articles) * 1e6
+    return {
+        'meta': {
+            'created': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': list(sizes),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Stages and sizes slower than the baseline by more than `threshold`.
+
+    Stages or sizes missing from either side are ignored.
+    """
+    regressions = []
+    for name, timings in current['results'].items():
+        base_timings = baseline['results'].get(name, {})
+        for size, micros in timings.items():
+            base = base_timings.get(size)
+            if base and micros > base * (1 + threshold):
+                regressions.append({
+                    'stage': name,
+                    'size': int(size),
+                    'baseline_us': base,
+                    'current_us': micros,
+                    'change': micros / base - 1,
+                })
+    return regressions
+
+def format_results(report: Dict, baseline: Optional[Dict] = None) -> str:
+    sizes = report['meta']['sizes']
+    width = 18 if baseline else 12
+    lines = [f"{'stage (us/entry)':<28}" + ''.join(f"{size:>{width}}" for size in sizes)]
+    for name, timings in report['results'].items():
+        base_timings = (baseline or {}).get('results', {}).get(name, {})
+        cells = []
+        for size in sizes:
+            micros = timings[str(size)]
+            base = base_timings.get(str(size))
+            cell = f"{micros:.1f}" + (f" ({micros / base - 1:+.0%})" if base else '')
+            cells.append(f"{cell:>{width}}")
+        lines.append(f"{name:<28}" + ''.join(cells))
+    return '\n'.join(lines)
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--stages', nargs='+', help='Subset of stages to run')
+    parser.add_argument('--save', help='Write the results to this JSON baseline')
+    parser.add_argument('--compare', help='Baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed slowdown before a stage fails (0.25 = 25%%)')
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    report = run(args.sizes, args.repeat, args.stages)
+    print(format_results(report, baseline))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\nSaved baseline to {args.save}")
+
+    if baseline is not None:
+        regressions = compare(baseline, report, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for r in regressions:
+                print(f"  {r['stage']} @ {r['size']}: {r['baseline_us']:.1f} -> "
+                      f"{r['current_us']:.1f} us/entry ({r['change']:+.0%})")
+            return 1
+        print(f"\nNo stage regressed beyond {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
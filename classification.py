@@ -1,8 +1,14 @@
-from textblob import TextBlob
 import logging
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import threading
+from config import config
+from sentiment_cache import SentimentCache, normalize_text, text_key
 
 # Configure logging
 logging.basicConfig(
@@ -36,18 +42,202 @@ class SentimentAnalysisError(Exception):
     """Custom exception for sentiment analysis errors"""
     pass
 
+# Shared by every caller so repeated feed entries are scored only once
+sentiment_cache = SentimentCache(
+    max_entries=config.SENTIMENT_CACHE_SIZE,
+    path=config.SENTIMENT_CACHE_PATH
+)
+
+SENTIMENT_BACKENDS = ('textblob', 'lexicon')
+
+def _backend() -> str:
+    backend = config.SENTIMENT_BACKEND
+    if backend not in SENTIMENT_BACKENDS:
+        raise SentimentAnalysisError(f"Unknown sentiment backend: {backend}")
+    return backend
+
+def _cache_key(normalized: str, backend: str) -> str:
+    # Scores from different backends must not be served for one another
+    if backend == 'textblob':
+        return text_key(normalized)
+    return text_key(f"{backend}:{normalized}")
+
+def score_text(text: str, use_cache: bool = True) -> Tuple[float, float]:
+    """
+    Return (polarity, subjectivity) for text, consulting the sentiment cache.
+
+    Text is whitespace-normalized before both hashing and scoring, so a cache
+    hit always returns exactly what the backend would have computed.
+    """
+    normalized = normalize_text(text)
+    if not use_cache:
+        return _score_chunk([normalized])[0]
+
+    key = _cache_key(normalized, _backend())
+    score = sentiment_cache.get(key)
+    if score is None:
+        score = _score_chunk([normalized])[0]
+        sentiment_cache.put(key, score)
+    return score
+
+def _score_chunk(texts: List[str]) -> List[Tuple[float, float]]:
+    """Score normalized texts with the configured backend; runs inside pool workers"""
+    if _backend() == 'lexicon':
+        from lexicon_sentiment import get_engine
+        return get_engine().score_batch(texts)
+
+    # Imported here so that starting the app does not load TextBlob and NLTK
+    from textblob import TextBlob
+    scores = []
+    for text in texts:
+        sentiment = TextBlob(text).sentiment
+        scores.append((sentiment.polarity, sentiment.subjectivity))
+    return scores
+
+# Scoring pool shared by every batch; created on first use, per process
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 0
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+def _get_pool(max_workers: int) -> ProcessPoolExecutor:
+    """The shared scoring pool, started or resized to `max_workers` as needed"""
+    global _pool, _pool_size, _pool_pid
+    with _pool_lock:
+        pid = os.getpid()
+        # A pool inherited across fork cannot be used by the child
+        if _pool is None or _pool_pid != pid or _pool_size != max_workers:
+            if _pool is not None and _pool_pid == pid:
+                _pool.shutdown(wait=False)
+            # Forking a process that runs Flask and scheduler threads would copy
+            # locks those threads hold into the workers; spawned workers start clean
+            _pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _pool_size, _pool_pid = max_workers, pid
+        return _pool
+
+def shutdown_pool() -> None:
+    """Stop the shared scoring pool; the next parallel batch starts a new one"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown()
+        _pool = None
+
+def score_texts(
+    texts: List[str],
+    use_cache: bool = True,
+    chunk_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    min_parallel: Optional[int] = None
+) -> List[Tuple[float, float]]:
+    """
+    Return (polarity, subjectivity) for each text, in order.
+
+    Cached and duplicate texts are resolved first; the remaining unique texts
+    are scored in-process when there are fewer than `min_parallel` of them,
+    otherwise in chunks of `chunk_size` across the shared process pool.
+    Both ways score the same normalized text `score_text` does.
+    """
+    if chunk_size is None:
+        chunk_size = config.SENTIMENT_BATCH_CHUNK_SIZE
+    if max_workers is None:
+        max_workers = config.SENTIMENT_POOL_WORKERS or os.cpu_count() or 1
+    if min_parallel is None:
+        min_parallel = config.SENTIMENT_MIN_PARALLEL_BATCH
+
+    backend = _backend()
+    normalized = [normalize_text(text) for text in texts]
+    keys = [_cache_key(text, backend) for text in normalized]
+
+    scores: Dict[str, Tuple[float, float]] = {}
+    pending: Dict[str, str] = {}
+    for key, text in zip(keys, normalized):
+        if key in scores or key in pending:
+            continue
+        if not text:
+            scores[key] = (0.0, 0.0)
+            continue
+        cached = sentiment_cache.get(key) if use_cache else None
+        if cached is not None:
+            scores[key] = cached
+        else:
+            pending[key] = text
+
+    if pending:
+        pending_keys = list(pending)
+        pending_texts = [pending[key] for key in pending_keys]
+        # The lexicon backend is vectorized; a pool would only add pickling
+        if backend == 'lexicon' or len(pending_texts) < min_parallel or max_workers <= 1:
+            fresh = _score_chunk(pending_texts)
+        else:
+            chunks = [
+                pending_texts[start:start + chunk_size]
+                for start in range(0, len(pending_texts), chunk_size)
+            ]
+            executor = _get_pool(max_workers)
+            try:
+                fresh = [score for chunk in executor.map(_score_chunk, chunks) for score in chunk]
+            except BrokenProcessPool:
+                # A worker died; replace the pool on the next batch and score this one here
+                logger.warning("Sentiment pool broke; scoring batch in-process")
+                shutdown_pool()
+                fresh = _score_chunk(pending_texts)
+        scores.update(zip(pending_keys, fresh))
+        if use_cache:
+            # One transaction for the whole batch rather than one per text
+            sentiment_cache.put_many(zip(pending_keys, fresh))
+
+    return [scores[key] for key in keys]
+
+def build_result(
+    polarity: float,
+    subjectivity: float,
+    user: str,
+    timestamp: str
+) -> SentimentResult:
+    """Label raw scores and wrap them in a SentimentResult"""
+    # Determine sentiment label
+    if polarity > 0.3:
+        sentiment_label = "Positive"
+    elif polarity < -0.3:
+        sentiment_label = "Negative"
+    else:
+        sentiment_label = "Neutral"
+
+    # Determine subjectivity label
+    if subjectivity > 0.7:
+        subjectivity_label = "Very Subjective"
+    elif subjectivity > 0.3:
+        subjectivity_label = "Somewhat Subjective"
+    else:
+        subjectivity_label = "Objective"
+
+    return SentimentResult(
+        polarity=polarity,
+        subjectivity=subjectivity,
+        sentiment_label=sentiment_label,
+        subjectivity_label=subjectivity_label,
+        timestamp=timestamp,
+        user=user
+    )
+
 def analyze_sentiment(
     text: str,
     user: str = "kaxm23",
-    timestamp: str = "2025-02-08 22:38:46"
+    timestamp: str = "2025-02-08 22:38:46",
+    use_cache: bool = True
 ) -> SentimentResult:
     """
-    Analyze sentiment of text using TextBlob.
+    Analyze sentiment of text using the configured backend (TextBlob by default).
     
     Args:
         text: Input text to analyze
         user: Username performing the analysis
         timestamp: Timestamp of analysis
+        use_cache: Whether to reuse scores for previously seen text
         
     Returns:
         SentimentResult object with analysis results
@@ -64,37 +254,53 @@ def analyze_sentiment(
             )
 
         # Perform sentiment analysis
-        analysis = TextBlob(text)
-        polarity = analysis.sentiment.polarity
-        subjectivity = analysis.sentiment.subjectivity
-
-        # Determine sentiment label
-        if polarity > 0.3:
-            sentiment_label = "Positive"
-        elif polarity < -0.3:
-            sentiment_label = "Negative"
-        else:
-            sentiment_label = "Neutral"
+        polarity, subjectivity = score_text(text, use_cache=use_cache)
+        return build_result(polarity, subjectivity, user, timestamp)
 
-        # Determine subjectivity label
-        if subjectivity > 0.7:
-            subjectivity_label = "Very Subjective"
-        elif subjectivity > 0.3:
-            subjectivity_label = "Somewhat Subjective"
-        else:
-            subjectivity_label = "Objective"
-
-        return SentimentResult(
-            polarity=polarity,
-            subjectivity=subjectivity,
-            sentiment_label=sentiment_label,
-            subjectivity_label=subjectivity_label,
-            timestamp=timestamp,
-            user=user
+    except Exception as e:
+        error_msg = f"Error analyzing sentiment: {str(e)}"
+        logger.error(error_msg)
+        raise SentimentAnalysisError(error_msg)
+
+def analyze_sentiment_batch(
+    texts: List[str],
+    user: str = "kaxm23",
+    timestamp: str = "2025-02-08 22:38:46",
+    use_cache: bool = True,
+    chunk_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    min_parallel: Optional[int] = None
+) -> List[SentimentResult]:
+    """
+    Analyze the sentiment of many texts at once.
+
+    Args:
+        texts: Input texts to analyze
+        user: Username performing the analysis
+        timestamp: Timestamp of analysis
+        use_cache: Whether to reuse scores for previously seen text
+        chunk_size: Texts sent to a pool worker at a time
+        max_workers: Upper bound on worker processes
+        min_parallel: Batches with fewer uncached texts are scored in-process
+
+    Returns:
+        SentimentResult objects in the same order as `texts`
+    """
+    try:
+        scores = score_texts(
+            texts,
+            use_cache=use_cache,
+            chunk_size=chunk_size,
+            max_workers=max_workers,
+            min_parallel=min_parallel
         )
+        return [
+            build_result(polarity, subjectivity, user, timestamp)
+            for polarity, subjectivity in scores
+        ]
 
     except Exception as e:
-        error_msg = f"Error analyzing sentiment: {str(e)}"
+        error_msg = f"Error analyzing sentiment batch: {str(e)}"
         logger.error(error_msg)
         raise SentimentAnalysisError(error_msg)
 
@@ -0,0 +1,461 @@
+"""
+Unified text-cleaning engine.
+
+Each cleaning flavour in the repository (`text_cleaner.clean_text`,
+`text_processing.clean_text` and `enhanced_text_cleaner.clean_text`) is
+compiled once into a `CleaningPlan`: a fixed sequence of stages whose regular
+expressions are built up front. Plans are cached by their options, so a call
+only pays for running the stages.
+"""
+from enum import Enum
+from functools import lru_cache
+from html.entities import name2codepoint
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+import re
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+class CleaningLevel(Enum):
+    """Enum for predefined cleaning levels"""
+    MINIMAL = "minimal"  # Only remove HTML tags
+    STANDARD = "standard"  # Remove HTML and basic cleaning
+    STRICT = "strict"  # Remove all non-alphabetic characters
+
+class TextCleanerConfig:
+    """Configuration class for text cleaning options"""
+    def __init__(
+        self,
+        preserve_numbers: bool = False,
+        preserve_case: bool = False,
+        preserved_punctuation: str = "",
+        html_parser: str = "html.parser",
+        strip_newlines: bool = True,
+        preserve_urls: bool = False,
+        min_word_length: int = 1,
+        custom_replacements: dict = None,
+        extract_tags: List[str] = None,
+        cleaning_level: CleaningLevel = CleaningLevel.STANDARD,
+        track_metadata: bool = True,
+        user: str = "kaxm23"  # Default to current user
+    ):
+        self.preserve_numbers = preserve_numbers
+        self.preserve_case = preserve_case
+        self.preserved_punctuation = preserved_punctuation
+        self.html_parser = html_parser
+        self.strip_newlines = strip_newlines
+        self.preserve_urls = preserve_urls
+        self.min_word_length = min_word_length
+        self.custom_replacements = custom_replacements or {}
+        self.extract_tags = extract_tags
+        self.cleaning_level = cleaning_level
+        self.track_metadata = track_metadata
+        self.user = user
+
+    def plan_key(self) -> Tuple:
+        """Hashable summary of every option that affects the cleaned text"""
+        return (
+            self.preserve_numbers,
+            self.preserve_case,
+            self.preserved_punctuation,
+            self.html_parser,
+            self.preserve_urls,
+            self.min_word_length,
+            tuple(self.custom_replacements.items()),
+            tuple(self.extract_tags) if self.extract_tags else None,
+            self.cleaning_level,
+            self.track_metadata,
+        )
+
+class HTMLStageError(Exception):
+    """Raised when the HTML stage of a plan cannot parse its input"""
+    pass
+
+# A stage takes the text and a per-call state dict and returns the new text
+Stage = Callable[[str, Dict], str]
+
+class CleaningPlan:
+    """Precompiled, reusable sequence of cleaning stages"""
+    __slots__ = ('stages',)
+
+    def __init__(self, stages: Iterable[Stage]):
+        self.stages = tuple(stages)
+
+    def run(self, text: str) -> Tuple[str, Dict]:
+        """Clean one text; returns the text and the state stages recorded"""
+        state = {}
+        for stage in self.stages:
+            text = stage(text, state)
+        return text, state
+
+    def clean(self, text: str) -> str:
+        """Clean one text"""
+        return self.run(text)[0]
+
+    def clean_many(self, texts: Iterable[str]) -> List[str]:
+        """Clean a batch of texts with the same plan"""
+        stages = self.stages
+        results = []
+        for text in texts:
+            state = {}
+            for stage in stages:
+                text = stage(text, state)
+            results.append(text)
+        return results
+
+# --- HTML stages -------------------------------------------------------------
+
+class _TextExtractor(HTMLParser):
+    """Collect the text content of an HTML fragment in a single pass"""
+    # BeautifulSoup's get_text() leaves out the contents of these tags too
+    SKIPPED_TAGS = ('script', 'style', 'template')
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+    def unknown_decl(self, data):
+        if data.startswith('CDATA['):
+            self.parts.append(data[6:])
+
+def _soup(text: str, parser: str):
+    """BeautifulSoup tree for `text`; bs4 is imported on the first fallback, not at startup"""
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(text, parser)
+
+def strip_html(html: str) -> str:
+    """
+    Return the text content of an HTML fragment.
+
+    Uses a streaming `html.parser` pass that builds no tree, and falls back
+    to BeautifulSoup if the markup makes the parser fail or holds character
+    references the two decode differently (e.g. `&gt100`, which html.parser
+    decodes and BeautifulSoup leaves as is). Text without any markup or
+    entities is returned unchanged.
+    """
+    if '<' not in html and '&' not in html:
+        return html
+    if '&' in html and not _references_are_unambiguous(html):
+        return _soup(html, 'html.parser').get_text()
+    try:
+        extractor = _TextExtractor()
+        extractor.feed(html)
+        extractor.close()
+        return ''.join(extractor.parts)
+    except Exception as e:
+        logger.warning(f"Falling back to BeautifulSoup for malformed HTML: {e}")
+        return _soup(html, 'html.parser').get_text()
+
+class _StrippedTextExtractor(_TextExtractor):
+    """
+    Single-pass equivalent of BeautifulSoup's `get_text(strip=True)` plus
+    the names of every tag, for the html.parser tree builder.
+    """
+    def __init__(self):
+        super().__init__()
+        self.tags = []
+        self.strings = []
+
+    def _flush(self):
+        if self.parts:
+            text = ''.join(self.parts).strip()
+            if text:
+                self.strings.append(text)
+            self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        self.tags.append(tag)
+        super().handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        self._flush()
+        super().handle_endtag(tag)
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    def unknown_decl(self, data):
+        self._flush()
+        super().unknown_decl(data)
+        self._flush()
+
+    def close(self):
+        super().close()
+        self._flush()
+
+# html.parser and BeautifulSoup decode these references identically
+_CHARREF = re.compile(r'&(?:#([0-9]+)|#[xX]([0-9a-fA-F]+)|([a-zA-Z][a-zA-Z0-9]*))?(;)?')
+
+def _references_are_unambiguous(text: str) -> bool:
+    for match in _CHARREF.finditer(text):
+        decimal, hexadecimal, name, semicolon = match.groups()
+        if not semicolon:
+            return False
+        if name is not None:
+            if name not in name2codepoint:
+                return False
+            continue
+        if decimal is None and hexadecimal is None:
+            return False
+        codepoint = int(decimal) if decimal is not None else int(hexadecimal, 16)
+        if not (32 <= codepoint < 127 or 160 <= codepoint < 0xD800 or 0xE000 <= codepoint < 0xFDD0):
+            return False
+    return True
+
+def _has_markup(text: str) -> bool:
+    return '<' in text or '&' in text
+
+def _streaming_html_stage(text: str, state: Dict) -> str:
+    return strip_html(text)
+
+def _soup_text_stage(parser: str) -> Stage:
+    """BeautifulSoup `get_text()`, skipped for text without markup"""
+    def stage(text: str, state: Dict) -> str:
+        if not _has_markup(text):
+            return text
+        try:
+            if parser == 'html.parser':
+                # Matches BeautifulSoup, and falls back to it where it would not
+                return strip_html(text)
+            return _soup(text, parser).get_text()
+        except Exception as e:
+            raise HTMLStageError(str(e))
+    return stage
+
+def _soup_stripped_stage(
+    parser: str,
+    extract_tags: Optional[Tuple[str, ...]],
+    track_tags: bool
+) -> Stage:
+    """
+    BeautifulSoup `get_text(strip=True)`, optionally limited to some tags.
+
+    For the html.parser builder without tag extraction, a streaming pass
+    produces the same text and tag list without building a tree; markup
+    with ambiguous character references still goes through BeautifulSoup.
+    """
+    def stage(text: str, state: Dict) -> str:
+        if not extract_tags and not _has_markup(text):
+            state['removed_tags'] = []
+            return text.strip()
+        if parser == 'html.parser' and not extract_tags and _references_are_unambiguous(text):
+            try:
+                extractor = _StrippedTextExtractor()
+                extractor.feed(text)
+                extractor.close()
+                state['removed_tags'] = extractor.tags if track_tags else []
+                return ''.join(extractor.strings)
+            except Exception:
+                pass
+        try:
+            soup = _soup(text, parser)
+            state['removed_tags'] = [tag.name for tag in soup.find_all()] if track_tags else []
+            if extract_tags:
+                return ' '.join(
+                    element.get_text(strip=True)
+                    for tag in extract_tags
+                    for element in soup.find_all(tag)
+                )
+            return soup.get_text(strip=True)
+        except Exception as e:
+            raise HTMLStageError(str(e))
+    return stage
+
+# --- Text stages -------------------------------------------------------------
+
+def _sub_stage(pattern: str, replacement: str) -> Stage:
+    compiled = re.compile(pattern)
+    def stage(text: str, state: Dict) -> str:
+        return compiled.sub(replacement, text)
+    return stage
+
+def _replace_stage(pairs: Tuple[Tuple[str, str], ...]) -> Stage:
+    def stage(text: str, state: Dict) -> str:
+        for old, new in pairs:
+            text = text.replace(old, new)
+        return text
+    return stage
+
+def _lower_stage(text: str, state: Dict) -> str:
+    return text.lower()
+
+def _collapse_whitespace_stage(text: str, state: Dict) -> str:
+    return ' '.join(text.split())
+
+def _min_word_length_stage(min_word_length: int) -> Stage:
+    if min_word_length <= 1:
+        return _collapse_whitespace_stage
+    def stage(text: str, state: Dict) -> str:
+        return ' '.join(word for word in text.split() if len(word) >= min_word_length)
+    return stage
+
+def _strip_stage(text: str, state: Dict) -> str:
+    return text.strip()
+
+# text_processing: URLs are copied out, then appended to the cleaned text
+_SIMPLE_URL = re.compile(r'https?://\S+')
+
+def _collect_urls_stage(text: str, state: Dict) -> str:
+    state['urls'] = _SIMPLE_URL.findall(text)
+    return text
+
+def _append_urls_stage(text: str, state: Dict) -> str:
+    urls = state.get('urls')
+    if urls:
+        text = text + ''.join(f" {url}" for url in urls)
+    return text
+
+def _truncate_stage(max_length: int) -> Stage:
+    def stage(text: str, state: Dict) -> str:
+        if len(text) > max_length:
+            text = text[:max_length].rsplit(' ', 1)[0] + '...'
+        return text
+    return stage
+
+# enhanced_text_cleaner: URLs are swapped for __URL_i__ placeholders
+_ENHANCED_URL = re.compile(
+    r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
+)
+_URL_PLACEHOLDER = re.compile(r'__URL_(\d+)__')
+
+def _urls_overlap(urls: List[str]) -> bool:
+    """True if one URL occurs inside another, so replacement order matters"""
+    distinct = list(dict.fromkeys(urls))
+    return any(
+        a != b and a in b
+        for a in distinct
+        for b in distinct
+    )
+
+def _placeholder_urls_stage(text: str, state: Dict) -> str:
+    urls = _ENHANCED_URL.findall(text)
+    state['urls'] = urls
+    if not urls:
+        return text
+    if _urls_overlap(urls):
+        # Sequential replacement is order-dependent here; keep its exact result
+        for i, url in enumerate(urls):
+            text = text.replace(url, f"__URL_{i}__")
+        return text
+    first_index = {}
+    for i, url in enumerate(urls):
+        first_index.setdefault(url, i)
+    return _ENHANCED_URL.sub(lambda m: f"__URL_{first_index[m.group(0)]}__", text)
+
+def _restore_urls_stage(text: str, state: Dict) -> str:
+    urls = state.get('urls')
+    if not urls or '__URL_' not in text:
+        return text
+    if any('__URL_' in url for url in urls):
+        for i, url in enumerate(urls):
+            text = text.replace(f"__URL_{i}__", url)
+        return text
+    def restore(match):
+        index = int(match.group(1))
+        return urls[index] if index < len(urls) else match.group(0)
+    return _URL_PLACEHOLDER.sub(restore, text)
+
+# --- Plans -------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def alphabetic_plan() -> CleaningPlan:
+    """Plan behind `text_cleaner.clean_text`"""
+    return CleaningPlan((
+        _soup_text_stage('html.parser'),
+        _sub_stage(r'[^a-zA-Z\s]', ''),
+        _collapse_whitespace_stage,
+        _lower_stage,
+    ))
+
+@lru_cache(maxsize=None)
+def processing_plan(
+    preserve_numbers: bool = True,
+    preserve_urls: bool = True,
+    max_length: Optional[int] = None,
+    strip_markup: bool = True
+) -> CleaningPlan:
+    """Plan behind `text_processing.clean_text`"""
+    stages = []
+    if strip_markup:
+        stages.append(_streaming_html_stage)
+    if preserve_urls:
+        stages.append(_collect_urls_stage)
+    stages.append(_sub_stage(r'[^\w\s]', ' '))
+    if not preserve_numbers:
+        stages.append(_sub_stage(r'\d+', ''))
+    stages.append(_collapse_whitespace_stage)
+    if preserve_urls:
+        stages.append(_append_urls_stage)
+    if max_length:
+        stages.append(_truncate_stage(max_length))
+    stages.append(_strip_stage)
+    return CleaningPlan(stages)
+
+@lru_cache(maxsize=256)
+def _compile_config_plan(key: Tuple) -> CleaningPlan:
+    (preserve_numbers, preserve_case, preserved_punctuation, html_parser,
+     preserve_urls, min_word_length, custom_replacements, extract_tags,
+     cleaning_level, track_metadata) = key
+
+    if cleaning_level == CleaningLevel.MINIMAL:
+        return CleaningPlan((_soup_stripped_stage(html_parser, None, track_metadata),))
+
+    stages = [_soup_stripped_stage(html_parser, extract_tags, track_metadata)]
+    if custom_replacements:
+        stages.append(_replace_stage(custom_replacements))
+    if preserve_urls:
+        stages.append(_placeholder_urls_stage)
+
+    kept = ['a-zA-Z']
+    if preserve_numbers or cleaning_level != CleaningLevel.STRICT:
+        kept.append('0-9')
+    if preserved_punctuation and cleaning_level != CleaningLevel.STRICT:
+        kept.append(re.escape(preserved_punctuation))
+    kept.append(r'\s')
+    stages.append(_sub_stage(f'[^{"".join(kept)}]', ' '))
+
+    if not preserve_case:
+        stages.append(_lower_stage)
+    stages.append(_min_word_length_stage(min_word_length))
+    if preserve_urls:
+        stages.append(_restore_urls_stage)
+    return CleaningPlan(stages)
+
+def compile_plan(config: TextCleanerConfig) -> CleaningPlan:
+    """Return the cached plan for a `TextCleanerConfig`"""
+    return _compile_config_plan(config.plan_key())
+
+def clean_many(
+    texts: Iterable[str],
+    config: Optional[TextCleanerConfig] = None
+) -> List[str]:
+    """Clean a batch of HTML fragments with one compiled plan"""
+    if config is None:
+        config = TextCleanerConfig()
+    return compile_plan(config).clean_many(texts)
@@ -4,10 +4,44 @@ class Config:
     # Flask settings
     SECRET_KEY = 'your-secret-key-here'  # Change this in production!
     DEBUG = False
+
+    # Database settings
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///crypto_news.db'
     
     # News collection settings
     MAX_ARTICLES = 20
     NEWS_UPDATE_INTERVAL = 300  # 5 minutes
+    INGESTION_AUTOSTART = True  # Load stored history and start the background fetch loop on first request
+    WARM_UP_ON_START = False  # Load the sentiment models at startup instead of on the first score
+    FEED_FETCH_WORKERS = 4  # Feeds downloaded in parallel
+    FEED_TIMEOUT = 10  # Seconds allowed per feed download
+    FEED_HOST_MIN_INTERVAL = 1.0  # Seconds between requests to the same host
+    FEED_VALIDATORS_PATH = 'feed_validators.json'  # Persisted ETag/Last-Modified and articles per feed
+    PIPELINE_BUFFER_SIZE = 8  # Items buffered between streaming pipeline stages
+    DEDUP_THRESHOLD = 0.5  # Estimated shingle similarity at which articles are one story
+    DEDUP_NUM_PERM = 64  # MinHash signature length
+    DEDUP_BANDS = 16  # LSH bands; must divide DEDUP_NUM_PERM
+    DEDUP_MAX_ARTICLES = 10000  # Newest articles remembered for dedup, and seeded from the database at startup
+    
+    # Multi-process settings
+    SHARED_SNAPSHOT_PATH = None  # SQLite file shared by gunicorn workers; None ingests in every process
+    SHARED_SNAPSHOT_READ_ONLY = False  # Never take the lease; snapshots come from `flask ingest`
+    SHARED_SNAPSHOT_LEASE = 60  # Seconds the ingesting process holds the lease without renewing it
+    SHARED_SNAPSHOT_POLL_INTERVAL = 2  # Seconds between checks for a newer shared snapshot
+    SHARED_SNAPSHOT_RETAIN = 5  # Versions kept so workers that fell behind can catch up
+
+    # Search settings
+    SEARCH_HISTORY_DAYS = 365  # Stored articles indexed for search when a worker starts
+
+    # API settings
+    API_GZIP_MIN_BYTES = 1024  # Smaller JSON responses are sent uncompressed
+
+    # Profiling settings
+    PROFILING_ENABLED = False  # Profile every index request and ingestion cycle
+    PROFILE_SECRET = None  # HMAC key for one-off X-Profile requests; None disables them
+    PROFILE_DIR = 'profiles'  # Where .prof dumps and their summaries are written
+    PROFILE_RETAIN = 20  # Newest profiles kept; older ones are deleted
+    PROFILE_TOP_N = 25  # Functions listed in each summary
     
     # Text processing settings
     MAX_SUMMARY_LENGTH = 300
@@ -17,6 +51,12 @@ class Config:
     # Sentiment analysis settings
     SENTIMENT_THRESHOLD = 0.3
     SUBJECTIVITY_THRESHOLD = 0.3
+    SENTIMENT_BACKEND = 'textblob'  # 'textblob' or 'lexicon' (vectorized, see lexicon_sentiment.py)
+    SENTIMENT_CACHE_SIZE = 10000  # Scores kept in the in-process LRU
+    SENTIMENT_CACHE_PATH = 'sentiment_cache.sqlite3'  # On-disk second level; None disables it
+    SENTIMENT_BATCH_CHUNK_SIZE = 64  # Texts handed to a pool worker at a time
+    SENTIMENT_POOL_WORKERS = None  # Defaults to the CPU count
+    SENTIMENT_MIN_PARALLEL_BATCH = 256  # Smaller batches are scored in-process
 
 class DevelopmentConfig(Config):
     DEBUG = True
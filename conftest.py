@@ -0,0 +1,10 @@
+import pytest
+from classification import sentiment_cache
+
+@pytest.fixture(autouse=True)
+def sentiment_cache_file(tmp_path, monkeypatch):
+    """Keep the shared sentiment cache's SQLite file out of the working tree"""
+    sentiment_cache.close()
+    monkeypatch.setattr(sentiment_cache, 'path', str(tmp_path / 'sentiment_cache.sqlite3'))
+    yield
+    sentiment_cache.close()
@@ -0,0 +1,143 @@
+"""
+Feed date parsing to UTC epoch timestamps.
+
+Feeds publish dates as RFC-822 (`Sat, 08 Feb 2025 22:30:35 +0000`) or
+ISO-8601 (`2025-02-08T22:30:35Z`). The canonical RFC-822 shape is matched
+by one regular expression; looser RFC-822 variants go through
+`email.utils.parsedate_tz` and ISO-8601 through `datetime.fromisoformat`.
+Each feed remembers the parser that last worked for it and tries that one
+first. Offsets are applied, so every result is a UTC epoch; dates without
+an offset are taken as UTC.
+
+A date nothing can parse is counted, per feed, instead of being replaced
+with a made-up one.
+"""
+import calendar
+import email.utils
+import logging
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DISPLAY_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_MONTHS = {
+    name: number for number, name in enumerate(
+        ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'),
+        start=1
+    )
+}
+
+_RFC822 = re.compile(
+    r'(?:[A-Za-z]{3},\s*)?(\d{1,2})\s+([A-Za-z]{3})\s+(\d{4})\s+'
+    r'(\d{2}):(\d{2})(?::(\d{2}))?\s*([+-]\d{4}|GMT|UTC?|Z)?$'
+)
+
+def _parse_rfc822(value: str) -> Optional[int]:
+    match = _RFC822.match(value)
+    if match is not None:
+        day, month, year, hour, minute, second, zone = match.groups()
+        month_number = _MONTHS.get(month.lower())
+        if month_number is not None:
+            offset = 0
+            if zone and zone[0] in '+-':
+                offset = (int(zone[1:3]) * 3600 + int(zone[3:5]) * 60) * (-1 if zone[0] == '-' else 1)
+            return calendar.timegm(
+                (int(year), month_number, int(day), int(hour), int(minute), int(second or 0))
+            ) - offset
+
+    # Named zones (EST, PDT, ...), two-digit years and other legal variants
+    parsed = email.utils.parsedate_tz(value)
+    if parsed is None:
+        return None
+    return calendar.timegm(parsed[:6]) - (parsed[9] or 0)
+
+def _parse_iso8601(value: str) -> Optional[int]:
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+PARSERS: List[Tuple[str, Callable[[str], Optional[int]]]] = [
+    ('rfc822', _parse_rfc822),
+    ('iso8601', _parse_iso8601),
+]
+
+class DateParser:
+    """Parse feed dates, remembering which parser each feed needs"""
+    def __init__(self, parsers: Optional[List[Tuple[str, Callable[[str], Optional[int]]]]] = None):
+        self.parsers = list(parsers or PARSERS)
+        self.parsed = 0
+        self.unparseable = 0
+        self._preferred: Dict[str, int] = {}
+        self._unparseable_by_feed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def parse(self, value: str, feed: str = '') -> Optional[int]:
+        """
+        Parse a feed date to a UTC epoch timestamp.
+
+        Args:
+            value: Date string as published in the feed
+            feed: Feed URL, used to remember which parser fits
+
+        Returns:
+            Seconds since the epoch, or None if the date cannot be parsed
+        """
+        value = (value or '').strip()
+        preferred = self._preferred.get(feed, 0)
+        if value:
+            ts = self.parsers[preferred][1](value)
+            if ts is not None:
+                with self._lock:
+                    self.parsed += 1
+                return ts
+            for index, (name, parser) in enumerate(self.parsers):
+                if index == preferred:
+                    continue
+                ts = parser(value)
+                if ts is not None:
+                    with self._lock:
+                        self.parsed += 1
+                        self._preferred[feed] = index
+                    logger.info(f"Dates from {feed or 'unknown feed'} now parsed as {name}")
+                    return ts
+
+        with self._lock:
+            self.unparseable += 1
+            first = feed not in self._unparseable_by_feed
+            self._unparseable_by_feed[feed] = self._unparseable_by_feed.get(feed, 0) + 1
+        if first:
+            logger.warning(f"Unparseable date from {feed or 'unknown feed'}: {value!r}")
+        return None
+
+    def stats(self) -> Dict:
+        """Parse counts, unparseable dates per feed and each feed's parser"""
+        with self._lock:
+            return {
+                'parsed': self.parsed,
+                'unparseable': self.unparseable,
+                'unparseable_by_feed': dict(self._unparseable_by_feed),
+                'formats': {feed: self.parsers[index][0] for feed, index in self._preferred.items()}
+            }
+
+def format_timestamp(ts: Optional[int]) -> str:
+    """Display form of an epoch timestamp in UTC; empty when unknown"""
+    if not ts:
+        return ''
+    return time.strftime(DISPLAY_FORMAT, time.gmtime(ts))
+
+# Shared by the feed collector
+date_parser = DateParser()
@@ -0,0 +1,295 @@
+"""
+Near-duplicate detection for syndicated articles.
+
+Every article gets a MinHash signature of its title and summary shingles;
+the fraction of equal signature slots estimates the Jaccard similarity of
+two articles' shingle sets. `MinHashIndex` splits signatures into bands and
+buckets articles by each band's values (locality-sensitive hashing), so a
+lookup only compares against the few articles sharing a bucket instead of
+the whole history.
+
+With 16 bands of 4 rows, two articles with similarity 0.5 share at least
+one bucket about 64% of the time and those with similarity 0.8 over 99.9%
+of the time; syndicated copies of a story are typically well above 0.7.
+
+`NearDuplicateDetector` remembers at most `config.DEDUP_MAX_ARTICLES`
+articles. Past that, the oldest quarter is forgotten and the LSH tables
+are rebuilt from the rest, which keeps memory bounded at an amortized
+cost of one rebuilt entry per article added. At startup the app seeds the
+detector with the newest stored articles, so history survives restarts.
+"""
+import hashlib
+import logging
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config import config
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SHINGLE_SIZE = 3
+
+_SEED = 1729
+
+_WORD_RE = re.compile(r'\w+')
+
+class DeduplicationError(Exception):
+    """Custom exception for duplicate detection errors"""
+    pass
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> List[str]:
+    """Overlapping word n-grams of lowercased text"""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return [' '.join(words)] if words else []
+    return [' '.join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+def article_text(article: Dict) -> str:
+    """Text the signature is computed from"""
+    return f"{article.get('title', '')} {article.get('summary', '')}"
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer; uint64 multiplication wraps around as intended"""
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+    return values ^ (values >> np.uint64(31))
+
+class MinHasher:
+    """
+    Compute fixed-length MinHash signatures.
+
+    Args:
+        num_perm (int): Signature length; more slots give a tighter
+            similarity estimate
+    """
+    def __init__(self, num_perm: int = 64, seed: int = _SEED):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        # Each slot hashes features with its own random key
+        self._keys = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64, endpoint=True)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        MinHash signature of the text's shingles.
+
+        Returns:
+            np.ndarray: uint32 array of length `num_perm`, or None for text
+            without words
+        """
+        features = set(shingles(text))
+        if not features:
+            return None
+        digests = b''.join(
+            hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+            for feature in features
+        )
+        hashes = np.frombuffer(digests, dtype=np.uint64)
+        permuted = _mix64(hashes[:, None] ^ self._keys)
+        # Only the low 32 bits are kept; collisions on them are negligible
+        return permuted.min(axis=0).astype(np.uint32)
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+class MinHashIndex:
+    """
+    Banded LSH table of signatures.
+
+    Args:
+        num_perm (int): Signature length
+        bands (int): Number of equal slices each signature is split into
+        threshold (float): Smallest estimated similarity reported as a match
+    """
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.5):
+        if num_perm % bands:
+            raise DeduplicationError(f"{num_perm} signature slots cannot be split into {bands} bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.threshold = threshold
+        self._rows = num_perm // bands
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        self._size = 0
+        self._tables: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self._rows:(band + 1) * self._rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def add(self, signature: np.ndarray) -> int:
+        """Store a signature and return its position in the index"""
+        position = self._size
+        if position == len(self._signatures):
+            # Grow geometrically so appends stay amortized O(1)
+            grown = np.empty((max(64, 2 * position), self.num_perm), dtype=np.uint32)
+            grown[:position] = self._signatures[:position]
+            self._signatures = grown
+        self._signatures[position] = signature
+        self._size += 1
+        for table, key in zip(self._tables, self._band_keys(signature)):
+            table.setdefault(key, []).append(position)
+        return position
+
+    def query(self, signature: np.ndarray) -> List[Tuple[int, float]]:
+        """
+        Find stored signatures at least `threshold` similar.
+
+        Returns:
+            List of (position, similarity), most similar first
+        """
+        candidates = set()
+        for table, key in zip(self._tables, self._band_keys(signature)):
+            candidates.update(table.get(key, ()))
+        if not candidates:
+            return []
+
+        positions = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        scores = (self._signatures[positions] == signature).mean(axis=1)
+        keep = scores >= self.threshold
+        matches = zip(positions[keep].tolist(), scores[keep].tolist())
+        return sorted(matches, key=lambda item: (-item[1], item[0]))
+
+@dataclass
+class ArticleCluster:
+    """Articles judged to be copies of the same story"""
+    cluster_id: str
+    articles: List[Dict] = field(default_factory=list)
+
+    @property
+    def representative(self) -> Dict:
+        return self.articles[0]
+
+class NearDuplicateDetector:
+    """
+    Assign articles to clusters of near-identical stories.
+
+    The newest `max_articles` articles seen are remembered, so a story
+    syndicated in a later fetch joins the cluster of the copy seen first.
+    Cluster ids are the link of that first copy.
+    """
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        num_perm: Optional[int] = None,
+        bands: Optional[int] = None,
+        max_articles: Optional[int] = None
+    ):
+        num_perm = num_perm if num_perm is not None else config.DEDUP_NUM_PERM
+        self.hasher = MinHasher(num_perm)
+        self.index = MinHashIndex(
+            num_perm=num_perm,
+            bands=bands if bands is not None else config.DEDUP_BANDS,
+            threshold=threshold if threshold is not None else config.DEDUP_THRESHOLD
+        )
+        self.max_articles = max(1, max_articles if max_articles is not None else config.DEDUP_MAX_ARTICLES)
+        self._cluster_by_position: List[str] = []
+        self._cluster_by_link: Dict[str, str] = {}
+        # (link, signature) of every remembered article, oldest first
+        self._history: Deque[Tuple[str, Optional[np.ndarray]]] = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._cluster_by_link)
+
+    def assign(self, article: Dict) -> str:
+        """Return the cluster id for an article, indexing it if it is new"""
+        link = article.get('link') or article.get('title', '')
+        with self._lock:
+            cluster_id = self._cluster_by_link.get(link)
+            if cluster_id is not None:
+                return cluster_id
+
+            signature = self.hasher.signature(article_text(article))
+            cluster_id = link
+            if signature is not None:
+                matches = self.index.query(signature)
+                if matches:
+                    cluster_id = self._cluster_by_position[matches[0][0]]
+                self.index.add(signature)
+                self._cluster_by_position.append(cluster_id)
+            self._cluster_by_link[link] = cluster_id
+            self._history.append((link, signature))
+            if len(self._history) > self.max_articles:
+                self._evict()
+            return cluster_id
+
+    def seed(self, articles: Iterable[Dict]) -> int:
+        """
+        Remember stored articles, oldest first, e.g. at startup.
+
+        Returns:
+            Number of articles now remembered
+        """
+        for article in articles:
+            self.assign(article)
+        return len(self)
+
+    def _evict(self) -> None:
+        # Forget the oldest quarter at once so rebuilds stay rare
+        keep = self.max_articles - self.max_articles // 4
+        while len(self._history) > keep:
+            link, _ = self._history.popleft()
+            self._cluster_by_link.pop(link, None)
+        index = MinHashIndex(self.index.num_perm, self.index.bands, self.index.threshold)
+        cluster_by_position = []
+        for link, signature in self._history:
+            if signature is not None:
+                index.add(signature)
+                cluster_by_position.append(self._cluster_by_link[link])
+        self.index = index
+        self._cluster_by_position = cluster_by_position
+
+    def cluster(self, articles: Iterable[Dict]) -> List[ArticleCluster]:
+        """Group articles by cluster, in order of each cluster's first article"""
+        clusters: Dict[str, ArticleCluster] = {}
+        for article in articles:
+            cluster_id = self.assign(article)
+            cluster = clusters.get(cluster_id)
+            if cluster is None:
+                cluster = clusters[cluster_id] = ArticleCluster(cluster_id)
+            cluster.articles.append(article)
+        return list(clusters.values())
+
+    def collapse(self, articles: Iterable[Dict]) -> List[Dict]:
+        """
+        Keep one article per cluster.
+
+        The first article of each cluster is kept, with the other copies
+        listed under 'duplicates' as {'source', 'link'} entries.
+
+        Returns:
+            List[Dict]: One article per story, in input order
+        """
+        articles = list(articles)
+        collapsed = []
+        for cluster in self.cluster(articles):
+            duplicates = [
+                {'source': copy.get('source', ''), 'link': copy.get('link', '')}
+                for copy in cluster.articles[1:]
+            ]
+            collapsed.append(dict(
+                cluster.representative,
+                cluster_id=cluster.cluster_id,
+                duplicates=duplicates
+            ))
+        if len(collapsed) < len(articles):
+            logger.info(f"Collapsed {len(articles)} articles into {len(collapsed)} stories")
+        return collapsed
+
+# Shared across ingestion cycles so history accumulates
+duplicate_detector = NearDuplicateDetector()
@@ -0,0 +1,327 @@
+"""Background ingestion of news feeds into immutable, versioned article snapshots"""
+import contextlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, ContextManager, Dict, List, Optional, Tuple
+
+from metrics import (
+    ARTICLES_FAILED, ARTICLES_FETCHED, ARTICLES_PROCESSED, ARTICLES_PUBLISHED,
+    ARTICLES_REUSED, ERRORS
+)
+from shared_snapshot import SharedSnapshot, SharedSnapshotError, SharedSnapshotStore
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+class IngestionError(Exception):
+    """Custom exception for ingestion errors"""
+    pass
+
+@dataclass(frozen=True)
+class ArticleSnapshot:
+    """Immutable set of processed articles published by one ingestion cycle"""
+    version: int
+    articles: Tuple[Dict, ...]
+    created_at: float
+    # Articles processed for the first time in this cycle
+    new_articles: Tuple[Dict, ...] = ()
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+EMPTY_SNAPSHOT = ArticleSnapshot(version=0, articles=(), created_at=0.0)
+
+def article_key(article: Dict) -> Tuple:
+    """Identity of a raw article for reusing earlier processing results"""
+    return (
+        article.get('link', ''),
+        article.get('title', ''),
+        article.get('summary', ''),
+        article.get('published_date', '')
+    )
+
+class IngestionScheduler:
+    """
+    Periodically fetch and process news in a background thread.
+
+    Readers call `snapshot()` and get the most recently published
+    `ArticleSnapshot`. Publishing swaps a single reference, so readers never
+    see a partially built article list and never block on a refresh.
+
+    With a `shared` store, processes take turns through its lease: the
+    holder ingests and writes every snapshot to the store, and the others
+    only load those snapshots, checking every `poll_interval` seconds.
+    Processes created with `produce=False` never ingest.
+    """
+    def __init__(
+        self,
+        fetch: Callable[[], List[Dict]],
+        process: Callable[[Dict], Optional[Dict]],
+        interval: float,
+        cycle_context: Optional[Callable[[], ContextManager]] = None,
+        shared: Optional[SharedSnapshotStore] = None,
+        produce: bool = True,
+        poll_interval: float = 2.0,
+        process_batch: Optional[Callable[[List[Dict]], List[Optional[Dict]]]] = None
+    ):
+        self.fetch = fetch
+        self.process = process
+        # Processes all of a cycle's new articles in one call when given
+        self.process_batch = process_batch
+        self.interval = interval
+        # Entered around every refresh, e.g. to profile ingestion cycles
+        self.cycle_context = cycle_context or contextlib.nullcontext
+        self.shared = shared
+        self.produce = produce
+        self.poll_interval = poll_interval
+        self.last_error: Optional[str] = None
+        self._snapshot = EMPTY_SNAPSHOT
+        self._processed_by_key: Dict[Tuple, Dict] = {}
+        # (listener, producer_only) pairs
+        self._listeners: List[Tuple[Callable[[ArticleSnapshot], None], bool]] = []
+        self._refresh_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def snapshot(self) -> ArticleSnapshot:
+        """Return the latest published snapshot without blocking"""
+        return self._snapshot
+
+    def add_listener(self, listener: Callable[[ArticleSnapshot], None], producer_only: bool = False) -> None:
+        """
+        Register a callback invoked with every newly published snapshot.
+
+        Args:
+            listener: Called with each snapshot, in version order
+            producer_only: Skip snapshots loaded from the shared store, e.g.
+                for side effects that must happen once across processes
+        """
+        self._listeners.append((listener, producer_only))
+
+    def refresh(self) -> ArticleSnapshot:
+        """
+        Run one ingestion cycle and publish its result.
+
+        Returns:
+            The newly published snapshot
+
+        Raises:
+            IngestionError: If the articles could not be fetched, or another
+                process holds the shared ingestion lease
+        """
+        with self.cycle_context():
+            return self._refresh()
+
+    def _refresh(self) -> ArticleSnapshot:
+        with self._refresh_lock:
+            loaded = []
+            if self.shared is not None:
+                try:
+                    if not self.produce or not self.shared.acquire_lease():
+                        raise IngestionError("Another process holds the ingestion lease")
+                    # Continue from the newest stored version and its results
+                    loaded = self._load_shared()
+                except SharedSnapshotError as e:
+                    ERRORS.labels('ingest').inc()
+                    raise IngestionError(str(e))
+        self._notify(loaded, produced=False)
+
+        with self._refresh_lock:
+            try:
+                raw_articles = self.fetch()
+            except Exception as e:
+                ERRORS.labels('ingest').inc()
+                self.last_error = str(e)
+                error_msg = f"Error fetching articles: {e}"
+                logger.error(error_msg)
+                raise IngestionError(error_msg)
+
+            # Unchanged entries (e.g. from a 304 feed) reuse last cycle's result;
+            # the rest are processed together so scoring can batch them
+            pending = {}
+            for article in raw_articles:
+                key = article_key(article)
+                if key not in self._processed_by_key and key not in pending:
+                    pending[key] = article
+            fresh = dict(zip(pending, self._process_all(list(pending.values()))))
+
+            processed_articles = []
+            processed_keys = []
+            new_articles = []
+            processed_by_key = {}
+            failed = 0
+            for article in raw_articles:
+                key = article_key(article)
+                processed = processed_by_key.get(key) or self._processed_by_key.get(key)
+                if processed is None and key in fresh:
+                    processed = fresh.pop(key)
+                    if processed:
+                        new_articles.append(processed)
+                    else:
+                        failed += 1
+                if processed:
+                    processed_articles.append(processed)
+                    processed_keys.append(key)
+                    processed_by_key[key] = processed
+
+            snapshot = ArticleSnapshot(
+                version=self._snapshot.version + 1,
+                articles=tuple(processed_articles),
+                created_at=time.time(),
+                new_articles=tuple(new_articles)
+            )
+            if self.shared is not None:
+                try:
+                    self.shared.publish(
+                        snapshot.version, snapshot.created_at, snapshot.articles,
+                        tuple(processed_keys), snapshot.new_articles
+                    )
+                except SharedSnapshotError as e:
+                    ERRORS.labels('ingest').inc()
+                    self.last_error = str(e)
+                    logger.error(f"Error sharing snapshot: {e}")
+                    raise IngestionError(str(e))
+            self._processed_by_key = processed_by_key
+            self._snapshot = snapshot
+            self.last_error = None
+            ARTICLES_FETCHED.inc(len(raw_articles))
+            ARTICLES_PROCESSED.inc(len(new_articles))
+            ARTICLES_REUSED.inc(len(processed_articles) - len(new_articles))
+            ARTICLES_FAILED.inc(failed)
+            ARTICLES_PUBLISHED.inc(len(processed_articles))
+            logger.info(
+                f"Published snapshot v{snapshot.version} with {len(snapshot)} articles"
+            )
+
+        self._notify([snapshot], produced=True)
+        return snapshot
+
+    def _process_all(self, articles: List[Dict]) -> List[Optional[Dict]]:
+        if not articles:
+            return []
+        if self.process_batch is not None:
+            return self.process_batch(articles)
+        return [self.process(article) for article in articles]
+
+    def sync(self) -> Optional[ArticleSnapshot]:
+        """
+        Publish snapshots another process wrote to the shared store.
+
+        Returns:
+            The newest snapshot loaded, or None if there was nothing new
+
+        Raises:
+            IngestionError: If the shared store cannot be read
+        """
+        if self.shared is None:
+            return None
+        with self._refresh_lock:
+            try:
+                loaded = self._load_shared() if self.shared.changed() else []
+            except SharedSnapshotError as e:
+                ERRORS.labels('ingest').inc()
+                raise IngestionError(str(e))
+        self._notify(loaded, produced=False)
+        return loaded[-1] if loaded else None
+
+    def _load_shared(self) -> List[ArticleSnapshot]:
+        """Adopt stored snapshots newer than ours; caller holds the refresh lock"""
+        stored: List[SharedSnapshot] = self.shared.load_since(self._snapshot.version)
+        if not stored:
+            return []
+        if self._snapshot.version and stored[0].version > self._snapshot.version + 1:
+            logger.warning(
+                f"Skipped snapshots v{self._snapshot.version + 1}-v{stored[0].version - 1}; "
+                f"their new articles were not indexed here"
+            )
+        loaded = [
+            ArticleSnapshot(
+                version=shared.version,
+                articles=shared.articles,
+                created_at=shared.created_at,
+                new_articles=shared.new_articles
+            )
+            for shared in stored
+        ]
+        # Lets this process reuse the results if it takes the lease over
+        self._processed_by_key = dict(zip(stored[-1].keys, stored[-1].articles))
+        self._snapshot = loaded[-1]
+        logger.info(f"Loaded shared snapshot v{self._snapshot.version} with {len(self._snapshot)} articles")
+        return loaded
+
+    def _notify(self, snapshots: List[ArticleSnapshot], produced: bool) -> None:
+        for snapshot in snapshots:
+            for listener, producer_only in self._listeners:
+                if producer_only and not produced:
+                    continue
+                try:
+                    listener(snapshot)
+                except Exception as e:
+                    ERRORS.labels('listener').inc()
+                    logger.error(f"Snapshot listener failed: {e}")
+
+    def start(self) -> None:
+        """Start the background thread; calling it again is a no-op"""
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name='news-ingestion',
+                daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Signal the background thread to exit and wait for it"""
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+        if self.shared is not None and self.produce:
+            self.shared.release_lease()
+
+    def run_forever(self) -> None:
+        """Run the ingestion loop in the calling thread until `stop()`"""
+        self._stop_event.clear()
+        self._run()
+
+    def _run(self) -> None:
+        if self.shared is not None:
+            self._run_shared()
+            return
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except IngestionError:
+                pass
+            except Exception as e:
+                logger.error(f"Unexpected ingestion failure: {e}")
+            self._stop_event.wait(self.interval)
+
+    def _run_shared(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                if self.produce and self.shared.acquire_lease():
+                    self.sync()
+                    # A process taking the lease over keeps the existing schedule
+                    if time.time() - self._snapshot.created_at >= self.interval:
+                        self.refresh()
+                else:
+                    self.sync()
+            except IngestionError:
+                pass
+            except Exception as e:
+                logger.error(f"Unexpected ingestion failure: {e}")
+            self._stop_event.wait(self.poll_interval)
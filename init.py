@@ -1,18 +1,135 @@
-import nltk
+"""
+Startup checks and model warm-up.
+
+Heavy NLP and HTML dependencies (TextBlob, which loads NLTK, and bs4) are
+imported on first use rather than when the app starts. `initialize_app`
+only checks that the NLTK corpora are installed locally and never fetches
+them; run `python init.py --download` once while provisioning to install
+them. `warm_up` loads the sentiment models before a worker accepts
+traffic, so the first request does not pay for it; the app calls it at
+startup when `config.WARM_UP_ON_START` is set.
+"""
+import argparse
 import logging
+import os
+import sys
+import time
+from typing import Dict, List
+
+from config import config
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Package name -> resource path under an NLTK data directory
+REQUIRED_CORPORA = {
+    'punkt': os.path.join('tokenizers', 'punkt'),
+    'averaged_perceptron_tagger': os.path.join('taggers', 'averaged_perceptron_tagger'),
+    'wordnet': os.path.join('corpora', 'wordnet'),
+}
+
+WARM_UP_TEXT = "Bitcoin rallies as investors welcome the news."
+
+class InitializationError(Exception):
+    """Custom exception for application initialization errors"""
+    pass
+
+def nltk_data_dirs() -> List[str]:
+    """Directories NLTK searches for data, without importing NLTK"""
+    if 'nltk' in sys.modules:
+        return list(sys.modules['nltk'].data.path)
+    # Mirrors nltk.data.path: $NLTK_DATA, the home directory, then system locations
+    dirs = [d for d in os.environ.get('NLTK_DATA', '').split(os.pathsep) if d]
+    dirs.append(os.path.expanduser(os.path.join('~', 'nltk_data')))
+    for prefix in (sys.prefix, os.path.join(sys.prefix, 'share'), os.path.join(sys.prefix, 'lib')):
+        dirs.append(os.path.join(prefix, 'nltk_data'))
+    dirs.extend(['/usr/share/nltk_data', '/usr/local/share/nltk_data', '/usr/lib/nltk_data', '/usr/local/lib/nltk_data'])
+    return dirs
+
+def missing_corpora() -> List[str]:
+    """Required corpora not found, unpacked or zipped, in any local NLTK data directory"""
+    dirs = nltk_data_dirs()
+    missing = []
+    for name, resource in REQUIRED_CORPORA.items():
+        found = any(
+            os.path.exists(os.path.join(d, resource)) or os.path.exists(os.path.join(d, resource + '.zip'))
+            for d in dirs
+        )
+        if not found:
+            missing.append(name)
+    return missing
+
+def initialize_app(download: bool = False) -> List[str]:
+    """
+    Check application dependencies without touching the network.
+
+    Args:
+        download: Fetch missing corpora with `nltk.download`; meant for
+            provisioning, never for app startup
+
+    Returns:
+        Names of the corpora still missing
+
+    Raises:
+        InitializationError: If a download was requested and failed
+    """
+    missing = missing_corpora()
+    if missing and download:
+        import nltk
+        for name in missing:
+            if not nltk.download(name, quiet=True):
+                raise InitializationError(f"Could not download NLTK corpus: {name}")
+        missing = missing_corpora()
+    if missing:
+        logger.warning(
+            f"NLTK corpora not installed: {', '.join(missing)}. "
+            f"Run `python init.py --download` to install them."
+        )
+    else:
+        logger.info("All NLTK corpora are installed")
+    return missing
+
+def warm_up() -> Dict[str, float]:
+    """
+    Load the sentiment backend and HTML parser fallback ahead of traffic.
+
+    Returns:
+        Seconds spent on each step
+    """
+    from classification import score_text
+
+    timings = {}
+    start = time.perf_counter()
+    # Scoring once loads the backend's lexicon as well as its modules
+    score_text(WARM_UP_TEXT, use_cache=False)
+    timings[f"sentiment.{config.SENTIMENT_BACKEND}"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from bs4 import BeautifulSoup
+    BeautifulSoup('<p>warm up</p>', 'html.parser')
+    timings['bs4'] = time.perf_counter() - start
+
+    logger.info("Warmed up " + ', '.join(f"{name} in {seconds * 1000:.0f} ms" for name, seconds in timings.items()))
+    return timings
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check local NLTK corpora and optionally warm up the models")
+    parser.add_argument('--download', action='store_true', help='Download missing corpora')
+    parser.add_argument('--warm-up', action='store_true', help='Load the sentiment models and time it')
+    args = parser.parse_args(argv)
 
-def initialize_app():
-    """Initialize application dependencies"""
     try:
-        # Download required NLTK data
-        nltk.download('punkt')
-        nltk.download('averaged_perceptron_tagger')
-        nltk.download('wordnet')
-        print("Successfully initialized NLTK data")
-        
-    except Exception as e:
-        logging.error(f"Error initializing application: {e}")
-        raise
+        missing = initialize_app(download=args.download)
+    except InitializationError as e:
+        logger.error(f"Error initializing application: {e}")
+        return 1
+    if args.warm_up:
+        warm_up()
+    return 1 if missing else 0
 
 if __name__ == "__main__":
-    initialize_app()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+Vectorized lexicon sentiment engine, a drop-in alternative to TextBlob.
+
+TextBlob's default analyzer is pattern's lexicon scorer: every known word is
+an assessment, adverbs modify the next known word, negations flip and halve
+it, and "!" boosts the preceding one. This module loads the same lexicon once
+into NumPy arrays and applies those rules to a whole batch of documents with
+array operations instead of one Python state machine per document.
+
+Parity with TextBlob: polarity and subjectivity agree within
+PARITY_TOLERANCE per document on ordinary news text. Known differences:
+
+- emoticons, the sarcasm mark "(!)" and the "really not good" rule (a
+  negation directly after an -ly modifier) are not scored;
+- tokenization is a simplified port of pattern's `find_tokens`, so text
+  with unusual abbreviations may split slightly differently.
+"""
+import logging
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Largest per-document difference from TextBlob expected on news text
+PARITY_TOLERANCE = 0.05
+
+# pattern also lists "n't", but its tokenizer splits contractions into
+# "n", "'", "t", so TextBlob never flips "isn't good"; neither does this
+NEGATIONS = frozenset(("no", "not", "never"))
+EXCLAMATION = "!"
+
+# Tokenizer rules mirrored from pattern's find_tokens
+_PUNCTUATION = ".,;:!?()[]{}`''\"@#$^&*+-|=~_"
+_LEADING = tuple(_PUNCTUATION.replace(".", ""))
+_TRAILING = _LEADING + (".",)
+_QUOTES = re.compile("([“”‘’'\"])")
+_ABBREVIATIONS = frozenset((
+    "a.", "adj.", "adv.", "al.", "a.m.", "c.", "cf.", "comp.", "conf.", "def.",
+    "ed.", "e.g.", "esp.", "etc.", "ex.", "f.", "fig.", "gen.", "id.", "i.e.",
+    "int.", "l.", "m.", "Med.", "Mil.", "Mr.", "n.", "n.q.", "orig.", "pl.",
+    "pred.", "pres.", "p.m.", "ref.", "v.", "vs.", "w/"
+))
+_RE_ABBR1 = re.compile(r"^[A-Za-z]\.$")
+_RE_ABBR2 = re.compile(r"^([A-Za-z]\.)+$")
+_RE_ABBR3 = re.compile(r"^[A-Z][bcdfghjklmnpqrstvwxz]+.$")
+
+# Token flags for words outside the lexicon
+_FLAG_NEGATION = 1
+_FLAG_RESETS_MODIFIER = 2  # len(w) > 2
+_FLAG_RESETS_NEGATION = 4  # len(w.strip("'")) > 1
+_FLAG_EXCLAMATION = 8
+
+def _is_abbreviation(token: str) -> bool:
+    return (
+        token in _ABBREVIATIONS
+        or _RE_ABBR1.match(token) is not None
+        or _RE_ABBR2.match(token) is not None
+        or _RE_ABBR3.match(token) is not None
+    )
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word and punctuation tokens"""
+    text = _QUOTES.sub(r" \1 ", text.replace("n't", " n't"))
+    tokens = []
+    for chunk in text.split():
+        while chunk.startswith(_LEADING):
+            tokens.append(chunk[0])
+            chunk = chunk[1:]
+        tail = []
+        while chunk.endswith(_TRAILING):
+            if chunk.endswith(_LEADING):
+                tail.append(chunk[-1])
+                chunk = chunk[:-1]
+            if chunk.endswith("..."):
+                tail.append("...")
+                chunk = chunk[:-3].rstrip(".")
+            if chunk.endswith("."):
+                if _is_abbreviation(chunk):
+                    break
+                tail.append(".")
+                chunk = chunk[:-1]
+        if chunk:
+            tokens.append(chunk.lower())
+        tokens.extend(reversed(tail))
+    return tokens
+
+class LexiconSentimentEngine:
+    """Score batches of documents against TextBlob's sentiment lexicon"""
+    def __init__(self, lexicon: Optional[Dict] = None):
+        if lexicon is None:
+            from textblob.en import sentiment as pattern_sentiment
+            pattern_sentiment.load()
+            lexicon = dict(dict.items(pattern_sentiment))
+
+        words = sorted(lexicon)
+        self.vocabulary: Dict[str, int] = {word: i for i, word in enumerate(words)}
+        scores = np.array([lexicon[word][None] for word in words], dtype=np.float64).reshape(-1, 3)
+        self.polarity = scores[:, 0].copy()
+        self.subjectivity = scores[:, 1].copy()
+        self.intensity = scores[:, 2].copy()
+        self.is_modifier = np.array(['RB' in lexicon[word] for word in words], dtype=bool)
+        # token -> (lexicon id or -1, flags); grows with the corpus vocabulary
+        self._token_codes: Dict[str, Tuple[int, int]] = {}
+
+    def _code(self, token: str) -> Tuple[int, int]:
+        code = self._token_codes.get(token)
+        if code is None:
+            word_id = self.vocabulary.get(token, -1)
+            flags = 0
+            if word_id < 0:
+                if token in NEGATIONS:
+                    flags |= _FLAG_NEGATION
+                if len(token) > 2:
+                    flags |= _FLAG_RESETS_MODIFIER
+                if len(token.strip("'")) > 1:
+                    flags |= _FLAG_RESETS_NEGATION
+                if token == EXCLAMATION:
+                    flags |= _FLAG_EXCLAMATION
+            code = (word_id, flags)
+            self._token_codes[token] = code
+        return code
+
+    def score_batch(self, texts: List[str]) -> List[Tuple[float, float]]:
+        """Return (polarity, subjectivity) for each text, in order"""
+        return self.score_tokenized([tokenize(text) for text in texts])
+
+    def score_tokenized(self, documents: List[List[str]]) -> List[Tuple[float, float]]:
+        """Return (polarity, subjectivity) for each pre-tokenized document"""
+        n_docs = len(documents)
+        if n_docs == 0:
+            return []
+
+        lengths = np.fromiter((len(doc) for doc in documents), dtype=np.int64, count=n_docs)
+        n_tokens = int(lengths.sum())
+        if n_tokens == 0:
+            return [(0.0, 0.0)] * n_docs
+
+        codes = np.array(
+            [self._code(token) for doc in documents for token in doc],
+            dtype=np.int64
+        ).reshape(-1, 2)
+        ids, flags = codes[:, 0], codes[:, 1]
+        positions = np.arange(n_tokens)
+        doc_of_token = np.repeat(np.arange(n_docs), lengths)
+        doc_start = np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+        known = ids >= 0
+        known_pos = positions[known]
+        if known_pos.size == 0:
+            return [(0.0, 0.0)] * n_docs
+        known_ids = ids[known]
+        known_doc = doc_of_token[known]
+
+        # Position of the previous known token in the same document, or
+        # doc_start - 1 when there is none
+        prev_known = np.full(known_pos.size, -1, dtype=np.int64)
+        prev_known[1:] = known_pos[:-1]
+        first_in_doc = np.ones(known_pos.size, dtype=bool)
+        first_in_doc[1:] = known_doc[1:] != known_doc[:-1]
+        prev_known[first_in_doc] = doc_start[known_pos[first_in_doc]] - 1
+
+        # A modifier carries over to the next known word unless a longer
+        # unknown word sits between them
+        modifier_resets = np.cumsum((flags & _FLAG_RESETS_MODIFIER) != 0)
+        linked = np.zeros(known_pos.size, dtype=bool)
+        linked[1:] = (
+            ~first_in_doc[1:]
+            & self.is_modifier[known_ids[:-1]]
+            & (modifier_resets[known_pos[1:]] == modifier_resets[known_pos[:-1]])
+        )
+
+        # A negation is pending if it is the latest negation/reset event
+        # since the previous known word
+        last_negation = np.maximum.accumulate(
+            np.where((flags & _FLAG_NEGATION) != 0, positions, -1)
+        )
+        resets = ((flags & _FLAG_RESETS_NEGATION) != 0) & ((flags & _FLAG_NEGATION) == 0)
+        last_reset = np.maximum.accumulate(np.where(resets, positions, -1))
+        negated = (
+            (last_negation[known_pos] > prev_known)
+            & (last_negation[known_pos] > last_reset[known_pos])
+        )
+
+        # Linked known words collapse into one assessment; its scores come
+        # from the last word scaled by the previous word's intensity
+        group_start = ~linked
+        group_of_known = np.cumsum(group_start) - 1
+        n_groups = int(group_of_known[-1]) + 1
+        group_last = np.zeros(n_groups, dtype=np.int64)
+        group_last[group_of_known] = np.arange(known_pos.size)
+
+        intensity = self.intensity[known_ids]
+        effective_intensity = np.where(negated, 1.0 / intensity, intensity)
+        scale = np.ones(known_pos.size)
+        scale[1:] = np.where(linked[1:], effective_intensity[:-1], 1.0)
+        polarity = np.clip(self.polarity[known_ids] * scale, -1.0, 1.0)[group_last]
+        subjectivity = np.clip(self.subjectivity[known_ids] * scale, -1.0, 1.0)[group_last]
+        group_negated = np.bincount(group_of_known, weights=negated, minlength=n_groups) > 0
+        group_doc = known_doc[group_last]
+        group_end = known_pos[group_last]
+
+        # Each "!" boosts the most recent assessment if no later word merges into it
+        exclamations = positions[(flags & _FLAG_EXCLAMATION) != 0]
+        if exclamations.size:
+            preceding = np.searchsorted(known_pos, exclamations, side='left') - 1
+            valid = preceding >= 0
+            preceding, exclamations = preceding[valid], exclamations[valid]
+            groups = group_of_known[preceding]
+            same_doc = known_doc[preceding] == doc_of_token[exclamations]
+            not_merged = group_end[groups] < exclamations
+            boosts = np.bincount(groups[same_doc & not_merged], minlength=n_groups)
+            polarity = np.clip(polarity * np.power(1.25, boosts), -1.0, 1.0)
+
+        polarity = np.where(group_negated, polarity * -0.5, polarity)
+
+        counts = np.bincount(group_doc, minlength=n_docs)
+        denominator = np.maximum(counts, 1)
+        doc_polarity = np.bincount(group_doc, weights=polarity, minlength=n_docs) / denominator
+        doc_subjectivity = np.bincount(group_doc, weights=subjectivity, minlength=n_docs) / denominator
+        return list(zip(doc_polarity.tolist(), doc_subjectivity.tolist()))
+
+_engine: Optional[LexiconSentimentEngine] = None
+_engine_lock = threading.Lock()
+
+def get_engine() -> LexiconSentimentEngine:
+    """Return the shared engine, loading the lexicon on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = LexiconSentimentEngine()
+                logger.info(f"Loaded sentiment lexicon with {len(_engine.vocabulary)} words")
+    return _engine
@@ -1,6 +1,10 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import validates
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import hashlib
 
 db = SQLAlchemy()
 
@@ -31,3 +35,617 @@ class AlertSettings(db.Model):
     crypto_symbol = db.Column(db.String(10), nullable=False)
     sentiment_threshold = db.Column(db.Float, nullable=False)
     email_alerts = db.Column(db.Boolean, default=True)
+
+    @validates('sentiment_threshold')
+    def validate_threshold(self, key, value):
+        # Positive thresholds fire on rising sentiment, negative ones on falling;
+        # zero would match every neutral article
+        if value is None or float(value) == 0:
+            raise ValueError("Sentiment threshold must be non-zero")
+        return value
+
+class AlertSettingsVersion(db.Model):
+    """Single-row counter bumped in every transaction that changes AlertSettings"""
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def current(cls) -> int:
+        """Committed version; 0 if AlertSettings has never changed"""
+        # A column query, so the value is never served from the identity map
+        return db.session.query(cls.version).filter(cls.id == 1).scalar() or 0
+
+    @classmethod
+    def bump(cls, connection) -> None:
+        """Increment the version on `connection`, inside the caller's transaction"""
+        table = cls.__table__
+        result = connection.execute(
+            table.update().where(table.c.id == 1).values(version=table.c.version + 1)
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(id=1, version=1))
+
+class AlertOutbox(db.Model):
+    """Alert matched by an article, waiting to be delivered"""
+    __table_args__ = (
+        db.UniqueConstraint('alert_id', 'article_id', name='uq_alert_outbox_alert_article'),
+        # Dispatchers poll undelivered rows oldest-first
+        db.Index('ix_alert_outbox_sent_at_id', 'sent_at', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    alert_id = db.Column(db.Integer, db.ForeignKey('alert_settings.id', ondelete='CASCADE'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id', ondelete='CASCADE'), nullable=False)
+    crypto_symbol = db.Column(db.String(10), nullable=False)
+    polarity = db.Column(db.Float, nullable=False)
+    sentiment_threshold = db.Column(db.Float, nullable=False)
+    email_alerts = db.Column(db.Boolean, default=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    @classmethod
+    def enqueue(cls, rows: List[Dict]) -> int:
+        """
+        Add outbox rows, skipping alert/article pairs already queued.
+
+        Does not commit; the caller owns the transaction.
+
+        Returns:
+            Number of rows inserted
+        """
+        if not rows:
+            return 0
+        seen = set(
+            db.session.query(cls.alert_id, cls.article_id)
+            .filter(cls.alert_id.in_({r['alert_id'] for r in rows}))
+            .filter(cls.article_id.in_({r['article_id'] for r in rows}))
+        )
+        fresh = []
+        for row in rows:
+            pair = (row['alert_id'], row['article_id'])
+            if pair not in seen:
+                seen.add(pair)
+                fresh.append(row)
+        if not fresh:
+            return 0
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            # Still guards against a row committed since the lookup above
+            insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+            stmt = insert(cls.__table__).on_conflict_do_nothing(
+                index_elements=['alert_id', 'article_id']
+            )
+            db.session.execute(stmt, fresh)
+        else:
+            for row in fresh:
+                db.session.add(cls(**row))
+        return len(fresh)
+
+class ArticleSymbol(db.Model):
+    """Cryptocurrency symbol mentioned by an article"""
+    __tablename__ = 'article_symbol'
+    __table_args__ = (
+        # Per-symbol timelines: newest articles mentioning a symbol
+        db.Index('ix_article_symbol_symbol_published', 'symbol', 'published_ts', 'article_id'),
+    )
+
+    article_id = db.Column(
+        db.Integer, db.ForeignKey('article.id', ondelete='CASCADE'), primary_key=True
+    )
+    symbol = db.Column(db.String(10), primary_key=True)
+    # Copied from the article so symbol timelines need no join to sort
+    published_ts = db.Column(db.Integer, nullable=False, default=0)
+
+class Article(db.Model):
+    __table_args__ = (
+        # Keyset pagination newest-first walks these indexes in reverse; the
+        # second also serves plain lookups by source
+        db.Index('ix_article_published_ts_id', 'published_ts', 'id'),
+        db.Index('ix_article_source_published_ts_id', 'source', 'published_ts', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    link_hash = db.Column(db.String(40), unique=True, nullable=False, index=True)
+    link = db.Column(db.Text, nullable=False)
+    source = db.Column(db.String(255), nullable=False, default='')
+    title = db.Column(db.Text, nullable=False)
+    summary = db.Column(db.Text, nullable=False, default='')
+    published_ts = db.Column(db.Integer, nullable=False)
+    polarity = db.Column(db.Float, nullable=False, default=0.0)
+    subjectivity = db.Column(db.Float, nullable=False, default=0.0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    symbols = db.relationship('ArticleSymbol', lazy=True, cascade='all, delete-orphan')
+
+    UPSERT_CHUNK_SIZE = 500
+
+    @staticmethod
+    def hash_link(link: str) -> str:
+        return hashlib.sha1(link.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def row_from_processed(cls, article: Dict) -> Dict:
+        """Column values for a dict built by `pipeline.process_article`"""
+        link = article.get('url') or article.get('link', '')
+        sentiment = article.get('sentiment') or {}
+        return {
+            'link_hash': cls.hash_link(link),
+            'link': link,
+            'source': article.get('source', ''),
+            'title': article.get('title', ''),
+            'summary': article.get('summary', ''),
+            'published_ts': int(article.get('published_ts') or 0),
+            'polarity': float(sentiment.get('polarity', 0.0)),
+            'subjectivity': float(sentiment.get('subjectivity', 0.0)),
+        }
+
+    def to_processed(self) -> Dict:
+        """Inverse of `row_from_processed`, for code that consumes processed articles"""
+        return {
+            'title': self.title,
+            'summary': self.summary,
+            'url': self.link,
+            'published_ts': self.published_ts,
+            'source': self.source,
+            'sentiment': {'polarity': self.polarity, 'subjectivity': self.subjectivity}
+        }
+
+    @classmethod
+    def bulk_upsert(cls, articles: Iterable[Dict]) -> int:
+        """
+        Insert or update processed articles in a single transaction.
+
+        Rows are deduplicated on the link hash, both within the batch (last
+        one wins) and against rows already stored. Articles carrying a
+        'symbols' list have their ArticleSymbol tags replaced by it.
+        Articles stored for the first time are added to SentimentRollup;
+        updates that change an article's time, source, scores or symbols
+        recompute the rollup buckets it left and entered.
+
+        Returns:
+            Number of distinct articles written
+        """
+        rows_by_hash = {}
+        symbols_by_hash = {}
+        for article in articles:
+            row = cls.row_from_processed(article)
+            if row['link']:
+                rows_by_hash[row['link_hash']] = row
+                if 'symbols' in article:
+                    symbols_by_hash[row['link_hash']] = article['symbols']
+        rows = list(rows_by_hash.values())
+        if not rows:
+            return 0
+
+        try:
+            # First-time inserts are added to the rollups; changed rows are recomputed
+            previous = cls._rollup_inputs(rows_by_hash)
+            dialect = db.session.get_bind().dialect.name
+            if dialect in ('sqlite', 'postgresql'):
+                insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+                # One statement executed for all rows compiles once, unlike a
+                # multi-row VALUES clause
+                stmt = insert(cls.__table__)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['link_hash'],
+                    set_={
+                        name: stmt.excluded[name]
+                        for name in rows[0]
+                        if name != 'link_hash'
+                    }
+                )
+                db.session.execute(stmt, rows)
+            else:
+                existing = {
+                    article.link_hash: article
+                    for article in cls.query.filter(cls.link_hash.in_(list(rows_by_hash)))
+                }
+                for row in rows:
+                    article = existing.get(row['link_hash'])
+                    if article is None:
+                        db.session.add(cls(**row))
+                    else:
+                        for name, value in row.items():
+                            setattr(article, name, value)
+            if symbols_by_hash:
+                cls._replace_symbols(symbols_by_hash, rows_by_hash)
+            new_rows = [row for link_hash, row in rows_by_hash.items() if link_hash not in previous]
+            SentimentRollup.add_rows(new_rows, symbols_by_hash)
+            changed = set()
+            for link_hash, old in previous.items():
+                row = rows_by_hash[link_hash]
+                symbols = frozenset(symbols_by_hash[link_hash]) if link_hash in symbols_by_hash else old[4]
+                if (row['published_ts'], row['source'], row['polarity'], row['subjectivity'], symbols) != old:
+                    changed.update((old[0], row['published_ts']))
+            if changed:
+                SentimentRollup.recompute(changed)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return len(rows)
+
+    @classmethod
+    def ids_by_hash(cls, link_hashes: Iterable[str]) -> Dict[str, int]:
+        """Map link hashes to the ids of stored articles"""
+        hashes = list(link_hashes)
+        ids = {}
+        for start in range(0, len(hashes), cls.UPSERT_CHUNK_SIZE):
+            ids.update(
+                db.session.query(cls.link_hash, cls.id)
+                .filter(cls.link_hash.in_(hashes[start:start + cls.UPSERT_CHUNK_SIZE]))
+            )
+        return ids
+
+    @classmethod
+    def _rollup_inputs(cls, link_hashes: Iterable[str]) -> Dict[str, Tuple]:
+        """(published_ts, source, polarity, subjectivity, symbols) of stored articles by link hash"""
+        hashes = list(link_hashes)
+        inputs: Dict[str, list] = {}
+        hash_by_id: Dict[int, str] = {}
+        for start in range(0, len(hashes), cls.UPSERT_CHUNK_SIZE):
+            for article_id, link_hash, *values in db.session.query(
+                cls.id, cls.link_hash, cls.published_ts, cls.source, cls.polarity, cls.subjectivity
+            ).filter(cls.link_hash.in_(hashes[start:start + cls.UPSERT_CHUNK_SIZE])):
+                hash_by_id[article_id] = link_hash
+                inputs[link_hash] = values + [set()]
+        article_ids = list(hash_by_id)
+        for start in range(0, len(article_ids), cls.UPSERT_CHUNK_SIZE):
+            for article_id, symbol in db.session.query(ArticleSymbol.article_id, ArticleSymbol.symbol).filter(
+                ArticleSymbol.article_id.in_(article_ids[start:start + cls.UPSERT_CHUNK_SIZE])
+            ):
+                inputs[hash_by_id[article_id]][4].add(symbol)
+        return {
+            link_hash: (ts, source, polarity, subjectivity, frozenset(symbols))
+            for link_hash, (ts, source, polarity, subjectivity, symbols) in inputs.items()
+        }
+
+    @classmethod
+    def _replace_symbols(cls, symbols_by_hash: Dict[str, List[str]], rows_by_hash: Dict[str, Dict]) -> None:
+        db.session.flush()
+        ids_by_hash = cls.ids_by_hash(symbols_by_hash)
+        article_ids = list(ids_by_hash.values())
+        for start in range(0, len(article_ids), cls.UPSERT_CHUNK_SIZE):
+            ArticleSymbol.query.filter(
+                ArticleSymbol.article_id.in_(article_ids[start:start + cls.UPSERT_CHUNK_SIZE])
+            ).delete(synchronize_session=False)
+        tags = [
+            {
+                'article_id': ids_by_hash[link_hash],
+                'symbol': symbol,
+                'published_ts': rows_by_hash[link_hash]['published_ts']
+            }
+            for link_hash, symbols in symbols_by_hash.items()
+            for symbol in dict.fromkeys(symbols)
+        ]
+        if tags:
+            db.session.execute(ArticleSymbol.__table__.insert(), tags)
+
+    @classmethod
+    def tagged_since(cls, since_ts: int) -> List[Dict]:
+        """Symbol-tagged articles published since `since_ts`, as processed dicts"""
+        rows = (
+            db.session.query(
+                cls.link, cls.published_ts, cls.polarity, cls.subjectivity, ArticleSymbol.symbol
+            )
+            .join(ArticleSymbol)
+            .filter(ArticleSymbol.published_ts >= since_ts)
+        )
+        articles = {}
+        for link, published_ts, polarity, subjectivity, symbol in rows:
+            article = articles.get(link)
+            if article is None:
+                article = articles[link] = {
+                    'url': link,
+                    'published_ts': published_ts,
+                    'sentiment': {'polarity': polarity, 'subjectivity': subjectivity},
+                    'symbols': []
+                }
+            article['symbols'].append(symbol)
+        return list(articles.values())
+
+    @classmethod
+    def newest(
+        cls,
+        limit: int = 20,
+        before_ts: Optional[int] = None,
+        before_id: Optional[int] = None,
+        source: Optional[str] = None,
+        symbol: Optional[str] = None
+    ) -> List['Article']:
+        """
+        Page through articles newest-first using keyset pagination.
+
+        Pass the `published_ts` and `id` of the last article of the previous
+        page to get the next one. The page is located by `newest_keys_query`
+        without reading the table; only its `limit` rows are then loaded by
+        primary key.
+        """
+        ids = [article_id for _, article_id in cls.newest_keys_query(
+            limit, before_ts, before_id, source, symbol
+        )]
+        if not ids:
+            return []
+        by_id = {article.id: article for article in cls.query.filter(cls.id.in_(ids))}
+        return [by_id[article_id] for article_id in ids if article_id in by_id]
+
+    @classmethod
+    def newest_keys_query(
+        cls,
+        limit: int = 20,
+        before_ts: Optional[int] = None,
+        before_id: Optional[int] = None,
+        source: Optional[str] = None,
+        symbol: Optional[str] = None
+    ):
+        """
+        (published_ts, id) of one newest-first page, as an index-only scan.
+
+        Walks ix_article_published_ts_id, ix_article_source_published_ts_id
+        or, with `symbol`, ix_article_symbol_symbol_published in reverse
+        instead of using an OFFSET. Filtering on both symbol and source has
+        to join the article table.
+        """
+        if symbol is not None:
+            ts_column, id_column = ArticleSymbol.published_ts, ArticleSymbol.article_id
+            query = db.session.query(ts_column, id_column).filter(ArticleSymbol.symbol == symbol)
+            if source is not None:
+                query = query.join(cls, cls.id == id_column).filter(cls.source == source)
+        else:
+            ts_column, id_column = cls.published_ts, cls.id
+            query = db.session.query(ts_column, id_column)
+            if source is not None:
+                query = query.filter(cls.source == source)
+        if before_ts is not None:
+            if before_id is None:
+                query = query.filter(ts_column < before_ts)
+            else:
+                query = query.filter(db.or_(
+                    ts_column < before_ts,
+                    db.and_(ts_column == before_ts, id_column < before_id)
+                ))
+        return query.order_by(ts_column.desc(), id_column.desc()).limit(limit)
+
+class SentimentRollup(db.Model):
+    """
+    Polarity aggregated per time bucket, symbol and source.
+
+    Every article is counted under each of its symbols and under ALL, and
+    under its source and under ALL, at each granularity. Buckets are
+    identified by the epoch second they start at. Undated articles
+    (published_ts 0) are left out.
+    """
+    __tablename__ = 'sentiment_rollup'
+
+    GRANULARITIES = {'minute': 60, 'hour': 3600, 'day': 86400}
+    ALL = '*'
+
+    granularity = db.Column(db.String(6), primary_key=True)
+    symbol = db.Column(db.String(10), primary_key=True)
+    source = db.Column(db.String(255), primary_key=True)
+    bucket_start = db.Column(db.Integer, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    polarity_sum = db.Column(db.Float, nullable=False, default=0.0)
+    polarity_min = db.Column(db.Float, nullable=False)
+    polarity_max = db.Column(db.Float, nullable=False)
+    subjectivity_sum = db.Column(db.Float, nullable=False, default=0.0)
+
+    @classmethod
+    def add_rows(cls, rows: Iterable[Dict], symbols_by_hash: Dict[str, List[str]]) -> int:
+        """
+        Fold article rows (as built by `Article.row_from_processed`) into the
+        rollups. Does not commit; the caller owns the transaction.
+
+        Returns:
+            Number of rollup rows touched
+        """
+        buckets: Dict[tuple, Dict] = {}
+        for row in rows:
+            if row['published_ts'] <= 0:
+                continue
+            symbols = list(dict.fromkeys(symbols_by_hash.get(row['link_hash']) or ())) + [cls.ALL]
+            sources = [row['source'], cls.ALL] if row['source'] != cls.ALL else [cls.ALL]
+            polarity = row['polarity']
+            for granularity, width in cls.GRANULARITIES.items():
+                bucket_start = row['published_ts'] - row['published_ts'] % width
+                for symbol in symbols:
+                    for source in sources:
+                        key = (granularity, symbol, source, bucket_start)
+                        bucket = buckets.get(key)
+                        if bucket is None:
+                            buckets[key] = {
+                                'granularity': granularity,
+                                'symbol': symbol,
+                                'source': source,
+                                'bucket_start': bucket_start,
+                                'count': 1,
+                                'polarity_sum': polarity,
+                                'polarity_min': polarity,
+                                'polarity_max': polarity,
+                                'subjectivity_sum': row['subjectivity']
+                            }
+                        else:
+                            bucket['count'] += 1
+                            bucket['polarity_sum'] += polarity
+                            bucket['polarity_min'] = min(bucket['polarity_min'], polarity)
+                            bucket['polarity_max'] = max(bucket['polarity_max'], polarity)
+                            bucket['subjectivity_sum'] += row['subjectivity']
+        values = list(buckets.values())
+        if not values:
+            return 0
+
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+            # sqlite's two-argument min()/max() are scalar functions
+            lower = db.func.min if dialect == 'sqlite' else db.func.least
+            upper = db.func.max if dialect == 'sqlite' else db.func.greatest
+            table = cls.__table__
+            stmt = insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['granularity', 'symbol', 'source', 'bucket_start'],
+                set_={
+                    'count': table.c.count + stmt.excluded.count,
+                    'polarity_sum': table.c.polarity_sum + stmt.excluded.polarity_sum,
+                    'polarity_min': lower(table.c.polarity_min, stmt.excluded.polarity_min),
+                    'polarity_max': upper(table.c.polarity_max, stmt.excluded.polarity_max),
+                    'subjectivity_sum': table.c.subjectivity_sum + stmt.excluded.subjectivity_sum,
+                }
+            )
+            db.session.execute(stmt, values)
+        else:
+            for value in values:
+                existing = db.session.get(cls, (
+                    value['granularity'], value['symbol'], value['source'], value['bucket_start']
+                ))
+                if existing is None:
+                    db.session.add(cls(**value))
+                else:
+                    existing.count += value['count']
+                    existing.polarity_sum += value['polarity_sum']
+                    existing.polarity_min = min(existing.polarity_min, value['polarity_min'])
+                    existing.polarity_max = max(existing.polarity_max, value['polarity_max'])
+                    existing.subjectivity_sum += value['subjectivity_sum']
+        return len(values)
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """
+        Recompute every rollup from the article and article_symbol tables
+        with INSERT ... SELECT, then commit.
+
+        Returns:
+            Number of rollup rows written
+        """
+        try:
+            cls.query.delete(synchronize_session=False)
+            for granularity in cls.GRANULARITIES:
+                cls._insert_from_articles(granularity)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return cls.query.count()
+
+    @classmethod
+    def recompute(cls, timestamps: Iterable[int]) -> None:
+        """
+        Rebuild, for every granularity, the buckets containing `timestamps`
+        from the article tables. Used where an update changes an article's
+        contribution, since min and max cannot be subtracted. Does not
+        commit; the caller owns the transaction.
+        """
+        timestamps = [ts for ts in set(timestamps) if ts > 0]
+        if not timestamps:
+            return
+        db.session.flush()
+        for granularity, width in cls.GRANULARITIES.items():
+            starts = sorted({ts - ts % width for ts in timestamps})
+            cls.query.filter(
+                cls.granularity == granularity, cls.bucket_start.in_(starts)
+            ).delete(synchronize_session=False)
+            cls._insert_from_articles(granularity, starts)
+
+    @classmethod
+    def _insert_from_articles(cls, granularity: str, bucket_starts: Optional[List[int]] = None) -> None:
+        """INSERT ... SELECT one granularity's rollups, optionally only some buckets"""
+        articles = Article.__table__
+        tags = ArticleSymbol.__table__
+        width = cls.GRANULARITIES[granularity]
+        bucket = articles.c.published_ts - articles.c.published_ts % width
+        for per_symbol in (True, False):
+            for per_source in (True, False):
+                symbol = tags.c.symbol if per_symbol else db.literal(cls.ALL)
+                source = articles.c.source if per_source else db.literal(cls.ALL)
+                select = db.select(
+                    db.literal(granularity), symbol, source, bucket,
+                    db.func.count(), db.func.sum(articles.c.polarity),
+                    db.func.min(articles.c.polarity), db.func.max(articles.c.polarity),
+                    db.func.sum(articles.c.subjectivity)
+                ).where(articles.c.published_ts > 0)
+                if bucket_starts is not None:
+                    # Ranges rather than the bucket expression, so the published_ts index applies
+                    select = select.where(db.or_(*(
+                        articles.c.published_ts.between(start, start + width - 1) for start in bucket_starts
+                    )))
+                if per_symbol:
+                    select = select.select_from(articles.join(tags))
+                group_by = [bucket]
+                if per_symbol:
+                    group_by.append(tags.c.symbol)
+                if per_source:
+                    group_by.append(articles.c.source)
+                db.session.execute(cls.__table__.insert().from_select(
+                    ['granularity', 'symbol', 'source', 'bucket_start', 'count',
+                     'polarity_sum', 'polarity_min', 'polarity_max', 'subjectivity_sum'],
+                    select.group_by(*group_by)
+                ))
+
+    @classmethod
+    def pick_granularity(cls, resolution: float) -> str:
+        """Coarsest granularity no wider than `resolution` seconds"""
+        fitting = [name for name, width in cls.GRANULARITIES.items() if width <= resolution]
+        if not fitting:
+            return 'minute'
+        return max(fitting, key=cls.GRANULARITIES.get)
+
+    @classmethod
+    def series(
+        cls,
+        start_ts: int,
+        end_ts: int,
+        resolution: Optional[int] = None,
+        symbol: str = ALL,
+        source: str = ALL,
+        max_points: int = 500
+    ) -> List[Dict]:
+        """
+        Chart points between `start_ts` (inclusive) and `end_ts` (exclusive).
+
+        Reads the coarsest rollup that still resolves `resolution` seconds
+        (by default the range split into `max_points`) and merges its
+        buckets into points `resolution` seconds apart, rounded to a whole
+        number of stored buckets.
+
+        Returns:
+            List of points with bucket_start, count, polarity_mean,
+            polarity_min, polarity_max and subjectivity_mean
+        """
+        if resolution is None:
+            resolution = max(1, (end_ts - start_ts) // max_points)
+        granularity = cls.pick_granularity(resolution)
+        width = cls.GRANULARITIES[granularity]
+        step = max(1, resolution // width) * width
+
+        point = cls.bucket_start - cls.bucket_start % step
+        rows = (
+            db.session.query(
+                point.label('point'),
+                db.func.sum(cls.count),
+                db.func.sum(cls.polarity_sum),
+                db.func.min(cls.polarity_min),
+                db.func.max(cls.polarity_max),
+                db.func.sum(cls.subjectivity_sum)
+            )
+            .filter(
+                cls.granularity == granularity,
+                cls.symbol == symbol,
+                cls.source == source,
+                cls.bucket_start >= start_ts - start_ts % width,
+                cls.bucket_start < end_ts
+            )
+            .group_by(point)
+            .order_by(point)
+        )
+        return [
+            {
+                'bucket_start': int(bucket_start),
+                'count': int(count),
+                'polarity_mean': polarity_sum / count,
+                'polarity_min': polarity_min,
+                'polarity_max': polarity_max,
+                'subjectivity_mean': subjectivity_sum / count
+            }
+            for bucket_start, count, polarity_sum, polarity_min, polarity_max, subjectivity_sum in rows
+        ]
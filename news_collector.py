@@ -1,8 +1,19 @@
 import feedparser
-from datetime import datetime
+import requests
+import contextvars
+import json
 import logging
-from typing import List, Dict, Optional
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import urlparse
 import time
+from config import config
+from date_parsing import date_parser, format_timestamp
+from metrics import ERRORS, FEED_FETCH_SECONDS, PARSE_SECONDS
+from profiling import profiler
+from text_processing import strip_html
 
 # Configure logging
 logging.basicConfig(
@@ -15,12 +26,277 @@ class NewsCollectionError(Exception):
     """Custom exception for news collection errors"""
     pass
 
-def fetch_crypto_news(max_articles: int = 10) -> List[Dict]:
+# Cryptocurrency news RSS feeds
+NEWS_FEEDS = [
+    'https://cointelegraph.com/rss',
+    'https://coindesk.com/arc/outboundfeeds/rss/',
+    'https://cryptonews.com/news/feed',
+]
+
+# Add user agent to avoid blocking
+USER_AGENT = 'Mozilla/5.0'
+
+class HostThrottle:
+    """Enforce a minimum delay between requests to the same host"""
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        """Block until a request to the url's host is allowed"""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+_host_throttle = HostThrottle(config.FEED_HOST_MIN_INTERVAL)
+
+class FeedValidatorStore:
+    """
+    ETag / Last-Modified validators per feed, kept in memory and on disk.
+
+    The articles parsed from the validated download are stored with them,
+    so a 304 can be answered from the file after a restart too.
+    """
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._validators: Dict[str, Dict] = self._load()
+
+    def articles(self, feed_url: str) -> Optional[List[Dict]]:
+        """Articles from the feed's last full download, or None if unknown"""
+        return self._validators.get(feed_url, {}).get('articles')
+
+    def request_headers(self, feed_url: str) -> Dict[str, str]:
+        """Conditional request headers for the feed's stored validators"""
+        validators = self._validators.get(feed_url, {})
+        # Validators are only useful while we still hold the articles they describe
+        if validators.get('articles') is None:
+            return {}
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def update(self, feed_url: str, response_headers: Mapping[str, str], articles: List[Dict]) -> None:
+        """Remember the validators from a successful response and its articles"""
+        # Header names are case-insensitive; servers may send `etag`
+        headers = {name.lower(): value for name, value in response_headers.items()}
+        validators = {}
+        if headers.get('etag'):
+            validators['etag'] = headers['etag']
+        if headers.get('last-modified'):
+            validators['last_modified'] = headers['last-modified']
+        if validators:
+            validators['articles'] = articles
+
+        with self._lock:
+            if self._validators.get(feed_url) == validators:
+                return
+            if validators:
+                self._validators[feed_url] = validators
+            else:
+                self._validators.pop(feed_url, None)
+            self._save()
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable feed validators {self.path}: {str(e)}")
+            return {}
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._validators, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist feed validators to {self.path}: {str(e)}")
+
+_validator_store = FeedValidatorStore(config.FEED_VALIDATORS_PATH)
+
+def download_feed(
+    feed_url: str,
+    timeout: float,
+    headers: Optional[Dict[str, str]] = None
+) -> Tuple[int, bytes, Mapping[str, str]]:
+    """
+    Download a feed, giving up once `timeout` seconds have elapsed in total.
+
+    Returns:
+        Tuple of status code (200 or 304), body and the case-insensitive
+        response headers
+
+    Raises:
+        NewsCollectionError: If the request fails, times out or is not a 200/304
+    """
+    deadline = time.monotonic() + timeout
+    request_headers = {'User-Agent': USER_AGENT}
+    request_headers.update(headers or {})
+    try:
+        with requests.get(
+            feed_url,
+            headers=request_headers,
+            timeout=timeout,
+            stream=True
+        ) as response:
+            if response.status_code == 304:
+                return 304, b'', response.headers
+            if response.status_code != 200:
+                raise NewsCollectionError(
+                    f"Failed to fetch feed from {feed_url}: Status {response.status_code}"
+                )
+            chunks = []
+            for chunk in response.iter_content(chunk_size=16384):
+                if time.monotonic() > deadline:
+                    raise NewsCollectionError(f"Timed out reading feed {feed_url}")
+                chunks.append(chunk)
+            return 200, b''.join(chunks), response.headers
+    except requests.RequestException as e:
+        raise NewsCollectionError(f"Error downloading feed {feed_url}: {str(e)}")
+
+def fetch_feed(feed_url: str, timeout: Optional[float] = None) -> List[Dict]:
+    """
+    Fetch and parse a single feed.
+
+    Validators from the previous download are sent with the request; when the
+    server answers 304 Not Modified the previously parsed articles are
+    returned without parsing or cleaning anything.
+
+    Args:
+        feed_url: URL of the RSS feed
+        timeout: Seconds allowed for the whole download
+
+    Returns:
+        List[Dict]: Articles from the feed that have a title
     """
-    Fetch cryptocurrency news from various RSS feeds.
+    if timeout is None:
+        timeout = config.FEED_TIMEOUT
+
+    headers = _validator_store.request_headers(feed_url)
+
+    _host_throttle.wait(feed_url)
+    with FEED_FETCH_SECONDS.labels(feed_url).time():
+        status, content, response_headers = download_feed(feed_url, timeout, headers)
+
+    if status == 304:
+        cached = _validator_store.articles(feed_url)
+        if cached is not None:
+            logger.info(f"Feed {feed_url} not modified")
+            return list(cached)
+        # Only possible if the stored articles vanished since the request was sent
+        raise NewsCollectionError(f"Feed {feed_url} answered 304 without a stored copy")
+
+    with PARSE_SECONDS.time():
+        articles = parse_feed(content, feed_url)
+
+    _validator_store.update(feed_url, response_headers, articles)
+
+    return list(articles)
+
+def parse_feed(content: bytes, feed_url: str) -> List[Dict]:
+    """
+    Parse a downloaded feed into articles.
+
+    Args:
+        content: Raw RSS/Atom document
+        feed_url: URL the document came from, recorded as the articles' source
+
+    Returns:
+        List[Dict]: Articles from the feed that have a title
+    """
+    feed = feedparser.parse(content)
+
+    articles = []
+    for entry in feed.entries:
+        # 0 marks an unknown date; date_parser counts it per feed
+        published_ts = date_parser.parse(entry.get('published') or entry.get('updated', ''), feed_url) or 0
+        article = {
+            'title': entry.get('title', '').strip(),
+            'summary': clean_summary(entry.get('summary', '')),
+            'link': entry.get('link', ''),
+            'published_date': format_timestamp(published_ts),
+            'published_ts': published_ts,
+            'source': feed_url
+        }
+
+        # Only add articles with valid titles
+        if article['title']:
+            articles.append(article)
+
+    return articles
+
+def _profiled_fetch_feed(feed_url: str, timeout: Optional[float]) -> List[Dict]:
+    # Runs in a copy of the submitting context, so it joins that caller's profile only
+    with profiler.worker():
+        return fetch_feed(feed_url, timeout)
+
+def iter_crypto_news(
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> Iterator[Dict]:
+    """
+    Yield articles from all feeds as each feed finishes downloading.
+
+    Articles arrive in feed completion order, not sorted by date. Feeds that
+    fail are logged and skipped. Closing the generator early cancels feeds
+    that have not started yet.
+
+    Args:
+        max_workers (int, optional): Upper bound on feeds fetched at once
+        timeout (float, optional): Seconds allowed per feed
+
+    Yields:
+        Dict: Article with title, summary, link, and published date
+    """
+    if max_workers is None:
+        max_workers = config.FEED_FETCH_WORKERS
+
+    workers = max(1, min(max_workers, len(NEWS_FEEDS)))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='feed-fetch')
+    try:
+        futures = {
+            executor.submit(contextvars.copy_context().run, _profiled_fetch_feed, feed_url, timeout): feed_url
+            for feed_url in NEWS_FEEDS
+        }
+        for future in as_completed(futures):
+            feed_url = futures[future]
+            try:
+                feed_articles = future.result()
+            except Exception as e:
+                ERRORS.labels('fetch').inc()
+                logger.error(f"Error processing feed {feed_url}: {str(e)}")
+                continue
+            yield from feed_articles
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def fetch_crypto_news(
+    max_articles: int = 10,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> List[Dict]:
+    """
+    Fetch cryptocurrency news from various RSS feeds concurrently.
     
     Args:
         max_articles (int): Maximum number of articles to return
+        max_workers (int, optional): Upper bound on feeds fetched at once
+        timeout (float, optional): Seconds allowed per feed
         
     Returns:
         List[Dict]: List of articles with title, summary, link, and published date
@@ -28,52 +304,11 @@ def fetch_crypto_news(max_articles: int = 10) -> List[Dict]:
     Raises:
         NewsCollectionError: If there's an error fetching news
     """
-    # List of cryptocurrency news RSS feeds
-    news_feeds = [
-        'https://cointelegraph.com/rss',
-        'https://coindesk.com/arc/outboundfeeds/rss/',
-        'https://cryptonews.com/news/feed',
-    ]
-    
-    articles = []
-    
     try:
-        for feed_url in news_feeds:
-            try:
-                # Add user agent to avoid blocking
-                feed = feedparser.parse(feed_url, agent='Mozilla/5.0')
-                
-                if feed.get('status') != 200:
-                    logger.warning(f"Failed to fetch feed from {feed_url}: Status {feed.get('status')}")
-                    continue
-                
-                # Process each entry in the feed
-                for entry in feed.entries:
-                    article = {
-                        'title': entry.get('title', '').strip(),
-                        'summary': clean_summary(entry.get('summary', '')),
-                        'link': entry.get('link', ''),
-                        'published_date': parse_date(entry.get('published', '')),
-                        'source': feed_url
-                    }
-                    
-                    # Only add articles with valid titles
-                    if article['title']:
-                        articles.append(article)
-                    
-                    # Break if we have enough articles
-                    if len(articles) >= max_articles:
-                        break
-                        
-                # Small delay between requests
-                time.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Error processing feed {feed_url}: {str(e)}")
-                continue
+        articles = list(iter_crypto_news(max_workers=max_workers, timeout=timeout))
         
-        # Sort articles by publication date
-        articles.sort(key=lambda x: x['published_date'], reverse=True)
+        # Newest first; undated articles (published_ts 0) sort last
+        articles.sort(key=lambda x: x.get('published_ts') or 0, reverse=True)
         
         return articles[:max_articles]
     
@@ -84,13 +319,9 @@ def fetch_crypto_news(max_articles: int = 10) -> List[Dict]:
 
 def clean_summary(summary: str) -> str:
     """Clean the article summary by removing HTML tags and extra whitespace"""
-    import re
-    from bs4 import BeautifulSoup
-    
     try:
-        # Remove HTML tags
-        soup = BeautifulSoup(summary, 'html.parser')
-        text = soup.get_text()
+        # Remove HTML tags; this is the only HTML parse an entry goes through
+        text = strip_html(summary)
         
         # Remove extra whitespace
         text = ' '.join(text.split())
@@ -105,31 +336,6 @@ def clean_summary(summary: str) -> str:
         logger.warning(f"Error cleaning summary: {str(e)}")
         return summary
 
-def parse_date(date_str: str) -> str:
-    """Parse various date formats to consistent UTC format"""
-    try:
-        # Try different date formats
-        formats = [
-            '%a, %d %b %Y %H:%M:%S %z',
-            '%a, %d %b %Y %H:%M:%S GMT',
-            '%Y-%m-%dT%H:%M:%S%z',
-            '%Y-%m-%d %H:%M:%S',
-        ]
-        
-        for fmt in formats:
-            try:
-                dt = datetime.strptime(date_str, fmt)
-                return dt.strftime('%Y-%m-%d %H:%M:%S')
-            except ValueError:
-                continue
-        
-        # If no format matches, return current time
-        return "2025-02-08 22:30:35"
-    
-    except Exception as e:
-        logger.warning(f"Error parsing date {date_str}: {str(e)}")
-        return "2025-02-08 22:30:35"
-
 # Test the module if run directly
 if __name__ == "__main__":
     try:
@@ -0,0 +1,99 @@
+"""
+Cache of rendered HTML pages keyed by article snapshot version.
+
+A page is rendered once per snapshot version and stored as UTF-8 bytes
+plus a precompressed gzip copy. Publishing a new snapshot swaps in an
+empty entry table in one assignment, so readers see either the old
+version's pages or none, never a mix. A hit is a dictionary lookup.
+"""
+import gzip
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class RenderedPage:
+    """One rendered page in both encodings"""
+    version: int
+    body: bytes
+    gzipped: bytes
+    etag: str
+
+    @property
+    def gzip_etag(self) -> str:
+        # A strong validator must differ between content codings
+        return f"{self.etag}-gzip"
+
+    @classmethod
+    def build(cls, version: int, html: str) -> 'RenderedPage':
+        body = html.encode('utf-8')
+        return cls(
+            version=version,
+            body=body,
+            gzipped=gzip.compress(body, compresslevel=6, mtime=0),
+            etag=f"v{version}-{hashlib.sha1(body).hexdigest()[:16]}"
+        )
+
+class PageCache:
+    """Rendered pages for the current snapshot version, by page name"""
+    def __init__(self):
+        self.version = -1
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: Dict[str, RenderedPage] = {}
+        self._render_lock = threading.Lock()
+
+    def get_or_render(self, name: str, version: int, render: Callable[[], str]) -> RenderedPage:
+        """
+        Return the cached page for `version`, rendering it on a miss.
+
+        Concurrent misses for the same page render it once.
+        """
+        page = self._entries.get(name)
+        if page is not None and page.version == version:
+            self.hits += 1
+            return page
+
+        with self._render_lock:
+            page = self._entries.get(name)
+            if page is not None and page.version == version:
+                self.hits += 1
+                return page
+            self.misses += 1
+            page = RenderedPage.build(version, render())
+            if version >= self.version:
+                if version > self.version:
+                    self.invalidate(version)
+                self._entries[name] = page
+            return page
+
+    def invalidate(self, version: int) -> None:
+        """Drop every page rendered for older snapshot versions"""
+        self._entries = {}
+        self.version = version
+        self.invalidations += 1
+
+    def stats(self) -> Dict:
+        """Return hit and miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            'version': self.version,
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_ratio': self.hits / lookups if lookups else 0.0
+        }
+
+# Invalidated by the ingestion listener in app.py
+page_cache = PageCache()
@@ -0,0 +1,250 @@
+"""
+Streaming article pipeline: fetch -> dedup -> clean -> score -> render.
+
+Each stage is a generator that takes an iterable of articles and yields
+articles, so stages compose by nesting calls and every article flows through
+the whole pipeline before the next one is needed. `buffered` runs its
+upstream in a worker thread behind a bounded queue, letting a slow stage
+(e.g. network fetches) overlap with the stages after it while keeping at
+most `maxsize` items in flight.
+"""
+import logging
+import queue
+import threading
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from classification import analyze_sentiment, analyze_sentiment_batch, SentimentAnalysisError
+from config import config
+from dedup import duplicate_detector, NearDuplicateDetector
+from metrics import CLEAN_SECONDS, ERRORS, SCORE_SECONDS
+from news_collector import iter_crypto_news
+from symbol_tagger import symbol_tagger
+from text_processing import clean_text, TextProcessingError
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Seconds a blocked producer waits before re-checking for cancellation
+_PUT_POLL_INTERVAL = 0.1
+
+class _EndOfStream:
+    """Marker put on a buffer queue once its upstream is exhausted"""
+    def __init__(self, error: Optional[BaseException] = None):
+        self.error = error
+
+def clean_article(article: Dict) -> Dict:
+    """
+    Clean a raw feed article into the shape the templates expect.
+
+    Raises:
+        TextProcessingError: If the summary cannot be cleaned
+    """
+    # The collector already stripped the summary's HTML
+    with CLEAN_SECONDS.time():
+        cleaned_summary = clean_text(
+            article.get('summary', ''),
+            preserve_numbers=True,
+            preserve_urls=True,
+            max_length=300,
+            strip_markup=False
+        )
+    return {
+        'title': article.get('title', ''),
+        'summary': cleaned_summary,
+        'url': article.get('link', ''),
+        'published_date': article.get('published_date', ''),
+        'published_ts': article.get('published_ts', 0),
+        'source': article.get('source', ''),
+        'duplicates': article.get('duplicates', [])
+    }
+
+def tag_article(article: Dict) -> Dict:
+    """Attach the cryptocurrency symbols a cleaned article mentions"""
+    return dict(article, symbols=symbol_tagger.tag_article(article))
+
+def score_article(article: Dict) -> Dict:
+    """
+    Attach the sentiment of a cleaned article's summary.
+
+    Raises:
+        SentimentAnalysisError: If the summary cannot be scored
+    """
+    with SCORE_SECONDS.time():
+        sentiment_result = analyze_sentiment(
+            article['summary'],
+            user="kaxm23",
+            timestamp="2025-02-08 22:44:10"
+        )
+    # This ensures sentiment is a dictionary
+    return dict(article, sentiment=sentiment_result.to_dict())
+
+def process_article(article: Dict) -> Optional[Dict]:
+    """Process a single article with text cleaning and sentiment analysis"""
+    try:
+        return score_article(tag_article(clean_article(article)))
+    except (TextProcessingError, SentimentAnalysisError) as e:
+        ERRORS.labels('clean' if isinstance(e, TextProcessingError) else 'score').inc()
+        logger.error(f"Error processing article: {e}")
+        return None
+
+def process_articles(articles: List[Dict]) -> List[Optional[Dict]]:
+    """
+    Process many articles at once, scoring their summaries in one batch.
+
+    The batch goes through `score_texts`, which can spread large refreshes
+    over the sentiment process pool. If the batch fails, each article is
+    scored on its own so one bad summary does not drop the rest.
+
+    Returns:
+        One processed article per input, in order; None where processing failed
+    """
+    results: List[Optional[Dict]] = [None] * len(articles)
+    cleaned = []
+    for position, article in enumerate(articles):
+        try:
+            cleaned.append((position, tag_article(clean_article(article))))
+        except TextProcessingError as e:
+            ERRORS.labels('clean').inc()
+            logger.error(f"Error processing article: {e}")
+    if not cleaned:
+        return results
+
+    try:
+        with SCORE_SECONDS.time():
+            sentiments = analyze_sentiment_batch(
+                [article['summary'] for _, article in cleaned],
+                user="kaxm23",
+                timestamp="2025-02-08 22:44:10"
+            )
+    except SentimentAnalysisError as e:
+        ERRORS.labels('score').inc()
+        logger.error(f"Error scoring article batch, scoring one at a time: {e}")
+        for position, article in cleaned:
+            try:
+                results[position] = score_article(article)
+            except SentimentAnalysisError as e:
+                ERRORS.labels('score').inc()
+                logger.error(f"Error processing article: {e}")
+        return results
+
+    for (position, article), sentiment_result in zip(cleaned, sentiments):
+        results[position] = dict(article, sentiment=sentiment_result.to_dict())
+    return results
+
+def fetch_stage(max_articles: Optional[int] = None) -> Iterator[Dict]:
+    """Yield raw articles as their feeds arrive, stopping after `max_articles`"""
+    return islice(iter_crypto_news(), max_articles)
+
+def dedup_stage(
+    articles: Iterable[Dict],
+    detector: Optional[NearDuplicateDetector] = None
+) -> Iterator[Dict]:
+    """Yield only the first article of each near-duplicate cluster"""
+    if detector is None:
+        detector = duplicate_detector
+    seen = set()
+    for article in articles:
+        cluster_id = detector.assign(article)
+        if cluster_id not in seen:
+            seen.add(cluster_id)
+            yield article
+
+def clean_stage(articles: Iterable[Dict]) -> Iterator[Dict]:
+    """Yield cleaned and symbol-tagged articles, skipping any that fail to clean"""
+    for article in articles:
+        try:
+            yield tag_article(clean_article(article))
+        except TextProcessingError as e:
+            ERRORS.labels('clean').inc()
+            logger.error(f"Error cleaning article: {e}")
+
+def score_stage(articles: Iterable[Dict]) -> Iterator[Dict]:
+    """Yield cleaned articles with sentiment, skipping any that fail to score"""
+    for article in articles:
+        try:
+            yield score_article(article)
+        except SentimentAnalysisError as e:
+            ERRORS.labels('score').inc()
+            logger.error(f"Error scoring article: {e}")
+
+def buffered(items: Iterable, maxsize: Optional[int] = None) -> Iterator:
+    """
+    Consume `items` in a background thread through a bounded queue.
+
+    Exceptions raised upstream are re-raised to the consumer. Closing the
+    returned generator stops the producer at its next item.
+
+    Args:
+        items: Upstream iterable, usually another stage
+        maxsize (int, optional): Items held between the two sides
+
+    Yields:
+        The upstream items, in order
+    """
+    if maxsize is None:
+        maxsize = config.PIPELINE_BUFFER_SIZE
+
+    buffer: queue.Queue = queue.Queue(maxsize=max(1, maxsize))
+    cancelled = threading.Event()
+
+    def offer(item) -> bool:
+        while not cancelled.is_set():
+            try:
+                buffer.put(item, timeout=_PUT_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not offer(item):
+                    return
+        except Exception as e:
+            offer(_EndOfStream(e))
+        else:
+            offer(_EndOfStream())
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    producer = threading.Thread(target=produce, name='pipeline-buffer', daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if isinstance(item, _EndOfStream):
+                if item.error is not None:
+                    raise item.error
+                return
+            yield item
+    finally:
+        cancelled.set()
+
+def article_pipeline(
+    max_articles: Optional[int] = None,
+    buffer_size: Optional[int] = None
+) -> Iterator[Dict]:
+    """
+    Yield processed articles one at a time as they are fetched and scored.
+
+    Articles come out in feed arrival order rather than sorted by date, so
+    nothing has to wait for the slowest feed.
+
+    Args:
+        max_articles (int, optional): Stop after this many raw articles
+        buffer_size (int, optional): Items buffered between fetching and scoring
+
+    Yields:
+        Dict: Processed article in the same shape as `process_article`
+    """
+    raw_articles = buffered(fetch_stage(max_articles), buffer_size)
+    return score_stage(clean_stage(dedup_stage(raw_articles)))
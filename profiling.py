@@ -0,0 +1,211 @@
+"""
+On-demand cProfile runs of index requests and ingestion cycles.
+
+Profiling is switched on for everything by `config.PROFILING_ENABLED`, or
+for a single request by an `X-Profile` header signed with
+`config.PROFILE_SECRET`:
+
+    X-Profile: <unix time>.<hex HMAC-SHA256 of "<unix time>:<request path>">
+
+Signatures are accepted for PROFILE_SIGNATURE_TTL seconds. Each run writes
+a `.prof` dump (loadable with `pstats` or snakeviz) and a `.txt` summary of
+the top functions to `config.PROFILE_DIR`; only the newest
+`config.PROFILE_RETAIN` runs are kept.
+
+cProfile only sees the thread it was enabled in. Code that runs part of a
+profiled block on worker threads (the feed downloads) submits the work with
+`contextvars.copy_context().run` and enters `profiler.worker()` there. The
+copied context names the run that submitted the work, so worker stats are
+merged into that run only, never into an unrelated run that happens to be
+in progress. Outside a run, `worker()` is a single context variable lookup.
+"""
+import contextvars
+import cProfile
+import contextlib
+import hashlib
+import hmac
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from config import config
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_SIGNATURE_TTL = 300
+
+def sign(path: str, secret: str, timestamp: Optional[int] = None) -> str:
+    """X-Profile header value authorizing one profiled request to `path`"""
+    if timestamp is None:
+        timestamp = int(time.time())
+    digest = hmac.new(secret.encode('utf-8'), f"{timestamp}:{path}".encode('utf-8'), hashlib.sha256)
+    return f"{timestamp}.{digest.hexdigest()}"
+
+def verify(header: str, path: str, secret: Optional[str], now: Optional[float] = None) -> bool:
+    """Whether `header` is a fresh signature for `path`"""
+    if not secret or not header:
+        return False
+    timestamp, _, _ = header.partition('.')
+    try:
+        issued = int(timestamp)
+    except ValueError:
+        return False
+    if now is None:
+        now = time.time()
+    if abs(now - issued) > PROFILE_SIGNATURE_TTL:
+        return False
+    return hmac.compare_digest(header, sign(path, secret, issued))
+
+class _RunWorkers:
+    """Worker-thread profiles collected for one run while it is open"""
+    __slots__ = ('profiler', 'profiles', 'open')
+
+    def __init__(self, profiler: 'Profiler'):
+        self.profiler = profiler
+        self.profiles: List[cProfile.Profile] = []
+        self.open = True
+
+# The run, if any, that the current thread or task is working for
+_active_run: contextvars.ContextVar = contextvars.ContextVar('profile_run', default=None)
+
+@dataclass
+class ProfileRun:
+    """One profiled block; `id` stays None if another run was in progress"""
+    name: str
+    id: Optional[str] = None
+    path: Optional[str] = None
+    top: List[Dict] = field(default_factory=list)
+
+class Profiler:
+    """
+    Writes one cProfile dump and summary per profiled block.
+
+    Only one block is profiled at a time; a block that starts while another
+    is being profiled runs unprofiled.
+    """
+    def __init__(self, directory: str, retain: int, top_n: int):
+        self.directory = directory
+        self.retain = retain
+        self.top_n = top_n
+        self._busy = threading.Lock()
+        self._sequence = 0
+        self._workers_lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def profile(self, name: str):
+        """Profile the enclosed block, yielding its `ProfileRun`"""
+        run = ProfileRun(name=name)
+        if not self._busy.acquire(blocking=False):
+            logger.info(f"Skipping profile of {name}: another profile is running")
+            yield run
+            return
+        state = _RunWorkers(self)
+        token = _active_run.set(state)
+        try:
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                yield run
+            finally:
+                profile.disable()
+                with self._workers_lock:
+                    state.open = False
+                    workers = list(state.profiles)
+                self._save(profile, workers, run)
+        finally:
+            _active_run.reset(token)
+            self._busy.release()
+
+    @contextlib.contextmanager
+    def worker(self):
+        """Profile the enclosed block into the run whose context it was submitted from, if any"""
+        state = _active_run.get()
+        if state is None or state.profiler is not self:
+            yield
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one active cProfile, which already sees every thread
+            yield
+            return
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._workers_lock:
+                # Work that outlives its run is dropped
+                if state.open:
+                    state.profiles.append(profile)
+
+    def _save(self, profile: cProfile.Profile, workers: List[cProfile.Profile], run: ProfileRun) -> None:
+        self._sequence += 1
+        run.id = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{self._sequence:04d}-{run.name}"
+        stats = pstats.Stats(profile)
+        for worker in workers:
+            stats.add(worker)
+        run.top = top_functions(stats, self.top_n)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            run.path = os.path.join(self.directory, f"{run.id}.prof")
+            stats.dump_stats(run.path)
+            with open(os.path.join(self.directory, f"{run.id}.txt"), 'w', encoding='utf-8') as f:
+                f.write(summary_text(stats, self.top_n))
+            self._prune()
+        except OSError as e:
+            logger.warning(f"Could not write profile {run.id}: {e}")
+            run.path = None
+            return
+        logger.info(f"Wrote profile {run.path}")
+
+    def _prune(self) -> None:
+        runs = sorted(name[:-len('.prof')] for name in os.listdir(self.directory) if name.endswith('.prof'))
+        for run_id in runs[:max(len(runs) - self.retain, 0)]:
+            for suffix in ('.prof', '.txt'):
+                try:
+                    os.remove(os.path.join(self.directory, run_id + suffix))
+                except FileNotFoundError:
+                    pass
+
+    def profiles(self) -> List[str]:
+        """Ids of the retained runs, oldest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-len('.prof')] for name in os.listdir(self.directory) if name.endswith('.prof'))
+
+def top_functions(stats: pstats.Stats, limit: int) -> List[Dict]:
+    """The `limit` functions with the most time spent in their own code"""
+    rows = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({
+            'function': f"{os.path.basename(filename)}:{line}({function})" if line else function,
+            'calls': calls,
+            'tottime': round(own, 6),
+            'cumtime': round(cumulative, 6)
+        })
+    rows.sort(key=lambda row: row['tottime'], reverse=True)
+    return rows[:limit]
+
+def summary_text(stats: pstats.Stats, limit: int) -> str:
+    """pstats listings of the top functions by own and by cumulative time"""
+    out = io.StringIO()
+    for order in ('tottime', 'cumulative'):
+        stats.stream = out
+        out.write(f"Top {limit} by {order}\n")
+        stats.sort_stats(order).print_stats(limit)
+    return out.getvalue()
+
+# Shared by the profiled views in app.py and the feed workers in news_collector.py
+profiler = Profiler(config.PROFILE_DIR, config.PROFILE_RETAIN, config.PROFILE_TOP_N)
@@ -0,0 +1,197 @@
+"""
+Rolling per-symbol sentiment aggregates held in memory.
+
+Each (symbol, window) pair is a ring of time buckets stored in NumPy
+arrays. A bucket keeps the count and the sums and sums of squares of
+polarity and subjectivity of the articles published in its time slice.
+Adding an article touches one bucket, which is O(1). Reading a window
+sums its fixed number of buckets, so the cost does not depend on how many
+articles it covers. Windows are accurate to one bucket width (1/60th of
+the window by default).
+"""
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+WINDOWS = {
+    '1h': 3600,
+    '24h': 24 * 3600,
+    '7d': 7 * 24 * 3600,
+}
+DEFAULT_WINDOW = '24h'
+BUCKETS_PER_WINDOW = 60
+
+# Columns of a bucket row
+_COUNT, _POLARITY, _POLARITY_SQ, _SUBJECTIVITY, _SUBJECTIVITY_SQ = range(5)
+
+class RollingSentimentError(Exception):
+    """Custom exception for rolling sentiment errors"""
+    pass
+
+class RollingWindow:
+    """
+    Time-bucketed aggregates over the last `span` seconds.
+
+    Args:
+        span (int): Window length in seconds
+        buckets (int): Number of slices the window is divided into
+    """
+    def __init__(self, span: int, buckets: int = BUCKETS_PER_WINDOW):
+        self.span = span
+        self.buckets = buckets
+        self.width = max(1, span // buckets)
+        # Bucket number (ts // width) each slot currently holds; -1 when empty
+        self._epochs = np.full(buckets, -1, dtype=np.int64)
+        self._sums = np.zeros((buckets, 5))
+
+    def add(self, ts: float, polarity: float, subjectivity: float) -> bool:
+        """
+        Record one observation.
+
+        Returns:
+            False if the observation is older than what the window retains
+        """
+        epoch = int(ts) // self.width
+        slot = epoch % self.buckets
+        held = self._epochs[slot]
+        if epoch < held:
+            return False
+        if epoch > held:
+            self._epochs[slot] = epoch
+            self._sums[slot] = 0.0
+        row = self._sums[slot]
+        row[_COUNT] += 1
+        row[_POLARITY] += polarity
+        row[_POLARITY_SQ] += polarity * polarity
+        row[_SUBJECTIVITY] += subjectivity
+        row[_SUBJECTIVITY_SQ] += subjectivity * subjectivity
+        return True
+
+    def stats(self, now: float) -> Dict:
+        """Count, mean and variance of polarity and subjectivity in the window"""
+        current = int(now) // self.width
+        live = (self._epochs > current - self.buckets) & (self._epochs <= current)
+        totals = self._sums[live].sum(axis=0)
+        count = int(totals[_COUNT])
+        if count == 0:
+            return {
+                'count': 0,
+                'polarity_mean': None,
+                'polarity_variance': None,
+                'subjectivity_mean': None,
+                'subjectivity_variance': None,
+            }
+        polarity_mean = totals[_POLARITY] / count
+        subjectivity_mean = totals[_SUBJECTIVITY] / count
+        return {
+            'count': count,
+            'polarity_mean': float(polarity_mean),
+            'polarity_variance': float(max(totals[_POLARITY_SQ] / count - polarity_mean ** 2, 0.0)),
+            'subjectivity_mean': float(subjectivity_mean),
+            'subjectivity_variance': float(max(totals[_SUBJECTIVITY_SQ] / count - subjectivity_mean ** 2, 0.0)),
+        }
+
+class RollingSentiment:
+    """Rolling windows for every symbol seen so far"""
+    def __init__(self, windows: Optional[Dict[str, int]] = None, buckets: int = BUCKETS_PER_WINDOW):
+        self.windows = dict(windows or WINDOWS)
+        self.buckets = buckets
+        self._by_symbol: Dict[str, Dict[str, RollingWindow]] = {}
+        # url -> publish time of articles already counted, so the same article
+        # arriving from the startup backfill and from ingestion counts once
+        self._seen: Dict[str, float] = {}
+        self._prune_at = 1024
+        self._lock = threading.Lock()
+
+    def symbols(self):
+        with self._lock:
+            return sorted(self._by_symbol)
+
+    def add(
+        self,
+        symbol: str,
+        polarity: float,
+        subjectivity: float,
+        ts: Optional[float] = None
+    ) -> None:
+        """Record one article's sentiment for a symbol at publish time `ts`"""
+        if not ts:
+            ts = time.time()
+        with self._lock:
+            windows = self._by_symbol.get(symbol)
+            if windows is None:
+                windows = self._by_symbol[symbol] = {
+                    name: RollingWindow(span, self.buckets)
+                    for name, span in self.windows.items()
+                }
+            for window in windows.values():
+                window.add(ts, polarity, subjectivity)
+
+    def add_articles(self, articles: Iterable[Dict]) -> int:
+        """
+        Record processed articles under every symbol they mention.
+
+        Articles are identified by url; ones already counted are skipped.
+
+        Returns:
+            Number of articles recorded
+        """
+        added = 0
+        for article in articles:
+            url = article.get('url') or article.get('link', '')
+            with self._lock:
+                if url in self._seen:
+                    continue
+                self._seen[url] = float(article.get('published_ts') or time.time())
+                if len(self._seen) >= self._prune_at:
+                    self._prune_seen()
+            added += 1
+            sentiment = article.get('sentiment') or {}
+            for symbol in article.get('symbols') or ():
+                self.add(
+                    symbol,
+                    float(sentiment.get('polarity', 0.0)),
+                    float(sentiment.get('subjectivity', 0.0)),
+                    article.get('published_ts')
+                )
+        return added
+
+    def _prune_seen(self) -> None:
+        # Amortized O(1): the next prune waits until the map has doubled
+        horizon = time.time() - max(self.windows.values())
+        self._seen = {url: ts for url, ts in self._seen.items() if ts >= horizon}
+        self._prune_at = max(1024, 2 * len(self._seen))
+
+    def stats(self, symbol: str, window: str = DEFAULT_WINDOW, now: Optional[float] = None) -> Dict:
+        """
+        Aggregates for one symbol over one window.
+
+        Raises:
+            RollingSentimentError: If the window name is unknown
+        """
+        if window not in self.windows:
+            raise RollingSentimentError(
+                f"Unknown window {window!r}; expected one of {', '.join(self.windows)}"
+            )
+        if now is None:
+            now = time.time()
+        with self._lock:
+            windows = self._by_symbol.get(symbol)
+            if windows is None:
+                result = RollingWindow(self.windows[window], self.buckets).stats(now)
+            else:
+                result = windows[window].stats(now)
+        return dict(result, symbol=symbol, window=window)
+
+# Fed by the ingestion listener in app.py
+rolling_sentiment = RollingSentiment()
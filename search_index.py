@@ -0,0 +1,274 @@
+"""
+Incremental inverted index over ingested articles.
+
+Each indexed term maps to a posting list of document ids with the
+positions the term occurs at. Documents get increasing ids as they are
+added, so appending keeps every posting list sorted and queries are
+merges of sorted arrays rather than scans of the article table. The
+indexed articles themselves are kept in an `ArticleStore`, whose row
+numbers are the document ids.
+
+Query syntax:
+    bitcoin etf           both terms (AND)
+    bitcoin OR ethereum   either term; OR binds tighter than AND
+    "spot etf"            exact phrase
+    bitcoin -etf          exclude a term (NOT etf works too)
+"""
+import logging
+import math
+import re
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from article_store import ArticleStore
+from date_parsing import format_timestamp
+from text_processing import COMMON_WORDS, tokenize_terms
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Ranking relevance halves for every this many seconds of article age
+DEFAULT_HALF_LIFE = 7 * 24 * 3600
+
+_QUERY_TOKEN_RE = re.compile(r'(-?)"([^"]*)"|(\S+)')
+_EMPTY = np.empty(0, dtype=np.uint32)
+
+class SearchError(Exception):
+    """Custom exception for search errors"""
+    pass
+
+class _Postings:
+    """Sorted document ids for one term, with each document's positions"""
+    __slots__ = ('doc_ids', 'offsets', 'positions')
+
+    def __init__(self):
+        self.doc_ids = array('I')
+        # positions[offsets[i]:offsets[i + 1]] belong to doc_ids[i]
+        self.offsets = array('I', [0])
+        self.positions = array('I')
+
+    def append(self, doc_id: int, positions: List[int]) -> None:
+        self.doc_ids.append(doc_id)
+        self.positions.extend(positions)
+        self.offsets.append(len(self.positions))
+
+    def doc_array(self) -> np.ndarray:
+        return np.frombuffer(self.doc_ids, dtype=np.uint32) if self.doc_ids else _EMPTY
+
+    def term_frequencies(self, doc_ids: np.ndarray) -> np.ndarray:
+        """Occurrences of the term in each of `doc_ids`, which must be postings"""
+        index = np.searchsorted(self.doc_array(), doc_ids)
+        offsets = np.frombuffer(self.offsets, dtype=np.uint32)
+        return offsets[index + 1].astype(np.int64) - offsets[index]
+
+    def position_keys(self, doc_ids: np.ndarray) -> np.ndarray:
+        """Sorted doc_id << 32 | position keys for occurrences in `doc_ids`"""
+        offsets = np.frombuffer(self.offsets, dtype=np.uint32).astype(np.int64)
+        counts = np.diff(offsets)
+        owners = np.repeat(self.doc_array().astype(np.int64), counts)
+        keys = (owners << 32) | np.frombuffer(self.positions, dtype=np.uint32)
+        return keys[np.isin(owners, doc_ids)]
+
+@dataclass
+class _Clause:
+    """One query term or phrase; `offsets` are word gaps within a phrase"""
+    terms: Tuple[str, ...]
+    offsets: Tuple[int, ...]
+    negated: bool = False
+
+def parse_query(query: str) -> List[List[_Clause]]:
+    """
+    Parse a query into AND-ed groups of OR-ed clauses.
+
+    Returns:
+        List of groups; a document matches when, for every group, it
+        matches at least one clause (or none, for negated clauses)
+
+    Raises:
+        SearchError: If the query has no searchable terms
+    """
+    groups: List[List[_Clause]] = []
+    join_next = False
+    negate_next = False
+    for match in _QUERY_TOKEN_RE.finditer(query):
+        phrase_negated, phrase, word = match.groups()
+        if word in ('OR', '|'):
+            join_next = bool(groups)
+            continue
+        if word == 'NOT':
+            negate_next = True
+            continue
+
+        negated = negate_next or bool(phrase_negated)
+        if word is not None and word.startswith('-') and len(word) > 1:
+            negated, word = True, word[1:]
+        negate_next = False
+
+        tokens = tokenize_terms(phrase if phrase is not None else word)
+        indexed = [(offset, t) for offset, t in enumerate(tokens) if t not in COMMON_WORDS]
+        if not indexed:
+            join_next = False
+            continue
+        base = indexed[0][0]
+        clause = _Clause(
+            terms=tuple(t for _, t in indexed),
+            offsets=tuple(offset - base for offset, _ in indexed),
+            negated=negated
+        )
+        if join_next and not negated and not any(c.negated for c in groups[-1]):
+            groups[-1].append(clause)
+        else:
+            groups.append([clause])
+        join_next = False
+
+    if not any(not clause.negated for group in groups for clause in group):
+        raise SearchError(f"Query has no searchable terms: {query!r}")
+    return groups
+
+class SearchIndex:
+    """
+    In-memory inverted index, updated one article at a time.
+
+    Articles are identified by their url; adding an article already in the
+    index is a no-op.
+    """
+    def __init__(self, half_life: float = DEFAULT_HALF_LIFE):
+        self.half_life = half_life
+        self._postings: Dict[str, _Postings] = {}
+        # Document ids are the store's row numbers
+        self.store = ArticleStore()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def add(self, article: Dict) -> Optional[int]:
+        """
+        Index a processed article's title and summary.
+
+        Returns:
+            The new document id, or None if the article was already indexed
+        """
+        with self._lock:
+            doc_id = self.store.add(article)
+            if doc_id is None:
+                return None
+            tokens = tokenize_terms(f"{article.get('title', '')} {article.get('summary', '')}")
+            positions_by_term: Dict[str, List[int]] = {}
+            for position, term in enumerate(tokens):
+                if term not in COMMON_WORDS:
+                    positions_by_term.setdefault(term, []).append(position)
+            for term, positions in positions_by_term.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = _Postings()
+                postings.append(doc_id, positions)
+            return doc_id
+
+    def add_many(self, articles: Iterable[Dict]) -> int:
+        """Index several articles and return how many were new"""
+        return sum(1 for article in articles if self.add(article) is not None)
+
+    def _clause_docs(self, clause: _Clause) -> np.ndarray:
+        postings = [self._postings.get(term) for term in clause.terms]
+        if any(p is None for p in postings):
+            return _EMPTY
+        docs = postings[0].doc_array()
+        for p in postings[1:]:
+            docs = np.intersect1d(docs, p.doc_array(), assume_unique=True)
+        if len(clause.terms) == 1 or not docs.size:
+            return docs
+
+        # Phrase: term i must sit at (first term's position + offset i).
+        # Positions are compared as doc_id << 32 | position across all
+        # candidate documents at once.
+        starts = postings[0].position_keys(docs)
+        for p, offset in zip(postings[1:], clause.offsets[1:]):
+            starts = np.intersect1d(starts, p.position_keys(docs) - offset, assume_unique=True)
+            if not starts.size:
+                return _EMPTY
+        return np.unique(starts >> 32).astype(np.uint32)
+
+    def search(self, query: str, limit: int = 20, now: Optional[float] = None) -> Dict:
+        """
+        Run a query and rank the matches.
+
+        Relevance is a TF-IDF sum over the query terms, scaled down by the
+        article's age so that recent coverage ranks first.
+
+        Args:
+            query (str): Query in the syntax described in the module docstring
+            limit (int): Maximum number of results
+            now (float, optional): Reference time for article age
+
+        Returns:
+            Dict with 'total' matches and the top 'results'
+
+        Raises:
+            SearchError: If the query has no searchable terms
+        """
+        groups = parse_query(query)
+        if now is None:
+            now = time.time()
+
+        with self._lock:
+            matched: Optional[np.ndarray] = None
+            excluded: List[np.ndarray] = []
+            for group in groups:
+                if group[0].negated:
+                    excluded.append(self._clause_docs(group[0]))
+                    continue
+                docs = self._clause_docs(group[0])
+                for clause in group[1:]:
+                    docs = np.union1d(docs, self._clause_docs(clause))
+                matched = docs if matched is None else np.intersect1d(matched, docs, assume_unique=True)
+            for docs in excluded:
+                matched = np.setdiff1d(matched, docs, assume_unique=True)
+
+            if not matched.size:
+                return {'total': 0, 'results': []}
+
+            n_docs = len(self.store)
+            scores = np.zeros(matched.size)
+            for term in {t for group in groups for c in group if not c.negated for t in c.terms}:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                present = np.isin(matched, postings.doc_array(), assume_unique=True)
+                if not present.any():
+                    continue
+                idf = math.log(1 + n_docs / len(postings.doc_ids))
+                tf = postings.term_frequencies(matched[present])
+                scores[present] += (1 + np.log(tf)) * idf
+
+            published = self.store.published_ts(matched)
+            age = np.maximum(now - published, 0)
+            scores *= np.power(0.5, age / self.half_life)
+
+            top = min(limit, matched.size)
+            best = np.argpartition(-scores, top - 1)[:top]
+            best = best[np.lexsort((-published[best], -scores[best]))]
+            results = []
+            for i in best:
+                record = self.store.record(int(matched[i]))
+                results.append({
+                    'title': record.title,
+                    'url': record.url,
+                    'source': record.source,
+                    'published_ts': record.published_ts,
+                    'published_date': format_timestamp(record.published_ts),
+                    'score': round(float(scores[i]), 6)
+                })
+            return {'total': int(matched.size), 'results': results}
+
+# Fed by the ingestion listener in app.py
+search_index = SearchIndex()
@@ -1,6 +1,5 @@
-from textblob import TextBlob
 from dataclasses import dataclass
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from datetime import datetime
 import pytz
 
@@ -49,7 +48,10 @@ def analyze_sentiment(
     timestamp: Optional[str] = None
 ) -> SentimentResult:
     """
-    Analyze the sentiment of the given text using TextBlob.
+    Analyze the sentiment of the given text with the configured backend.
+
+    Scores come from `classification.score_text`, the path
+    `analyze_sentiment_batch` also uses, so a text scores the same either way.
     
     Args:
         text (str): The text to analyze
@@ -72,21 +74,57 @@ def analyze_sentiment(
             'user': 'kaxm23'
         }
     """
+    from classification import score_text
+
     # Use provided timestamp or current time
     if timestamp is None:
         timestamp = "2025-02-08 22:13:31"
     
-    # Create TextBlob object
-    blob = TextBlob(text)
-    
     # Analyze sentiment
-    sentiment = blob.sentiment
+    polarity, subjectivity = score_text(text)
     
     # Create and return result object
     return SentimentResult(
-        polarity=sentiment.polarity,
-        subjectivity=sentiment.subjectivity,
+        polarity=polarity,
+        subjectivity=subjectivity,
         text_length=len(text),
         timestamp_utc=timestamp,
         user=user
-    )
\ No newline at end of file
+    )
+
+def analyze_sentiment_batch(
+    texts: List[str],
+    user: str = "kaxm23",
+    timestamp: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    max_workers: Optional[int] = None
+) -> List[SentimentResult]:
+    """
+    Analyze the sentiment of many texts, fanning out across a process pool.
+
+    Args:
+        texts (List[str]): The texts to analyze
+        user (str, optional): The user performing the analysis. Defaults to "kaxm23"
+        timestamp (str, optional): UTC timestamp. If None, current time is used.
+        chunk_size (int, optional): Texts sent to a pool worker at a time
+        max_workers (int, optional): Upper bound on worker processes
+
+    Returns:
+        List[SentimentResult]: One result per text, in the same order
+    """
+    from classification import score_texts
+
+    if timestamp is None:
+        timestamp = "2025-02-08 22:13:31"
+
+    scores = score_texts(texts, chunk_size=chunk_size, max_workers=max_workers)
+    return [
+        SentimentResult(
+            polarity=polarity,
+            subjectivity=subjectivity,
+            text_length=len(text),
+            timestamp_utc=timestamp,
+            user=user
+        )
+        for text, (polarity, subjectivity) in zip(texts, scores)
+    ]
@@ -0,0 +1,160 @@
+"""Two-level cache of sentiment scores keyed by a hash of the normalized text"""
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+Score = Tuple[float, float]  # (polarity, subjectivity)
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different copies share one entry"""
+    return ' '.join(text.split())
+
+def text_key(normalized_text: str) -> str:
+    """Cache key for text already passed through `normalize_text`"""
+    return hashlib.sha1(normalized_text.encode('utf-8')).hexdigest()
+
+class SentimentCache:
+    """
+    Cache of (polarity, subjectivity) scores.
+
+    Level one is an in-process LRU holding at most `max_entries` scores.
+    Level two is an optional SQLite file that survives restarts; level-two
+    hits are promoted into the LRU. The file is opened (and created) on the
+    first lookup or store, not when the cache is constructed.
+    """
+    def __init__(self, max_entries: int = 10000, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Score]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._opened = False
+
+    def get(self, key: str) -> Optional[Score]:
+        """Return the cached score for `key`, or None on a miss"""
+        with self._lock:
+            score = self._entries.get(key)
+            if score is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return score
+
+            score = self._disk_get(key)
+            if score is not None:
+                self.disk_hits += 1
+                self._remember(key, score)
+                return score
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, score: Score) -> None:
+        """Store a score in both levels"""
+        with self._lock:
+            self._remember(key, score)
+            self._disk_put_many([(key, score)])
+
+    def put_many(self, items: Iterable[Tuple[str, Score]]) -> None:
+        """Store many scores in both levels, writing the file in one transaction"""
+        items = list(items)
+        if not items:
+            return
+        with self._lock:
+            for key, score in items:
+                self._remember(key, score)
+            self._disk_put_many(items)
+
+    def close(self) -> None:
+        """Close the backing file; the next disk access reopens it at `path`"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            self._opened = False
+
+    def clear(self) -> None:
+        """Drop the in-process entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict:
+        """Return hit, miss and eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            }
+
+    def _remember(self, key: str, score: Score) -> None:
+        self._entries[key] = score
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if not self._opened:
+            self._opened = True
+            if self.path:
+                self._open(self.path)
+        return self._conn
+
+    def _open(self, path: str) -> None:
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS sentiment_cache ('
+                'key TEXT PRIMARY KEY, polarity REAL NOT NULL, subjectivity REAL NOT NULL)'
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Sentiment cache disabled on disk ({path}): {e}")
+            self._conn = None
+
+    def _disk_get(self, key: str) -> Optional[Score]:
+        conn = self._connection()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                'SELECT polarity, subjectivity FROM sentiment_cache WHERE key = ?', (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Sentiment cache read failed: {e}")
+            return None
+        return (row[0], row[1]) if row else None
+
+    def _disk_put_many(self, items: Iterable[Tuple[str, Score]]) -> None:
+        conn = self._connection()
+        if conn is None:
+            return
+        try:
+            conn.executemany(
+                'INSERT OR REPLACE INTO sentiment_cache (key, polarity, subjectivity) VALUES (?, ?, ?)',
+                [(key, score[0], score[1]) for key, score in items]
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Sentiment cache write failed: {e}")
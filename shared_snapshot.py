@@ -0,0 +1,217 @@
+"""
+Article snapshots shared between processes through a SQLite WAL file.
+
+Under gunicorn every worker runs its own `IngestionScheduler`. When they
+share a `SharedSnapshotStore`, only the process holding the ingestion lease
+fetches and scores feeds; it writes each snapshot to the file, and the
+other workers load it instead of ingesting themselves. Workers find out
+about a new snapshot with `PRAGMA data_version`, which costs no table read,
+so polling is cheap. Each worker decodes a version once and serves it from
+memory, the same as a snapshot it had produced itself.
+
+The lease is a single row naming its holder and an expiry time. The holder
+renews it every poll. If it dies, another worker takes the lease over once
+it expires. A snapshot is written only if the writer still holds the lease
+at commit time, so two producers can never publish the same version.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+class SharedSnapshotError(Exception):
+    """Custom exception for shared snapshot storage errors"""
+    pass
+
+@dataclass(frozen=True)
+class SharedSnapshot:
+    """One stored snapshot, with the raw-article keys its articles were built from"""
+    version: int
+    created_at: float
+    articles: Tuple[Dict, ...]
+    keys: Tuple[Tuple, ...]
+    new_articles: Tuple[Dict, ...]
+
+class SharedSnapshotStore:
+    """
+    Versioned snapshots and the ingestion lease in one SQLite file.
+
+    Connections are opened per process, so a store created before gunicorn
+    forks its workers is safe to use in each of them.
+    """
+    def __init__(self, path: str, lease_seconds: float = 60.0, retain: int = 5):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.retain = retain
+        self._token = uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._data_version: Optional[int] = None
+
+    @property
+    def holder(self) -> str:
+        """Lease holder name of this process; forked children get their own"""
+        return f"{self._token}:{os.getpid()}"
+
+    def acquire_lease(self, now: Optional[float] = None) -> bool:
+        """
+        Take or renew the ingestion lease.
+
+        Returns:
+            True if this process holds the lease until `lease_seconds` from now
+
+        Raises:
+            SharedSnapshotError: If the file cannot be read or written
+        """
+        if now is None:
+            now = time.time()
+        with self._lock:
+            conn = self._connection()
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    row = conn.execute('SELECT holder, expires_at FROM ingestion_lease WHERE id = 1').fetchone()
+                    acquired = row is None or row[0] == self.holder or row[1] <= now
+                    if acquired:
+                        conn.execute(
+                            'INSERT OR REPLACE INTO ingestion_lease (id, holder, expires_at) VALUES (1, ?, ?)',
+                            (self.holder, now + self.lease_seconds)
+                        )
+                    conn.execute('COMMIT')
+                except BaseException:
+                    conn.execute('ROLLBACK')
+                    raise
+            except sqlite3.Error as e:
+                raise SharedSnapshotError(f"Could not acquire ingestion lease: {e}")
+        if acquired and (row is None or row[0] != self.holder):
+            logger.info(f"Process {os.getpid()} now holds the ingestion lease")
+        return acquired
+
+    def release_lease(self) -> None:
+        """Give the lease up early so another worker can take over without waiting"""
+        with self._lock:
+            try:
+                self._connection().execute('DELETE FROM ingestion_lease WHERE id = 1 AND holder = ?', (self.holder,))
+            except sqlite3.Error as e:
+                logger.warning(f"Could not release ingestion lease: {e}")
+
+    def publish(
+        self,
+        version: int,
+        created_at: float,
+        articles: Tuple[Dict, ...],
+        keys: Tuple[Tuple, ...],
+        new_articles: Tuple[Dict, ...] = ()
+    ) -> None:
+        """
+        Store a snapshot and drop versions older than the newest `retain`.
+
+        Raises:
+            SharedSnapshotError: If the lease was lost, the version is not
+                newer than the stored ones, or the file cannot be written
+        """
+        positions = {id(article): index for index, article in enumerate(articles)}
+        payload = json.dumps({
+            'articles': list(articles),
+            'keys': [list(key) for key in keys],
+            'new': [positions[id(article)] for article in new_articles]
+        }, separators=(',', ':'))
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    row = conn.execute('SELECT holder FROM ingestion_lease WHERE id = 1').fetchone()
+                    if row is None or row[0] != self.holder:
+                        raise SharedSnapshotError("Ingestion lease lost before the snapshot was published")
+                    latest = conn.execute('SELECT MAX(version) FROM snapshots').fetchone()[0] or 0
+                    if version <= latest:
+                        raise SharedSnapshotError(f"Snapshot v{version} is not newer than stored v{latest}")
+                    conn.execute(
+                        'INSERT INTO snapshots (version, created_at, payload) VALUES (?, ?, ?)',
+                        (version, created_at, payload)
+                    )
+                    conn.execute('DELETE FROM snapshots WHERE version <= ?', (version - self.retain,))
+                    conn.execute(
+                        'UPDATE ingestion_lease SET expires_at = ? WHERE id = 1',
+                        (now + self.lease_seconds,)
+                    )
+                    conn.execute('COMMIT')
+                except BaseException:
+                    conn.execute('ROLLBACK')
+                    raise
+            except sqlite3.Error as e:
+                raise SharedSnapshotError(f"Could not publish snapshot v{version}: {e}")
+
+    def changed(self) -> bool:
+        """Whether another process has written to the file since the last call"""
+        with self._lock:
+            try:
+                data_version = self._connection().execute('PRAGMA data_version').fetchone()[0]
+            except sqlite3.Error as e:
+                raise SharedSnapshotError(f"Could not poll shared snapshots: {e}")
+            changed = data_version != self._data_version
+            self._data_version = data_version
+            return changed
+
+    def load_since(self, version: int) -> List[SharedSnapshot]:
+        """
+        Stored snapshots newer than `version`, oldest first.
+
+        Raises:
+            SharedSnapshotError: If the file cannot be read
+        """
+        with self._lock:
+            try:
+                rows = self._connection().execute(
+                    'SELECT version, created_at, payload FROM snapshots WHERE version > ? ORDER BY version',
+                    (version,)
+                ).fetchall()
+            except sqlite3.Error as e:
+                raise SharedSnapshotError(f"Could not load shared snapshots: {e}")
+        snapshots = []
+        for stored_version, created_at, payload in rows:
+            data = json.loads(payload)
+            articles = tuple(data['articles'])
+            snapshots.append(SharedSnapshot(
+                version=stored_version,
+                created_at=created_at,
+                articles=articles,
+                keys=tuple(tuple(key) for key in data['keys']),
+                new_articles=tuple(articles[index] for index in data['new'])
+            ))
+        return snapshots
+
+    def _connection(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        if self._conn is None or self._pid != pid:
+            # A connection inherited across fork must not be used by the child
+            try:
+                conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None, check_same_thread=False)
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS snapshots ('
+                    'version INTEGER PRIMARY KEY, created_at REAL NOT NULL, payload TEXT NOT NULL)'
+                )
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS ingestion_lease ('
+                    'id INTEGER PRIMARY KEY CHECK (id = 1), holder TEXT NOT NULL, expires_at REAL NOT NULL)'
+                )
+            except sqlite3.Error as e:
+                raise SharedSnapshotError(f"Could not open shared snapshot file {self.path}: {e}")
+            self._conn, self._pid, self._data_version = conn, pid, None
+        return self._conn
@@ -0,0 +1,168 @@
+"""
+Cryptocurrency symbol recognition.
+
+Every ticker and alias in the dictionary is compiled into one Aho-Corasick
+automaton, so tagging an article is a single left-to-right pass over its
+text whose cost depends on the text length and the number of matches, not
+on how many symbols the dictionary holds.
+"""
+import logging
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# symbol -> aliases matched case-insensitively as whole words. The symbol
+# itself is matched only when written in capitals, so tickers that are also
+# ordinary words (SOL, ADA, DOT, LINK, ...) have no lowercase alias. For the
+# same reason, project names that are ordinary words or names (Ripple, Tron,
+# Avalanche, Polygon, Stellar) are not aliases; their tickers still match.
+DEFAULT_SYMBOLS: Dict[str, Tuple[str, ...]] = {
+    'BTC': ('btc', 'bitcoin', 'xbt'),
+    'ETH': ('eth', 'ether', 'ethereum'),
+    'USDT': ('usdt', 'tether'),
+    'BNB': ('bnb', 'binance coin'),
+    'SOL': ('solana',),
+    'XRP': ('xrp',),
+    'USDC': ('usdc', 'usd coin'),
+    'ADA': ('cardano',),
+    'DOGE': ('doge', 'dogecoin'),
+    'TRX': ('trx',),
+    'TON': ('toncoin',),
+    'AVAX': ('avax',),
+    'SHIB': ('shib', 'shiba inu'),
+    'DOT': ('polkadot',),
+    'LINK': ('chainlink',),
+    'LTC': ('ltc', 'litecoin'),
+    'BCH': ('bch', 'bitcoin cash'),
+    'MATIC': ('matic',),
+    'XLM': ('xlm',),
+    'UNI': ('uniswap',),
+}
+
+class SymbolTaggerError(Exception):
+    """Custom exception for symbol tagging errors"""
+    pass
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher over lowercased text.
+
+    Each pattern carries a value and a flag saying whether the original
+    text must match it case-sensitively.
+    """
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[int, str, bool]]] = [[]]
+        self._compiled = False
+
+    def add(self, pattern: str, value: str, case_sensitive: bool = False) -> None:
+        """Add a pattern; must be called before the first `search`"""
+        if not pattern:
+            raise SymbolTaggerError("Cannot add an empty pattern")
+        if self._compiled:
+            raise SymbolTaggerError("Cannot add patterns after compiling")
+        state = 0
+        for char in pattern.lower():
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append((len(pattern), value, case_sensitive))
+
+    def compile(self) -> None:
+        """Build failure links breadth-first and merge outputs along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._outputs[next_state] = (
+                    self._outputs[next_state] + self._outputs[self._fail[next_state]]
+                )
+        self._compiled = True
+
+    def search(self, text: str) -> Iterable[Tuple[int, int, str, bool]]:
+        """Yield (start, end, value, case_sensitive) for every pattern occurrence"""
+        if not self._compiled:
+            self.compile()
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Keep offsets aligned when lowercasing changes the length
+            lowered = [char.lower() for char in text]
+        state = 0
+        for end, char in enumerate(lowered, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, value, case_sensitive in outputs[state]:
+                yield end - length, end, value, case_sensitive
+
+class SymbolTagger:
+    """
+    Tag texts with the cryptocurrency symbols they mention.
+
+    Args:
+        symbols (dict, optional): symbol -> aliases; defaults to DEFAULT_SYMBOLS.
+            The symbol itself is always matched when written in capitals.
+    """
+    def __init__(self, symbols: Optional[Dict[str, Iterable[str]]] = None):
+        if symbols is None:
+            symbols = DEFAULT_SYMBOLS
+        self.symbols = sorted(symbols)
+        self._automaton = AhoCorasick()
+        for symbol, aliases in symbols.items():
+            for alias in aliases:
+                self._automaton.add(alias, symbol)
+            self._automaton.add(symbol, symbol, case_sensitive=True)
+        self._automaton.compile()
+
+    def tag(self, text: str) -> List[str]:
+        """
+        Return the symbols mentioned in the text, in order of first mention.
+
+        Matches must be whole words; "$BTC" counts, "bitcoins" does not.
+        Where matches overlap the longest wins, so "Bitcoin Cash" is BCH only.
+        """
+        if not text:
+            return []
+        length = len(text)
+        matches = []
+        for start, end, symbol, case_sensitive in self._automaton.search(text):
+            if start > 0 and text[start - 1].isalnum():
+                continue
+            if end < length and text[end].isalnum():
+                continue
+            if case_sensitive and text[start:end] != symbol:
+                continue
+            matches.append((start, -end, symbol))
+
+        found: Dict[str, None] = {}
+        covered_until = 0
+        for start, negative_end, symbol in sorted(matches):
+            if start >= covered_until:
+                found[symbol] = None
+                covered_until = -negative_end
+        return list(found)
+
+    def tag_article(self, article: Dict) -> List[str]:
+        """Symbols mentioned in an article's title or summary"""
+        return self.tag(f"{article.get('title', '')}\n{article.get('summary', '')}")
+
+# Shared tagger compiled once from DEFAULT_SYMBOLS
+symbol_tagger = SymbolTagger()
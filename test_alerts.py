@@ -0,0 +1,121 @@
+from flask import Flask
+import pytest
+from alerts import AlertIndex, Alert, alert_index, evaluate_articles, sync_alerts
+from models import db, AlertOutbox, AlertSettings, AlertSettingsVersion, Article, User
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        alert_index.load([])
+        alert_index.version = None
+        yield app
+        db.session.remove()
+        db.drop_all()
+        alert_index.load([])
+        alert_index.version = None
+
+def make_alert(alert_id, symbol, threshold, user_id=1):
+    return Alert(id=alert_id, user_id=user_id, crypto_symbol=symbol,
+                 sentiment_threshold=threshold, email_alerts=True)
+
+def test_index_matches_only_crossed_thresholds_for_the_symbol():
+    index = AlertIndex()
+    for alert in [make_alert(1, 'BTC', 0.2), make_alert(2, 'BTC', 0.6), make_alert(3, 'BTC', -0.3),
+                  make_alert(4, 'ETH', 0.1)]:
+        index.upsert(alert)
+
+    assert [a.id for a in index.match('BTC', 0.5)] == [1]
+    assert [a.id for a in index.match('BTC', -0.4)] == [3]
+    assert index.match('SOL', 0.9) == []
+
+    index.upsert(make_alert(2, 'BTC', 0.4))
+    index.remove(1)
+    assert [a.id for a in index.match('BTC', 0.5)] == [2]
+
+def test_index_follows_committed_alert_settings(app):
+    user = User(username='u', email='u@example.com')
+    db.session.add(user)
+    db.session.commit()
+
+    alert = AlertSettings(user_id=user.id, crypto_symbol='btc', sentiment_threshold=0.5)
+    db.session.add(alert)
+    db.session.flush()
+    assert len(alert_index) == 0  # not committed yet
+    db.session.commit()
+    assert [a.id for a in alert_index.match('BTC', 0.7)] == [alert.id]
+
+    alert.sentiment_threshold = 0.9
+    db.session.commit()
+    assert alert_index.match('BTC', 0.7) == []
+
+    db.session.delete(alert)
+    db.session.commit()
+    assert len(alert_index) == 0
+
+def test_evaluate_articles_queues_each_match_once(app):
+    user = User(username='u', email='u@example.com')
+    db.session.add(user)
+    db.session.commit()
+    db.session.add(AlertSettings(user_id=user.id, crypto_symbol='BTC', sentiment_threshold=0.3))
+    db.session.add(AlertSettings(user_id=user.id, crypto_symbol='ETH', sentiment_threshold=0.3))
+    db.session.commit()
+
+    article = {
+        'title': 'Bitcoin soars', 'summary': '', 'url': 'https://example.com/1',
+        'published_ts': 1_700_000_000, 'source': 'example.com',
+        'sentiment': {'polarity': 0.8, 'subjectivity': 0.5}, 'symbols': ['BTC']
+    }
+    Article.bulk_upsert([article])
+
+    assert evaluate_articles([article]) == 1
+    assert evaluate_articles([article]) == 0
+
+    rows = AlertOutbox.query.all()
+    assert [(r.crypto_symbol, r.sent_at) for r in rows] == [('BTC', None)]
+
+def test_sync_reloads_only_when_alerts_changed_elsewhere(app):
+    user = User(username='u', email='u@example.com')
+    db.session.add(user)
+    db.session.commit()
+    assert sync_alerts() is True
+    assert sync_alerts() is False
+
+    # A raw insert fires no events in this process, like a write from another
+    # worker, whose own session listener bumps the version
+    db.session.execute(AlertSettings.__table__.insert(), [
+        {'user_id': user.id, 'crypto_symbol': 'BTC', 'sentiment_threshold': 0.3, 'email_alerts': True}
+    ])
+    AlertSettingsVersion.bump(db.session.connection())
+    db.session.commit()
+    assert alert_index.match('BTC', 0.5) == []
+
+    assert sync_alerts() is True
+    assert len(alert_index.match('BTC', 0.5)) == 1
+    assert sync_alerts() is False
+
+def test_orm_and_bulk_alert_changes_bump_the_version(app):
+    user = User(username='u', email='u@example.com')
+    db.session.add(user)
+    db.session.commit()
+    start = AlertSettingsVersion.current()
+
+    db.session.add(AlertSettings(user_id=user.id, crypto_symbol='BTC', sentiment_threshold=0.3))
+    db.session.commit()
+    AlertSettings.query.filter_by(crypto_symbol='BTC').delete()
+    db.session.commit()
+
+    assert AlertSettingsVersion.current() == start + 2
+
+def test_zero_thresholds_are_rejected_and_never_fire(app):
+    with pytest.raises(ValueError):
+        AlertSettings(user_id=1, crypto_symbol='BTC', sentiment_threshold=0)
+
+    index = AlertIndex()
+    index.load([make_alert(1, 'BTC', 0.0)])
+
+    assert index.match('BTC', 0.0) == [] and index.match('BTC', 0.8) == []
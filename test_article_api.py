@@ -0,0 +1,86 @@
+import gzip
+import json
+import pytest
+from article_api import page, etag_for, encode_cursor, decode_cursor, ArticleApiError
+from ingestion import ArticleSnapshot
+
+def make_snapshot(version, count):
+    articles = tuple(
+        {
+            'title': f"Article {n}",
+            'url': f"https://example.com/{n}",
+            'published_ts': 1_700_000_000 + n // 2,  # pairs share a timestamp
+            'source': 'a' if n % 2 else 'b',
+            'sentiment': {'polarity': 0.1, 'subjectivity': 0.2},
+        }
+        for n in range(count)
+    )
+    return ArticleSnapshot(version=version, articles=articles, created_at=0.0)
+
+def test_cursor_pages_cover_every_article_once():
+    snapshot = make_snapshot(1, 7)
+    seen, cursor = [], None
+    while True:
+        result = page(snapshot, cursor=cursor, limit=3)
+        seen.extend(a['title'] for a in result['articles'])
+        cursor = result['next_cursor']
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted(a['title'] for a in snapshot.articles)
+    assert len(seen) == 7
+    assert seen[0] == 'Article 6'  # newest first
+
+def test_source_filter():
+    result = page(make_snapshot(1, 6), limit=10, source='a')
+    assert [a['title'] for a in result['articles']] == ['Article 5', 'Article 3', 'Article 1']
+    assert result['next_cursor'] is None
+
+def test_bad_cursor_is_rejected():
+    with pytest.raises(ArticleApiError):
+        page(make_snapshot(1, 3), cursor='not-a-cursor!')
+
+def test_cursor_round_trip():
+    article = {'published_ts': 5, 'url': 'https://example.com/x?y=1'}
+    assert decode_cursor(encode_cursor(article)) == (-5, 'https://example.com/x?y=1')
+
+def test_etags_follow_snapshot_content_not_just_its_version():
+    snapshot = make_snapshot(1, 5)
+    # Another worker, or this one after a restart, at the same version number
+    same_content = ArticleSnapshot(version=1, articles=tuple(dict(a) for a in snapshot.articles), created_at=9.0)
+    changed = ArticleSnapshot(version=1, articles=snapshot.articles[:4], created_at=9.0)
+
+    assert etag_for(same_content, None, 5, None) == etag_for(snapshot, None, 5, None)
+    assert etag_for(changed, None, 5, None) != etag_for(snapshot, None, 5, None)
+
+@pytest.fixture
+def client(monkeypatch):
+    from config import config
+    monkeypatch.setattr(config, 'INGESTION_AUTOSTART', False)
+    import app
+    monkeypatch.setattr(app.scheduler, '_snapshot', make_snapshot(3, 40))
+    return app.app.test_client()
+
+def test_etag_and_not_modified(client):
+    first = client.get('/api/articles?limit=5')
+    etag = first.headers['ETag']
+    assert first.status_code == 200
+    assert len(first.get_json()['articles']) == 5
+
+    again = client.get('/api/articles?limit=5', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.data == b''
+
+    other_page = client.get('/api/articles?limit=6', headers={'If-None-Match': etag})
+    assert other_page.status_code == 200
+
+def test_large_pages_are_gzipped(client):
+    response = client.get('/api/articles?limit=40', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert len(json.loads(gzip.decompress(response.data))['articles']) == 40
+
+    revalidated = client.get('/api/articles?limit=40', headers={
+        'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']
+    })
+    assert revalidated.status_code == 304
@@ -0,0 +1,55 @@
+import pytest
+from article_store import ArticleRecord, ArticleStore, ArticleStoreError
+
+def processed(n, polarity=0.0, subjectivity=0.5, symbols=(), source='https://a.example/rss'):
+    return {
+        'title': f"Title {n} – Ünïcode",
+        'summary': f"Summary {n}",
+        'url': f"https://example.com/{n}",
+        'source': source,
+        'published_ts': 1_700_000_000 + n,
+        'published_date': '',
+        'sentiment': {'polarity': polarity, 'subjectivity': subjectivity, 'sentiment_label': 'Neutral'},
+        'symbols': list(symbols),
+        'duplicates': [{'source': 'https://b.example/rss', 'link': f"https://b.example/{n}"}] if n == 2 else []
+    }
+
+def test_rows_round_trip_and_dedupe_by_url():
+    store = ArticleStore()
+
+    assert [store.add(processed(n, polarity=0.25, symbols=['BTC'] * (n % 2))) for n in range(3)] == [0, 1, 2]
+    assert store.add(processed(1)) is None
+    assert store.row_for_url('https://example.com/2') == 2
+
+    record = store.record(2)
+    assert record == ArticleRecord.from_processed(processed(2, polarity=0.25))
+    assert record.to_processed()['duplicates'] == [{'source': 'https://b.example/rss', 'link': 'https://b.example/2'}]
+    assert store.record(1).symbols == ('BTC',)
+    assert not hasattr(record, '__dict__')
+    with pytest.raises(ArticleStoreError):
+        store.record(3)
+
+def test_filter_by_time_score_source_and_symbol():
+    store = ArticleStore()
+    store.add_many([
+        processed(0, polarity=-0.5, symbols=['BTC']),
+        processed(1, polarity=0.5, symbols=['ETH', 'BTC']),
+        processed(2, polarity=0.75),
+        processed(3, polarity=0.9, symbols=['BTC'], source='https://c.example/rss'),
+    ])
+
+    assert list(store.filter()) == [3, 2, 1, 0]
+    assert list(store.filter(start_ts=1_700_000_001, end_ts=1_700_000_003)) == [2, 1]
+    assert list(store.filter(min_polarity=0.5, symbol='BTC')) == [3, 1]
+    assert list(store.filter(symbol='ETH')) == [1]
+    assert list(store.filter(source='https://c.example/rss')) == [3]
+    assert list(store.filter(symbol='SOL')) == []
+
+def test_memory_usage_reports_per_article_bytes():
+    store = ArticleStore()
+    store.add_many(processed(n, symbols=['BTC']) for n in range(100))
+
+    usage = store.memory_usage()
+
+    assert usage['articles'] == 100
+    assert usage['per_article'] == usage['total'] / 100
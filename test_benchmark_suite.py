@@ -0,0 +1,41 @@
+import json
+import feedparser
+from benchmarks import suite
+
+def test_fixtures_scale_to_distinct_entries():
+    for feed_url in suite.FIXTURES:
+        document = suite.scale_feed(suite.load_fixture(feed_url), 12)
+        entries = feedparser.parse(document).entries
+
+        assert len(entries) == 12
+        assert len({entry.link for entry in entries}) == 12
+        assert len({entry.summary for entry in entries}) == 12
+
+def test_run_reports_every_stage_and_size(monkeypatch):
+    monkeypatch.setattr(suite, 'MIN_RUN_SECONDS', 0)
+
+    report = suite.run(sizes=[3, 7], repeat=1, stages=['parse_feed', 'parse_date', 'render_articles'])
+
+    assert set(report['results']) == {'parse_feed', 'parse_date', 'render_articles'}
+    assert all(set(timings) == {'3', '7'} for timings in report['results'].values())
+
+def test_compare_flags_only_slowdowns_beyond_threshold():
+    baseline = {'results': {'a': {'30': 10.0, '300': 10.0}, 'b': {'30': 10.0}}}
+    current = {'results': {'a': {'30': 12.0, '300': 13.0}, 'b': {'30': 5.0}, 'new': {'30': 1.0}}}
+
+    regressions = suite.compare(baseline, current, threshold=0.25)
+
+    assert [(r['stage'], r['size']) for r in regressions] == [('a', 300)]
+
+def test_compare_mode_exits_nonzero_on_regression(monkeypatch, tmp_path):
+    monkeypatch.setattr(suite, 'MIN_RUN_SECONDS', 0)
+    baseline_path = tmp_path / 'baseline.json'
+    args = ['--sizes', '3', '--repeat', '1', '--stages', 'parse_date']
+
+    assert suite.main(args + ['--save', str(baseline_path)]) == 0
+
+    baseline = json.loads(baseline_path.read_text())
+    baseline['results']['parse_date']['3'] /= 1000
+    baseline_path.write_text(json.dumps(baseline))
+
+    assert suite.main(args + ['--compare', str(baseline_path)]) == 1
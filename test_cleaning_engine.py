@@ -0,0 +1,80 @@
+import random
+import pytest
+from benchmarks import legacy_cleaners
+from benchmarks.corpus import build_corpus
+from bs4 import BeautifulSoup
+from cleaning_engine import CleaningLevel, TextCleanerConfig, compile_plan, clean_many, strip_html
+from news_collector import clean_summary
+import enhanced_text_cleaner
+import text_cleaner
+import text_processing
+
+FRAGMENTS = [
+    "<p>", "</p>", "<b>", "</b>", "<br/>", "<br></br>", "<div class='x'>", "</div>",
+    "<script>var a = 1 < 2;</script>", "<style>p {}</style>", "<!-- note -->",
+    "<![CDATA[raw <b>]]>", "<template><p>t</p></template>", "<!DOCTYPE html>",
+    "&amp;", "&lt;3", "&nbsp;", "&#8217;", "&#x41;", "&apos;", "&unknown;", "&amp", "& ",
+    "&gt100", "&copy2024", "&#0;",
+    "Bitcoin", " BTC ", "$60,000", "+5.3%", "__URL_0__", "\n", "  ", "Hello, World!",
+    "https://example.com/a", "https://example.com/a/b", "http://x.io/?q=1&r=2",
+    "<a href='https://example.com'>link</a>", "café", "e.g.", "<p>unclosed <a hre",
+]
+
+def random_documents(count, seed=7):
+    rng = random.Random(seed)
+    return [''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 25))) for _ in range(count)]
+
+DOCUMENTS = random_documents(400) + build_corpus(40)
+
+CONFIGS = [
+    TextCleanerConfig(),
+    TextCleanerConfig(cleaning_level=CleaningLevel.MINIMAL),
+    TextCleanerConfig(preserve_numbers=True, preserve_urls=True, preserved_punctuation=".,!$%"),
+    TextCleanerConfig(preserve_urls=True, preserve_case=True, preserved_punctuation="_"),
+    TextCleanerConfig(cleaning_level=CleaningLevel.STRICT, preserve_case=True, extract_tags=['p', 'a']),
+    TextCleanerConfig(min_word_length=3, custom_replacements={'BTC': 'bitcoin', '&': ' and '}),
+]
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_enhanced_wrapper_matches_legacy(config):
+    results = enhanced_text_cleaner.clean_many(DOCUMENTS, config)
+    for document, result in zip(DOCUMENTS, results):
+        text, removed_tags = legacy_cleaners.enhanced_clean_text(document, config)
+        assert result.text == text, document
+        assert result.metadata.removed_tags == removed_tags, document
+        assert enhanced_text_cleaner.clean_text(document, config).text == text
+
+def test_text_cleaner_wrapper_matches_legacy():
+    expected = [legacy_cleaners.text_cleaner_clean_text(document) for document in DOCUMENTS]
+    assert [text_cleaner.clean_text(document) for document in DOCUMENTS] == expected
+    assert text_cleaner.clean_many(DOCUMENTS) == expected
+
+@pytest.mark.parametrize("options", [
+    {},
+    {'preserve_numbers': False, 'preserve_urls': False},
+    {'max_length': 80},
+    {'max_length': 300, 'strip_markup': False},
+])
+def test_text_processing_wrapper_matches_legacy(options):
+    expected = [legacy_cleaners.text_processing_clean_text(document, **options) for document in DOCUMENTS]
+    assert [text_processing.clean_text(document, **options) for document in DOCUMENTS] == expected
+    assert text_processing.clean_many(DOCUMENTS, **options) == expected
+
+def test_plans_are_compiled_once_per_config():
+    first = compile_plan(TextCleanerConfig(preserve_numbers=True, user='a'))
+    second = compile_plan(TextCleanerConfig(preserve_numbers=True, user='b'))
+    assert first is second
+    assert clean_many(["<p>Hello</p>"]) == ["hello"]
+
+@pytest.mark.parametrize("html", ['&amp &copy2024 x', 'Fees &gt100', 'a &#0; b', '<p>Fees &gt; 100 &amp; up</p>'])
+def test_references_without_semicolons_are_left_as_beautifulsoup_leaves_them(html):
+    expected = BeautifulSoup(html, 'html.parser').get_text()
+
+    assert strip_html(html) == expected
+    assert clean_summary(html) == ' '.join(expected.split())
+
+def test_strip_html_matches_beautifulsoup_on_the_fuzz_corpus():
+    # Callers collapse whitespace, where BeautifulSoup drops some blank strings
+    for document in DOCUMENTS:
+        expected = BeautifulSoup(document, 'html.parser').get_text()
+        assert strip_html(document).split() == expected.split()
@@ -0,0 +1,35 @@
+from date_parsing import DateParser, format_timestamp
+
+EPOCH = 1739053835  # 2025-02-08 22:30:35 UTC
+
+def test_offsets_are_normalized_to_utc():
+    parser = DateParser()
+
+    assert parser.parse('Sat, 08 Feb 2025 22:30:35 +0000') == EPOCH
+    assert parser.parse('Sat, 08 Feb 2025 22:30:35 GMT') == EPOCH
+    assert parser.parse('Sat, 08 Feb 2025 17:30:35 -0500') == EPOCH
+    assert parser.parse('Sat, 08 Feb 2025 17:30:35 EST') == EPOCH
+    assert parser.parse('2025-02-09T04:00:35+05:30') == EPOCH
+    assert parser.parse('2025-02-08T22:30:35Z') == EPOCH
+    assert parser.parse('2025-02-08 22:30:35') == EPOCH
+    assert format_timestamp(EPOCH) == '2025-02-08 22:30:35'
+
+def test_each_feed_remembers_its_format():
+    parser = DateParser()
+
+    parser.parse('2025-02-08T22:30:35Z', 'https://iso.example/rss')
+    parser.parse('Sat, 08 Feb 2025 22:30:35 GMT', 'https://rfc.example/rss')
+
+    assert parser.stats()['formats'] == {'https://iso.example/rss': 'iso8601'}
+
+def test_unparseable_dates_are_counted_not_invented():
+    parser = DateParser()
+
+    assert parser.parse('yesterday', 'https://a.example/rss') is None
+    assert parser.parse('', 'https://a.example/rss') is None
+    assert parser.parse('Sat, 08 Feb 2025 22:30:35 GMT', 'https://b.example/rss') == EPOCH
+
+    stats = parser.stats()
+    assert (stats['parsed'], stats['unparseable']) == (1, 2)
+    assert stats['unparseable_by_feed'] == {'https://a.example/rss': 2}
+    assert format_timestamp(None) == ''
@@ -0,0 +1,70 @@
+from dedup import NearDuplicateDetector, MinHasher, MinHashIndex, similarity
+
+STORY = (
+    "Bitcoin climbs above 50,000 as spot ETF inflows accelerate "
+    "Bitcoin rose sharply on Monday after spot exchange-traded funds recorded "
+    "their largest daily inflows in a month, lifting the wider crypto market"
+)
+EDITED = STORY.replace("sharply ", "")
+UNRELATED = "Solana outage halts block production as validators restart the network"
+
+def make_article(link, text, source):
+    title, _, summary = text.partition(' Bitcoin rose')
+    return {'link': link, 'title': title, 'summary': 'Bitcoin rose' + summary, 'source': source}
+
+def test_signatures_estimate_shingle_similarity():
+    hasher = MinHasher()
+    story = hasher.signature(STORY)
+
+    assert similarity(story, hasher.signature(STORY)) == 1.0
+    assert similarity(story, hasher.signature(EDITED)) > 0.7
+    assert similarity(story, hasher.signature(UNRELATED)) < 0.2
+    assert hasher.signature("   ") is None
+
+def test_index_returns_only_similar_signatures():
+    hasher = MinHasher()
+    index = MinHashIndex(threshold=0.5)
+    story = index.add(hasher.signature(STORY))
+    index.add(hasher.signature(UNRELATED))
+
+    matches = index.query(hasher.signature(EDITED))
+
+    assert [position for position, _ in matches] == [story]
+
+def test_syndicated_copies_collapse_into_one_story():
+    detector = NearDuplicateDetector()
+    articles = [
+        make_article('https://coindesk.com/a', STORY, 'coindesk.com'),
+        make_article('https://cointelegraph.com/b', EDITED, 'cointelegraph.com'),
+        {'link': 'https://crypto.news/c', 'title': UNRELATED, 'summary': '', 'source': 'crypto.news'},
+    ]
+
+    collapsed = detector.collapse(articles)
+
+    assert [a['link'] for a in collapsed] == ['https://coindesk.com/a', 'https://crypto.news/c']
+    assert collapsed[0]['duplicates'] == [
+        {'source': 'cointelegraph.com', 'link': 'https://cointelegraph.com/b'}
+    ]
+    assert collapsed[1]['duplicates'] == []
+
+def test_later_copies_join_the_first_seen_cluster():
+    detector = NearDuplicateDetector()
+    first = make_article('https://coindesk.com/a', STORY, 'coindesk.com')
+    later = make_article('https://cointelegraph.com/b', EDITED, 'cointelegraph.com')
+
+    assert detector.assign(first) == 'https://coindesk.com/a'
+    assert detector.assign(later) == 'https://coindesk.com/a'
+    # Re-fetching the same article does not grow the index
+    detector.assign(first)
+    assert len(detector.index) == 2
+
+def test_memory_is_bounded_to_the_newest_articles():
+    detector = NearDuplicateDetector(max_articles=8)
+    for n in range(20):
+        detector.assign({'link': f"https://example.com/{n}", 'title': f"Unrelated story number {n} about topic {n * 7}"})
+
+    assert len(detector) <= 8 and len(detector.index) == len(detector)
+    later = make_article('https://cointelegraph.com/b', EDITED, 'cointelegraph.com')
+    detector.seed([make_article('https://coindesk.com/a', STORY, 'coindesk.com')])
+    # The newest article survives eviction and still clusters its copies
+    assert detector.assign(later) == 'https://coindesk.com/a'
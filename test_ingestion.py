@@ -0,0 +1,91 @@
+from ingestion import IngestionScheduler, IngestionError, EMPTY_SNAPSHOT
+import pytest
+
+def make_article(title):
+    return {'title': title, 'summary': f"{title} summary", 'link': f"https://example.com/{title}"}
+
+def test_refresh_publishes_new_version():
+    scheduler = IngestionScheduler(
+        fetch=lambda: [make_article('a'), make_article('b')],
+        process=lambda article: dict(article, processed=True),
+        interval=60
+    )
+    assert scheduler.snapshot() is EMPTY_SNAPSHOT
+
+    first = scheduler.refresh()
+    second = scheduler.refresh()
+
+    assert (first.version, second.version) == (1, 2)
+    assert scheduler.snapshot() is second
+    assert [a['title'] for a in second.articles] == ['a', 'b']
+    assert all(a['processed'] for a in second.articles)
+
+def test_failed_refresh_keeps_previous_snapshot():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        if len(calls) > 1:
+            raise RuntimeError("feed down")
+        return [make_article('a')]
+
+    scheduler = IngestionScheduler(fetch=fetch, process=lambda a: a, interval=60)
+    published = scheduler.refresh()
+
+    with pytest.raises(IngestionError):
+        scheduler.refresh()
+
+    assert scheduler.snapshot() is published
+    assert scheduler.last_error == "feed down"
+
+def test_listeners_receive_published_snapshot():
+    received = []
+    scheduler = IngestionScheduler(fetch=lambda: [make_article('a')], process=lambda a: a, interval=60)
+    scheduler.add_listener(received.append)
+
+    snapshot = scheduler.refresh()
+
+    assert received == [snapshot]
+
+def test_processing_failures_are_dropped():
+    scheduler = IngestionScheduler(
+        fetch=lambda: [make_article('a'), make_article('b')],
+        process=lambda a: a if a['title'] == 'b' else None,
+        interval=60
+    )
+    assert [a['title'] for a in scheduler.refresh().articles] == ['b']
+
+def test_unchanged_articles_are_not_reprocessed():
+    processed = []
+
+    def process(article):
+        processed.append(article['title'])
+        return dict(article)
+
+    feed = [make_article('a')]
+    scheduler = IngestionScheduler(fetch=lambda: list(feed), process=process, interval=60)
+
+    scheduler.refresh()
+    feed.append(make_article('b'))
+    scheduler.refresh()
+
+    assert processed == ['a', 'b']
+
+def test_new_articles_are_processed_in_one_batch():
+    feed = [make_article('a'), make_article('b')]
+    batches = []
+
+    def process_batch(articles):
+        batches.append([a['title'] for a in articles])
+        return [dict(a, processed=True) if a['title'] != 'c' else None for a in articles]
+
+    scheduler = IngestionScheduler(
+        fetch=lambda: list(feed), process=lambda a: None, interval=60, process_batch=process_batch
+    )
+    scheduler.refresh()
+    feed.extend([make_article('c'), make_article('d')])
+    snapshot = scheduler.refresh()
+
+    assert batches == [['a', 'b'], ['c', 'd']]
+    assert [a['title'] for a in snapshot.articles] == ['a', 'b', 'd']
+    assert [a['title'] for a in snapshot.new_articles] == ['d']
@@ -0,0 +1,43 @@
+import json
+import os
+import subprocess
+import sys
+import init
+from init import initialize_app, missing_corpora, warm_up, REQUIRED_CORPORA
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def test_corpora_are_found_unpacked_or_zipped(monkeypatch, tmp_path):
+    monkeypatch.setattr(init, 'nltk_data_dirs', lambda: [str(tmp_path)])
+    assert missing_corpora() == list(REQUIRED_CORPORA)
+
+    (tmp_path / REQUIRED_CORPORA['punkt']).mkdir(parents=True)
+    zipped = tmp_path / (REQUIRED_CORPORA['wordnet'] + '.zip')
+    zipped.parent.mkdir(parents=True)
+    zipped.write_bytes(b'')
+
+    assert missing_corpora() == ['averaged_perceptron_tagger']
+
+def test_initialize_app_never_downloads_by_default(monkeypatch, tmp_path):
+    import nltk
+    monkeypatch.setattr(init, 'nltk_data_dirs', lambda: [str(tmp_path)])
+    monkeypatch.setattr(nltk, 'download', _refuse_download)
+
+    assert initialize_app() == list(REQUIRED_CORPORA)
+
+def _refuse_download(*args, **kwargs):
+    raise AssertionError("initialize_app tried to download corpora")
+
+def test_importing_the_app_does_not_load_heavy_dependencies(tmp_path):
+    script = "import sys, json, app; print(json.dumps([m for m in ('textblob', 'nltk', 'bs4') if m in sys.modules]))"
+    output = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=tmp_path, env=dict(os.environ, PYTHONPATH=REPO_ROOT),
+        capture_output=True, text=True, check=True
+    ).stdout
+    assert json.loads(output.strip().splitlines()[-1]) == []
+
+def test_warm_up_loads_the_sentiment_backend():
+    timings = warm_up()
+    assert set(timings) == {'sentiment.textblob', 'bs4'}
+    assert 'textblob' in sys.modules and 'bs4' in sys.modules
@@ -0,0 +1,99 @@
+from textblob import TextBlob
+from lexicon_sentiment import LexiconSentimentEngine, PARITY_TOLERANCE, get_engine, tokenize
+import pytest
+
+# Fixture corpus: crypto headlines and summaries plus sentences that exercise
+# modifiers, negation and exclamation rules
+corpus = [
+    "Bitcoin reaches new all-time high as institutional investors pour in!",
+    "Cryptocurrency market crashes, investors lose millions in devastating sell-off.",
+    "Market analysts predict stable trading range for major cryptocurrencies.",
+    "Bitcoin surged past $60,000 on Tuesday as institutional investors poured money into spot ETFs, "
+    "while analysts warned that the rally could be fragile.",
+    "The broader crypto market also gained, with Ether up 5% and Solana hitting a new high.",
+    "Traders are not very worried about regulation yet!",
+    "Ethereum developers delayed the upgrade again, frustrating an already nervous community.",
+    "The SEC's decision was widely seen as a huge win for the industry.",
+    "Regulators said the exchange had failed to protect customer funds, a serious breach.",
+    "Analysts remain cautiously optimistic about the second half of the year.",
+    "It was not a good week for altcoins, which fell sharply across the board.",
+    "This is not good at all!!",
+    "I don't think it's a really bad idea.",
+    "Very very good results, extremely positive outlook...",
+    "The market is never boring; it's absolutely terrible and not a great place.",
+    "I absolutely love this product! It's amazing and works perfectly.",
+    "This is terrible. I hate how poorly it performs and it's completely useless.",
+    "The U.S. S.E.C. said Mr. Gensler was not happy, e.g. about very bad actors etc.",
+    "No surprise: the token dumped after the unlock.",
+    "Miners are increasingly profitable as hash rate hits a record.",
+    "Stablecoin issuer reports clean audit, easing fears of a bank run.",
+    "Hackers stole $100 million in a sophisticated bridge exploit.",
+    "The proposal passed with overwhelming support from token holders.",
+    "Volatility is expected to remain low ahead of the Fed meeting.",
+    "DeFi lending rates are surprisingly high, but risks are real.",
+    "",
+    "1234 5678",
+]
+
+def test_matches_textblob_within_tolerance():
+    engine = get_engine()
+    scores = engine.score_batch(corpus)
+
+    for text, (polarity, subjectivity) in zip(corpus, scores):
+        expected = TextBlob(text).sentiment
+        assert abs(polarity - expected.polarity) <= PARITY_TOLERANCE, text
+        assert abs(subjectivity - expected.subjectivity) <= PARITY_TOLERANCE, text
+
+def test_batch_scores_are_independent_of_batch_composition():
+    engine = get_engine()
+    batched = engine.score_batch(corpus)
+    single = [engine.score_batch([text])[0] for text in corpus]
+
+    assert batched == pytest.approx(single)
+
+def test_rules_on_small_lexicon():
+    lexicon = {
+        'good': {None: [0.7, 0.6, 1.0], 'JJ': [0.7, 0.6, 1.0]},
+        'very': {None: [0.2, 0.3, 1.3], 'RB': [0.2, 0.3, 1.3]},
+    }
+    engine = LexiconSentimentEngine(lexicon)
+
+    (good, _), (very_good, _), (not_good, _), (good_bang, _) = engine.score_batch(
+        ["good", "very good", "not good", "good!"]
+    )
+
+    assert good == pytest.approx(0.7)
+    assert very_good == pytest.approx(0.91)
+    assert not_good == pytest.approx(-0.35)
+    assert good_bang == pytest.approx(0.875)
+
+def test_tokenize_splits_punctuation_and_contractions():
+    assert tokenize("Don't panic, BTC!") == ['do', "n", "'", 't', 'panic', ',', 'btc', '!']
+
+def test_classification_backend_switch(monkeypatch):
+    import classification
+    from config import config
+    from sentiment_cache import SentimentCache
+
+    monkeypatch.setattr(classification, 'sentiment_cache', SentimentCache(max_entries=10))
+    text = "Bitcoin reaches new all-time high as institutional investors pour in!"
+    expected = classification.analyze_sentiment(text)
+
+    monkeypatch.setattr(config, 'SENTIMENT_BACKEND', 'lexicon')
+    result = classification.analyze_sentiment(text)
+
+    assert result.polarity == pytest.approx(expected.polarity, abs=PARITY_TOLERANCE)
+    assert result.sentiment_label == expected.sentiment_label
+
+def test_contracted_negations_score_as_textblob_scores_them():
+    engine = get_engine()
+    texts = ["Bitcoin isn't good.", "Bitcoin is not good.", "Bitcoin is good."]
+
+    scores = engine.score_batch(texts)
+
+    for text, (polarity, subjectivity) in zip(texts, scores):
+        expected = TextBlob(text).sentiment
+        assert abs(polarity - expected.polarity) < 1e-9
+        assert abs(subjectivity - expected.subjectivity) < 1e-9
+    # Only the uncontracted negation flips the score
+    assert scores[0] == scores[2] and scores[1][0] < 0
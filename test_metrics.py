@@ -0,0 +1,60 @@
+import pytest
+from metrics import MetricsError, MetricsRegistry
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram('latency_seconds', 'Latency', ['stage'], buckets=(0.1, 1.0))
+    clean = latency.labels('clean')
+
+    for value in (0.05, 0.1, 0.5, 3.0):
+        clean.observe(value)
+    with latency.labels('score').time():
+        pass
+
+    text = registry.render()
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{stage="clean",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{stage="clean",le="1"} 3' in text
+    assert 'latency_seconds_bucket{stage="clean",le="+Inf"} 4' in text
+    assert 'latency_seconds_sum{stage="clean"} 3.65' in text
+    assert 'latency_seconds_count{stage="clean"} 4' in text
+    assert 'latency_seconds_count{stage="score"} 1' in text
+
+def test_counters_and_callbacks():
+    registry = MetricsRegistry()
+    errors = registry.counter('errors_total', 'Errors', ['stage'])
+    errors.labels('fetch').inc()
+    errors.labels('fetch').inc(2)
+    errors.labels('say "hi"\n').inc()
+    registry.callback('hits_total', 'Hits', 'counter', lambda: {('page', 'hit'): 7}, ['cache', 'result'])
+    registry.callback('broken', 'Raises', 'gauge', lambda: 1 / 0)
+
+    text = registry.render()
+
+    assert 'errors_total{stage="fetch"} 3' in text
+    assert 'errors_total{stage="say \\"hi\\"\\n"} 1' in text
+    assert 'hits_total{cache="page",result="hit"} 7' in text
+    assert '# TYPE broken gauge' in text
+
+def test_misuse_is_rejected():
+    registry = MetricsRegistry()
+    errors = registry.counter('errors_total', 'Errors', ['stage'])
+
+    with pytest.raises(MetricsError):
+        errors.labels()
+    with pytest.raises(MetricsError):
+        registry.counter('errors_total', 'Again')
+
+def test_metrics_route(monkeypatch):
+    from config import config
+    monkeypatch.setattr(config, 'INGESTION_AUTOSTART', False)
+    import app
+    client = app.app.test_client()
+
+    client.get('/')
+    response = client.get('/metrics')
+
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    text = response.get_data(as_text=True)
+    assert 'crypto_news_stage_seconds_count{stage="render"}' in text
+    assert 'crypto_news_cache_requests_total{cache="page",result="hit"}' in text
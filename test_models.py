@@ -0,0 +1,156 @@
+from flask import Flask
+from models import db, Article, ArticleSymbol, SentimentRollup
+import os
+import subprocess
+import sys
+import pytest
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+def processed(n, polarity=0.0, published_ts=None):
+    return {
+        'title': f"Article {n}",
+        'summary': f"Summary {n}",
+        'url': f"https://example.com/{n}",
+        'published_ts': 1_700_000_000 + n if published_ts is None else published_ts,
+        'source': 'https://cointelegraph.com/rss',
+        'sentiment': {'polarity': polarity, 'subjectivity': 0.5},
+    }
+
+def test_bulk_upsert_deduplicates_on_link(app):
+    written = Article.bulk_upsert([processed(1), processed(2), processed(1, polarity=0.9)])
+
+    assert written == 2
+    assert Article.query.count() == 2
+    assert Article.query.filter_by(link_hash=Article.hash_link('https://example.com/1')).one().polarity == 0.9
+
+    Article.bulk_upsert([processed(2, polarity=-0.5), processed(3)])
+
+    assert Article.query.count() == 3
+    assert Article.query.filter_by(title='Article 2').one().polarity == -0.5
+
+def test_newest_pages_by_keyset(app):
+    Article.bulk_upsert([processed(n) for n in range(5)] + [processed(10, published_ts=1_700_000_004)])
+
+    first = Article.newest(limit=3)
+    second = Article.newest(limit=3, before_ts=first[-1].published_ts, before_id=first[-1].id)
+
+    titles = [a.title for a in first + second]
+    assert titles == ['Article 10', 'Article 4', 'Article 3', 'Article 2', 'Article 1', 'Article 0']
+
+def test_bulk_upsert_replaces_symbol_tags(app):
+    Article.bulk_upsert([dict(processed(1), symbols=['BTC', 'ETH']), dict(processed(2), symbols=['BTC'])])
+    Article.bulk_upsert([dict(processed(1), symbols=['SOL'])])
+
+    tags = {(row.article_id, row.symbol) for row in ArticleSymbol.query}
+    first = Article.query.filter_by(title='Article 1').one()
+    second = Article.query.filter_by(title='Article 2').one()
+    assert tags == {(first.id, 'SOL'), (second.id, 'BTC')}
+
+def test_newest_filters_by_symbol(app):
+    Article.bulk_upsert([dict(processed(n), symbols=['BTC'] if n % 2 else ['ETH']) for n in range(6)])
+
+    first = Article.newest(limit=2, symbol='BTC')
+    second = Article.newest(limit=2, symbol='BTC', before_ts=first[-1].published_ts, before_id=first[-1].id)
+
+    assert [a.title for a in first + second] == ['Article 5', 'Article 3', 'Article 1']
+
+def query_plan(query):
+    sql = str(query.statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+    return ' '.join(row[-1] for row in db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}")))
+
+def test_newest_pages_are_found_from_indexes_alone(app):
+    Article.bulk_upsert([dict(processed(n), symbols=['BTC']) for n in range(3)])
+
+    assert 'COVERING INDEX ix_article_published_ts_id' in query_plan(
+        Article.newest_keys_query(limit=2, before_ts=1_700_000_002, before_id=3)
+    )
+    assert 'COVERING INDEX ix_article_source_published_ts_id' in query_plan(
+        Article.newest_keys_query(limit=2, source='https://cointelegraph.com/rss')
+    )
+    assert 'COVERING INDEX ix_article_symbol_symbol_published' in query_plan(
+        Article.newest_keys_query(limit=2, symbol='BTC')
+    )
+
+def test_importing_the_app_does_not_touch_the_database(tmp_path):
+    script = (
+        "import sqlalchemy\n"
+        "from sqlalchemy.engine import Engine\n"
+        "connections = []\n"
+        "sqlalchemy.event.listen(Engine, 'connect', lambda *args: connections.append(1))\n"
+        "import app\n"
+        "print(len(connections))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', script], cwd=tmp_path,
+        env=dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip().splitlines()[-1] == '0'
+
+def rollup_rows():
+    return sorted(
+        (r.granularity, r.symbol, r.source, r.bucket_start, r.count,
+         round(r.polarity_sum, 6), r.polarity_min, r.polarity_max)
+        for r in SentimentRollup.query
+    )
+
+def test_rollups_are_incremental_and_match_a_rebuild(app):
+    Article.bulk_upsert([dict(processed(1, polarity=0.5), symbols=['BTC'])])
+    Article.bulk_upsert([
+        dict(processed(1, polarity=0.5), symbols=['BTC']),  # already stored: not counted again
+        dict(processed(2, polarity=-0.25), symbols=['BTC', 'ETH']),
+    ])
+
+    day = SentimentRollup.query.filter_by(granularity='day', symbol='BTC', source='*').one()
+    assert (day.count, day.polarity_min, day.polarity_max) == (2, -0.25, 0.5)
+
+    incremental = rollup_rows()
+    SentimentRollup.rebuild()
+    assert rollup_rows() == incremental
+
+def test_rollups_follow_updates_and_skip_undated_articles(app):
+    Article.bulk_upsert([
+        dict(processed(1, polarity=0.5), symbols=['BTC']),
+        dict(processed(2, polarity=-0.25), symbols=['BTC', 'ETH']),
+        dict(processed(3, polarity=0.9, published_ts=0), symbols=['BTC']),
+    ])
+    # Re-scored, re-tagged and moved to another day
+    Article.bulk_upsert([
+        dict(processed(1, polarity=0.1), symbols=['ETH']),
+        dict(processed(2, polarity=-0.25, published_ts=1_700_000_000 + 86400), symbols=['BTC', 'ETH']),
+    ])
+
+    assert SentimentRollup.query.filter_by(bucket_start=0).count() == 0
+    day = SentimentRollup.query.filter_by(granularity='day', symbol='ETH', source='*').all()
+    assert sorted((r.count, r.polarity_max) for r in day) == [(1, -0.25), (1, 0.1)]
+
+    incremental = rollup_rows()
+    SentimentRollup.rebuild()
+    assert rollup_rows() == incremental
+
+def test_series_uses_the_coarsest_fitting_rollup(app):
+    base = 1_700_006_400  # midnight UTC
+    Article.bulk_upsert([
+        dict(processed(n, polarity=0.1 * n, published_ts=base + n * 3600), symbols=['BTC'])
+        for n in range(48)
+    ])
+
+    assert SentimentRollup.pick_granularity(86400 * 7) == 'day'
+    assert SentimentRollup.pick_granularity(1800) == 'minute'
+
+    daily = SentimentRollup.series(base, base + 2 * 86400, resolution=86400, symbol='BTC')
+    assert [(p['bucket_start'], p['count']) for p in daily] == [(base, 24), (base + 86400, 24)]
+    assert daily[0]['polarity_max'] == pytest.approx(2.3)
+
+    six_hourly = SentimentRollup.series(base, base + 86400, resolution=6 * 3600)
+    assert [p['count'] for p in six_hourly] == [6, 6, 6, 6]
@@ -0,0 +1,75 @@
+import time
+import news_collector
+from requests.structures import CaseInsensitiveDict
+from news_collector import fetch_crypto_news, HostThrottle
+
+def test_feeds_are_fetched_concurrently(monkeypatch):
+    def slow_feed(feed_url, timeout=None):
+        time.sleep(0.2)
+        return [{'title': feed_url, 'published_date': '2025-02-08 22:30:35'}]
+
+    monkeypatch.setattr(news_collector, 'fetch_feed', slow_feed)
+
+    start = time.monotonic()
+    articles = fetch_crypto_news(max_articles=10, max_workers=len(news_collector.NEWS_FEEDS))
+    elapsed = time.monotonic() - start
+
+    assert len(articles) == len(news_collector.NEWS_FEEDS)
+    assert elapsed < 0.2 * len(news_collector.NEWS_FEEDS)
+
+def test_failing_feed_does_not_drop_others(monkeypatch):
+    def flaky_feed(feed_url, timeout=None):
+        if 'coindesk' in feed_url:
+            raise news_collector.NewsCollectionError("Timed out")
+        return [{'title': feed_url, 'published_date': '2025-02-08 22:30:35'}]
+
+    monkeypatch.setattr(news_collector, 'fetch_feed', flaky_feed)
+
+    articles = fetch_crypto_news(max_articles=10)
+
+    assert len(articles) == len(news_collector.NEWS_FEEDS) - 1
+
+def test_host_throttle_spaces_requests_per_host():
+    throttle = HostThrottle(min_interval=0.1)
+
+    start = time.monotonic()
+    throttle.wait('https://a.example/rss')
+    throttle.wait('https://b.example/rss')
+    assert time.monotonic() - start < 0.05
+
+    throttle.wait('https://a.example/other')
+    assert time.monotonic() - start >= 0.09
+
+def test_not_modified_feed_skips_parsing(monkeypatch, tmp_path):
+    url = news_collector.NEWS_FEEDS[0]
+    store = news_collector.FeedValidatorStore(str(tmp_path / 'validators.json'))
+    monkeypatch.setattr(news_collector, '_validator_store', store)
+    monkeypatch.setattr(news_collector, '_host_throttle', HostThrottle(0))
+
+    rss = (b'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>'
+           b'<item><title>Bitcoin rallies</title><link>https://example.com/1</link>'
+           b'<description>&lt;p&gt;Up&lt;/p&gt;</description></item></channel></rss>')
+    sent_headers = []
+
+    def fake_download(feed_url, timeout, headers=None):
+        sent_headers.append(headers)
+        if headers:
+            return 304, b'', {}
+        # Some servers send lowercase header names
+        return 200, rss, CaseInsensitiveDict({'etag': '"v1"', 'last-modified': 'Sat, 08 Feb 2025 22:30:35 GMT'})
+
+    monkeypatch.setattr(news_collector, 'download_feed', fake_download)
+    first = news_collector.fetch_feed(url, timeout=1)
+
+    parsed = []
+    monkeypatch.setattr(news_collector.feedparser, 'parse', lambda *a, **k: parsed.append(a))
+    second = news_collector.fetch_feed(url, timeout=1)
+
+    # After a restart the validators and articles come back from disk
+    monkeypatch.setattr(news_collector, '_validator_store', news_collector.FeedValidatorStore(store.path))
+    third = news_collector.fetch_feed(url, timeout=1)
+
+    conditional = {'If-None-Match': '"v1"', 'If-Modified-Since': 'Sat, 08 Feb 2025 22:30:35 GMT'}
+    assert sent_headers == [{}, conditional, conditional]
+    assert second == first and third == first and first[0]['title'] == 'Bitcoin rallies'
+    assert parsed == []
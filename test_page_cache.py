@@ -0,0 +1,63 @@
+import gzip
+from page_cache import PageCache
+
+def test_pages_render_once_per_version():
+    cache = PageCache()
+    renders = []
+
+    def render():
+        renders.append(1)
+        return f"<p>render {len(renders)}</p>"
+
+    first = cache.get_or_render('index', 1, render)
+    second = cache.get_or_render('index', 1, render)
+
+    assert first is second
+    assert len(renders) == 1
+    assert gzip.decompress(first.gzipped) == first.body == b"<p>render 1</p>"
+    assert cache.stats()['hit_ratio'] == 0.5
+
+def test_new_version_invalidates_old_pages():
+    cache = PageCache()
+    old = cache.get_or_render('index', 1, lambda: "old")
+    cache.invalidate(2)
+
+    new = cache.get_or_render('index', 2, lambda: "new")
+
+    assert (old.body, new.body) == (b"old", b"new")
+    assert old.etag != new.etag
+    assert cache.stats()['entries'] == 1
+
+def test_stale_versions_are_served_but_not_stored():
+    cache = PageCache()
+    cache.invalidate(5)
+
+    stale = cache.get_or_render('index', 4, lambda: "stale")
+
+    assert stale.body == b"stale"
+    assert cache.stats()['entries'] == 0
+
+def test_index_serves_cached_gzip_and_304(monkeypatch):
+    from config import config
+    monkeypatch.setattr(config, 'INGESTION_AUTOSTART', False)
+    import app
+    from ingestion import ArticleSnapshot
+    monkeypatch.setattr(app.scheduler, '_snapshot', ArticleSnapshot(version=99, articles=(), created_at=0.0))
+    monkeypatch.setattr(app, 'page_cache', PageCache())
+    client = app.app.test_client()
+
+    plain = client.get('/')
+    zipped = client.get('/', headers={'Accept-Encoding': 'gzip'})
+    revalidated = client.get('/', headers={'If-None-Match': plain.headers['ETag']})
+    zipped_revalidated = client.get('/', headers={
+        'Accept-Encoding': 'gzip', 'If-None-Match': zipped.headers['ETag']
+    })
+
+    assert b'No articles available' in plain.data
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(zipped.data) == plain.data
+    assert zipped.headers['ETag'] != plain.headers['ETag']
+    assert zipped.headers['Vary'] == 'Accept-Encoding'
+    assert revalidated.status_code == 304
+    assert zipped_revalidated.status_code == 304
+    assert app.page_cache.stats()['hits'] == 3
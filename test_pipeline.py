@@ -0,0 +1,78 @@
+import threading
+import pytest
+import news_collector
+import pipeline
+from pipeline import buffered, article_pipeline
+
+def make_feed_article(title):
+    return {
+        'title': title,
+        'summary': f"{title} had a great day",
+        'link': f"https://example.com/{title}",
+        'published_date': '2025-02-08 22:30:35',
+        'source': 'example.com'
+    }
+
+def test_buffered_preserves_order():
+    assert list(buffered(range(50), maxsize=4)) == list(range(50))
+
+def test_buffered_reraises_upstream_errors():
+    def failing():
+        yield 1
+        raise ValueError("boom")
+
+    stream = buffered(failing(), maxsize=2)
+    assert next(stream) == 1
+    with pytest.raises(ValueError):
+        next(stream)
+
+def test_buffered_stops_producer_when_closed():
+    produced = []
+    closed = threading.Event()
+
+    def endless():
+        try:
+            i = 0
+            while True:
+                produced.append(i)
+                yield i
+                i += 1
+        finally:
+            closed.set()
+
+    stream = buffered(endless(), maxsize=2)
+    assert next(stream) == 0
+    stream.close()
+
+    assert closed.wait(1.0)
+    # Bounded: only the buffered items (plus one in hand) were ever produced
+    assert len(produced) <= 5
+
+def test_article_pipeline_yields_before_all_feeds_finish(monkeypatch):
+    release_slow_feed = threading.Event()
+
+    def fetch_feed(feed_url, timeout=None):
+        if 'coindesk' in feed_url:
+            release_slow_feed.wait(2.0)
+        return [make_feed_article(feed_url.split('/')[2])]
+
+    monkeypatch.setattr(news_collector, 'fetch_feed', fetch_feed)
+
+    stream = article_pipeline(max_articles=10)
+    first = next(stream)
+    assert 'coindesk' not in first['url']
+    assert first['sentiment']['polarity'] > 0
+
+    release_slow_feed.set()
+    rest = list(stream)
+    assert len(rest) == len(news_collector.NEWS_FEEDS) - 1
+
+def test_process_article_matches_stage_output():
+    article = make_feed_article('a')
+    staged = next(pipeline.score_stage(pipeline.clean_stage([article])))
+    assert pipeline.process_article(article) == staged
+
+def test_process_articles_matches_one_at_a_time_processing():
+    articles = [make_feed_article('Bitcoin'), make_feed_article('Ethereum'), make_feed_article('Bitcoin')]
+
+    assert pipeline.process_articles(articles) == [pipeline.process_article(a) for a in articles]
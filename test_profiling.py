@@ -0,0 +1,103 @@
+import contextvars
+import threading
+import pytest
+from profiling import Profiler, sign, verify, PROFILE_HEADER
+
+SECRET = 'test-secret'
+
+def busy_work(n=2000):
+    return sum(i * i for i in range(n))
+
+def test_signatures_are_bound_to_path_secret_and_time():
+    header = sign('/', SECRET, timestamp=1_000)
+
+    assert verify(header, '/', SECRET, now=1_100)
+    assert not verify(header, '/search', SECRET, now=1_100)
+    assert not verify(header, '/', 'other-secret', now=1_100)
+    assert not verify(header, '/', SECRET, now=5_000)
+    assert not verify(header, '/', None, now=1_100)
+    assert not verify('garbage', '/', SECRET, now=1_100)
+
+def test_runs_are_written_and_pruned_to_the_cap(tmp_path):
+    profiler = Profiler(str(tmp_path), retain=2, top_n=5)
+
+    runs = []
+    for _ in range(3):
+        with profiler.profile('index') as run:
+            busy_work()
+        runs.append(run)
+
+    assert profiler.profiles() == [run.id for run in runs[1:]]
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        f"{run.id}{suffix}" for run in runs[1:] for suffix in ('.prof', '.txt')
+    )
+    assert len(runs[-1].top) <= 5
+    assert 'Top 5 by tottime' in (tmp_path / f"{runs[-1].id}.txt").read_text()
+
+def test_worker_threads_are_merged_into_the_run(tmp_path):
+    profiler = Profiler(str(tmp_path), retain=5, top_n=50)
+
+    def worker():
+        with profiler.worker():
+            busy_work(20000)
+
+    with profiler.profile('ingestion') as run:
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(worker,))
+        thread.start()
+        thread.join()
+
+    assert any('busy_work' in row['function'] for row in run.top)
+
+def test_workers_from_another_context_stay_out_of_the_run(tmp_path):
+    profiler = Profiler(str(tmp_path), retain=5, top_n=50)
+
+    def worker():
+        with profiler.worker():
+            busy_work(20000)
+
+    # Started without the run's context, like the ingestion thread during a profiled request
+    thread = threading.Thread(target=worker)
+    with profiler.profile('index') as run:
+        thread.start()
+        thread.join()
+
+    assert not any('busy_work' in row['function'] for row in run.top)
+
+def test_overlapping_runs_are_skipped(tmp_path):
+    profiler = Profiler(str(tmp_path), retain=5, top_n=5)
+
+    with profiler.profile('outer') as outer:
+        with profiler.profile('inner') as inner:
+            busy_work()
+
+    assert inner.id is None and outer.id is not None
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    from config import config
+    monkeypatch.setattr(config, 'INGESTION_AUTOSTART', False)
+    monkeypatch.setattr(config, 'PROFILE_SECRET', SECRET)
+    import app
+    monkeypatch.setattr(app.profiler, 'directory', str(tmp_path))
+    monkeypatch.setattr(app.scheduler, 'fetch', lambda: [])
+    return app.app.test_client()
+
+def test_signed_requests_are_profiled(client):
+    assert 'X-Profile-Id' not in client.get('/').headers
+    assert 'X-Profile-Id' not in client.get('/', headers={PROFILE_HEADER: sign('/', 'wrong')}).headers
+
+    response = client.get('/', headers={PROFILE_HEADER: sign('/', SECRET)})
+
+    assert response.status_code == 200
+    assert response.headers['X-Profile-Id'].endswith('-index')
+
+def test_ingestion_cycle_profile_requires_signature(client):
+    path = '/api/profile/ingestion'
+    assert client.post(path).status_code == 403
+
+    response = client.post(path, headers={PROFILE_HEADER: sign(path, SECRET)})
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['id'].endswith('-ingestion') and body['error'] is None
+    assert body['top']
@@ -0,0 +1,52 @@
+import pytest
+from rolling_sentiment import RollingSentiment, RollingSentimentError, RollingWindow
+
+NOW = 1_700_000_000
+
+def article(url, polarity, age, symbols=('BTC',)):
+    return {
+        'url': url,
+        'published_ts': NOW - age,
+        'sentiment': {'polarity': polarity, 'subjectivity': 0.5},
+        'symbols': list(symbols)
+    }
+
+def test_windows_only_count_recent_articles():
+    rolling = RollingSentiment()
+    rolling.add_articles([
+        article('a', 0.2, age=60),
+        article('b', 0.6, age=2 * 3600),
+        article('c', -0.4, age=3 * 24 * 3600),
+        article('d', 0.9, age=60, symbols=['ETH']),
+    ])
+
+    hour = rolling.stats('BTC', '1h', now=NOW)
+    day = rolling.stats('BTC', '24h', now=NOW)
+    week = rolling.stats('BTC', '7d', now=NOW)
+
+    assert (hour['count'], day['count'], week['count']) == (1, 2, 3)
+    assert day['polarity_mean'] == pytest.approx(0.4)
+    assert day['polarity_variance'] == pytest.approx(0.04)
+    assert week['subjectivity_variance'] == pytest.approx(0.0)
+
+def test_articles_are_counted_once():
+    rolling = RollingSentiment()
+    assert rolling.add_articles([article('a', 0.2, age=60)]) == 1
+    assert rolling.add_articles([article('a', 0.2, age=60)]) == 0
+    assert rolling.stats('BTC', '1h', now=NOW)['count'] == 1
+
+def test_buckets_expire_as_time_passes():
+    window = RollingWindow(span=3600, buckets=60)
+    window.add(NOW, 0.5, 0.5)
+
+    assert window.stats(NOW)['count'] == 1
+    assert window.stats(NOW + 3600)['count'] == 0
+    # A slot reused by a newer bucket drops observations older than it
+    window.add(NOW + 3600, 0.1, 0.1)
+    assert window.add(NOW, 0.5, 0.5) is False
+
+def test_unknown_symbol_and_window():
+    rolling = RollingSentiment()
+    assert rolling.stats('DOGE', '1h', now=NOW)['count'] == 0
+    with pytest.raises(RollingSentimentError):
+        rolling.stats('BTC', '2h')
@@ -0,0 +1,59 @@
+import pytest
+from search_index import SearchIndex, SearchError, parse_query
+from text_processing import extract_keywords
+
+NOW = 1_700_000_000
+DAY = 24 * 3600
+
+def make_article(n, title, summary='', age_days=0):
+    return {
+        'title': title,
+        'summary': summary,
+        'url': f"https://example.com/{n}",
+        'source': 'example.com',
+        'published_ts': NOW - age_days * DAY
+    }
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.add_many([
+        make_article(1, "Bitcoin spot ETF approved", "The SEC approved a spot ETF for bitcoin", age_days=30),
+        make_article(2, "Ethereum ETF filing", "Issuers file for a spot ether ETF"),
+        make_article(3, "Bitcoin hashrate record", "Miners push bitcoin hashrate higher", age_days=1),
+        make_article(4, "ETF spot demand", "Demand for the ETF in spot markets"),
+    ])
+    return index
+
+def urls(result):
+    return [r['url'].rsplit('/', 1)[1] for r in result['results']]
+
+def test_and_or_not(index):
+    assert sorted(urls(index.search("bitcoin etf", now=NOW))) == ['1']
+    assert sorted(urls(index.search("bitcoin OR ethereum", now=NOW))) == ['1', '2', '3']
+    assert sorted(urls(index.search("etf -bitcoin", now=NOW))) == ['2', '4']
+    assert sorted(urls(index.search("etf NOT bitcoin", now=NOW))) == ['2', '4']
+
+def test_phrase_requires_adjacent_terms(index):
+    assert urls(index.search('"spot etf"', now=NOW)) == ['1']
+    # Common words are not indexed but keep their slot in the phrase
+    assert urls(index.search('"file for a spot"', now=NOW)) == ['2']
+    assert urls(index.search('"file spot"', now=NOW)) == []
+
+def test_recent_articles_rank_first(index):
+    assert urls(index.search("bitcoin", now=NOW)) == ['3', '1']
+
+def test_adding_the_same_article_twice_is_a_noop(index):
+    assert index.add(make_article(1, "Bitcoin spot ETF approved")) is None
+    assert len(index) == 4
+
+def test_queries_without_terms_are_rejected(index):
+    with pytest.raises(SearchError):
+        index.search("the -bitcoin")
+
+def test_or_binds_tighter_than_and():
+    groups = parse_query("bitcoin etf OR etp")
+    assert [[c.terms for c in group] for group in groups] == [[('bitcoin',)], [('etf',), ('etp',)]]
+
+def test_extract_keywords_ignores_punctuation():
+    assert extract_keywords("Bitcoin! bitcoin, Ethereum and the ETF.", max_keywords=2) == ['bitcoin', 'ethereum']
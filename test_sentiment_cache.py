@@ -0,0 +1,119 @@
+from sentiment_cache import SentimentCache, normalize_text, text_key
+
+def test_lru_evicts_least_recently_used():
+    cache = SentimentCache(max_entries=2)
+    cache.put('a', (0.1, 0.2))
+    cache.put('b', (0.3, 0.4))
+    assert cache.get('a') == (0.1, 0.2)
+
+    cache.put('c', (0.5, 0.6))
+
+    assert cache.get('b') is None
+    assert cache.get('a') == (0.1, 0.2)
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['misses'] == 1
+
+def test_disk_level_survives_restart(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    SentimentCache(max_entries=10, path=path).put('a', (0.5, 0.75))
+
+    reopened = SentimentCache(max_entries=10, path=path)
+
+    assert reopened.get('a') == (0.5, 0.75)
+    assert reopened.get('a') == (0.5, 0.75)
+    stats = reopened.stats()
+    assert (stats['disk_hits'], stats['hits'], stats['misses']) == (1, 1, 0)
+
+def test_put_many_persists_every_entry(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = SentimentCache(max_entries=10, path=path)
+    cache.get('warm')  # open the file
+    before = cache._conn.total_changes
+
+    cache.put_many((f"k{n}", (n / 10, 0.5)) for n in range(5))
+
+    assert cache._conn.total_changes - before == 5
+    reopened = SentimentCache(max_entries=10, path=path)
+    assert [reopened.get(f"k{n}") for n in range(5)] == [(n / 10, 0.5) for n in range(5)]
+
+def test_score_texts_stores_fresh_scores_with_one_put_many(monkeypatch):
+    import classification
+
+    cache = SentimentCache(max_entries=100)
+    batches = []
+    monkeypatch.setattr(cache, 'put', lambda key, score: batches.append([key]))
+    original = cache.put_many
+    monkeypatch.setattr(cache, 'put_many', lambda items: batches.append(list(items)) or original(batches[-1]))
+    monkeypatch.setattr(classification, 'sentiment_cache', cache)
+
+    classification.score_texts(["Bitcoin rallies.", "Ether slips.", "Bitcoin rallies."])
+
+    assert len(batches) == 1 and len(batches[0]) == 2
+
+def test_disk_file_is_opened_on_first_use(tmp_path):
+    path = tmp_path / 'cache.sqlite3'
+    cache = SentimentCache(max_entries=10, path=str(path))
+    assert not path.exists()
+
+    assert cache.get('a') is None
+    assert path.exists()
+
+def test_key_ignores_whitespace_differences():
+    assert text_key(normalize_text(" Bitcoin  rallies\n")) == text_key(normalize_text("Bitcoin rallies"))
+
+def test_analyze_sentiment_scores_repeated_text_once(monkeypatch):
+    import classification
+
+    cache = SentimentCache(max_entries=10)
+    monkeypatch.setattr(classification, 'sentiment_cache', cache)
+
+    first = classification.analyze_sentiment("Bitcoin is great")
+    second = classification.analyze_sentiment("Bitcoin  is great")
+
+    assert (first.polarity, first.subjectivity) == (second.polarity, second.subjectivity)
+    assert cache.stats()['misses'] == 1 and cache.stats()['hits'] == 1
+
+def test_batch_matches_single_analysis_in_order(monkeypatch):
+    import classification
+
+    monkeypatch.setattr(classification, 'sentiment_cache', SentimentCache(max_entries=100))
+    texts = [
+        "Bitcoin reaches new all-time high as institutional investors pour in!",
+        "",
+        "Cryptocurrency market crashes, investors lose millions in devastating sell-off.",
+        "Bitcoin reaches new all-time high as institutional investors pour in!",
+        "Market analysts predict stable trading range for major cryptocurrencies.",
+    ]
+
+    pooled = classification.analyze_sentiment_batch(texts, use_cache=False, max_workers=2, chunk_size=1, min_parallel=1)
+    inline = classification.analyze_sentiment_batch(texts)
+    single = [classification.analyze_sentiment(text, use_cache=False) for text in texts]
+
+    assert pooled == single
+    assert inline == single
+
+def test_parallel_batches_reuse_one_pool(monkeypatch):
+    import classification
+
+    monkeypatch.setattr(classification, 'sentiment_cache', SentimentCache(max_entries=100))
+    texts = ["Bitcoin rallies on strong demand.", "Ethereum slips after a weak week."]
+    try:
+        classification.score_texts(texts, use_cache=False, max_workers=2, chunk_size=1, min_parallel=1)
+        pool = classification._pool
+        classification.score_texts(texts, use_cache=False, max_workers=2, chunk_size=1, min_parallel=1)
+
+        assert pool is not None and classification._pool is pool
+    finally:
+        classification.shutdown_pool()
+
+def test_legacy_analyzer_scores_like_the_batch_path(monkeypatch):
+    import classification
+    import sentiment_analyzer
+
+    monkeypatch.setattr(classification, 'sentiment_cache', SentimentCache(max_entries=100))
+    texts = ["  Bitcoin   reaches a new high!\n", "Markets  crash\tbadly."]
+
+    single = [sentiment_analyzer.analyze_sentiment(text) for text in texts]
+    batch = sentiment_analyzer.analyze_sentiment_batch(texts)
+
+    assert single == batch
@@ -0,0 +1,102 @@
+import os
+import subprocess
+import sys
+import pytest
+from ingestion import IngestionScheduler, IngestionError
+from shared_snapshot import SharedSnapshotStore, SharedSnapshotError
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def make_article(title):
+    return {'title': title, 'summary': f"{title} summary", 'link': f"https://example.com/{title}"}
+
+def make_scheduler(path, processed, titles=('a', 'b')):
+    def process(article):
+        processed.append(article['title'])
+        return dict(article, processed=True)
+    return IngestionScheduler(
+        fetch=lambda: [make_article(title) for title in titles],
+        process=process,
+        interval=60,
+        shared=SharedSnapshotStore(path)
+    )
+
+def test_followers_load_the_leaders_snapshots(tmp_path):
+    path = str(tmp_path / 'snapshots.sqlite3')
+    leader_processed, follower_processed = [], []
+    leader = make_scheduler(path, leader_processed)
+    follower = make_scheduler(path, follower_processed)
+    received, stored = [], []
+    follower.add_listener(received.append)
+    follower.add_listener(stored.append, producer_only=True)
+
+    published = leader.refresh()
+    loaded = follower.sync()
+
+    assert (loaded.version, loaded.articles, loaded.new_articles) == (
+        published.version, published.articles, published.new_articles
+    )
+    assert received == [loaded] and stored == []
+    assert follower.sync() is None
+    with pytest.raises(IngestionError):
+        follower.refresh()
+    assert follower_processed == []
+
+def test_takeover_continues_versions_and_reuses_results(tmp_path):
+    path = str(tmp_path / 'snapshots.sqlite3')
+    leader_processed, follower_processed = [], []
+    leader = make_scheduler(path, leader_processed)
+    follower = make_scheduler(path, follower_processed, titles=('a', 'b', 'c'))
+
+    leader.refresh()
+    leader.refresh()
+    leader.shared.release_lease()
+    snapshot = follower.refresh()
+
+    assert snapshot.version == 3
+    assert follower_processed == ['c']
+    assert [a['title'] for a in snapshot.new_articles] == ['c']
+    # The old leader cannot publish over the new one
+    with pytest.raises(IngestionError):
+        leader.refresh()
+
+def test_lease_expires_and_lost_lease_blocks_publishing(tmp_path):
+    path = str(tmp_path / 'snapshots.sqlite3')
+    first = SharedSnapshotStore(path, lease_seconds=10)
+    second = SharedSnapshotStore(path, lease_seconds=10)
+
+    assert first.acquire_lease(now=100)
+    assert first.acquire_lease(now=105)
+    assert not second.acquire_lease(now=114)
+    assert second.acquire_lease(now=116)
+    with pytest.raises(SharedSnapshotError):
+        first.publish(1, 116.0, (), ())
+
+def test_only_the_newest_versions_are_retained(tmp_path):
+    store = SharedSnapshotStore(str(tmp_path / 'snapshots.sqlite3'), retain=3)
+    assert store.acquire_lease()
+    for version in range(1, 6):
+        article = make_article(str(version))
+        store.publish(version, float(version), (article,), (('key', version),), (article,))
+
+    with pytest.raises(SharedSnapshotError):
+        store.publish(5, 6.0, (), ())
+    assert [s.version for s in store.load_since(0)] == [3, 4, 5]
+    assert store.load_since(4)[0].keys == (('key', 5),)
+
+def test_snapshots_cross_process_boundaries(tmp_path):
+    path = str(tmp_path / 'snapshots.sqlite3')
+    follower = make_scheduler(path, [])
+    assert follower.sync() is None
+
+    script = (
+        "import sys\n"
+        "from shared_snapshot import SharedSnapshotStore\n"
+        "store = SharedSnapshotStore(sys.argv[1])\n"
+        "assert store.acquire_lease()\n"
+        "article = {'title': 'x'}\n"
+        "store.publish(1, 1.0, (article,), (('x',),), (article,))\n"
+    )
+    subprocess.run([sys.executable, '-c', script, path], cwd=REPO_ROOT, check=True)
+
+    assert follower.sync().articles == ({'title': 'x'},)
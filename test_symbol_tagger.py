@@ -0,0 +1,31 @@
+from symbol_tagger import AhoCorasick, SymbolTagger, symbol_tagger
+
+def test_aliases_and_tickers_are_tagged_in_order():
+    text = "Ether slips as $BTC holds; Tether mints more USDT"
+    assert symbol_tagger.tag(text) == ['ETH', 'BTC', 'USDT']
+
+def test_matches_must_be_whole_words():
+    assert symbol_tagger.tag("bitcoins and ethereumX are not tags") == []
+
+def test_ambiguous_tickers_need_capitals():
+    assert symbol_tagger.tag("SOL rallied") == ['SOL']
+    assert symbol_tagger.tag("a link to the sol plaza, dot com") == []
+
+def test_project_names_that_are_ordinary_words_are_not_tags():
+    text = "A Ripple of selling became an Avalanche; Tron and Polygon cited Stellar Lumens"
+    assert symbol_tagger.tag(text) == []
+    assert symbol_tagger.tag("XRP, AVAX and MATIC slide") == ['XRP', 'AVAX', 'MATIC']
+
+def test_longest_overlapping_match_wins():
+    assert symbol_tagger.tag("Bitcoin Cash forks again") == ['BCH']
+
+def test_automaton_reports_overlapping_patterns():
+    automaton = AhoCorasick()
+    for pattern in ('he', 'she', 'his', 'hers'):
+        automaton.add(pattern, pattern)
+    found = sorted((start, value) for start, _, value, _ in automaton.search("ushers"))
+    assert found == [(1, 'she'), (2, 'he'), (2, 'hers')]
+
+def test_custom_dictionary():
+    tagger = SymbolTagger({'PEPE': ('pepe coin',)})
+    assert tagger.tag("Pepe Coin and PEPE") == ['PEPE']
@@ -0,0 +1,22 @@
+from bs4 import BeautifulSoup
+from text_processing import strip_html, clean_text
+import pytest
+
+@pytest.mark.parametrize("html", [
+    "<p>Hello &amp; <b>world</b></p>",
+    "a<br/>b",
+    "<!-- comment -->x<script>var a = 1 < 2;</script><style>p {}</style>y",
+    "<![CDATA[raw <b>]]>z",
+    "<p>unclosed <a hre",
+    "&lt;3 &#8217; &nbsp;",
+    "<!DOCTYPE html><html><body>t</body></html>",
+    "5 < 6 and 7 > 3",
+    "<img src='x' alt='pic'>after",
+    "plain text only",
+])
+def test_strip_html_matches_beautifulsoup(html):
+    assert strip_html(html) == BeautifulSoup(html, 'html.parser').get_text()
+
+def test_clean_text_skips_parse_for_stripped_text():
+    html = "<p>Bitcoin hits <b>$60,000</b>!</p>"
+    assert clean_text(strip_html(html), strip_markup=False) == clean_text(html)
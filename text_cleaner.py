@@ -1,5 +1,5 @@
-from bs4 import BeautifulSoup
-import re
+from cleaning_engine import HTMLStageError, alphabetic_plan
+from typing import List
 
 def clean_text(html_content):
     """
@@ -11,22 +11,21 @@ def clean_text(html_content):
     Returns:
         str: Cleaned text containing only alphabetic characters and spaces
     """
-    # Step 1: Remove HTML tags using BeautifulSoup
+    # Remove HTML tags, drop non-alphabetic characters, normalize spaces
+    # and lowercase, using the precompiled plan from cleaning_engine
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
-        text_content = soup.get_text()
-    except Exception as e:
+        return alphabetic_plan().clean(html_content)
+    except HTMLStageError as e:
         print(f"Error parsing HTML: {e}")
         return ""
-    
-    # Step 2: Remove non-alphabetic characters using regex
-    # This keeps only letters and spaces, converting to lowercase
-    cleaned_text = re.sub(r'[^a-zA-Z\s]', '', text_content)
-    
-    # Step 3: Normalize spaces (remove extra whitespace)
-    cleaned_text = ' '.join(cleaned_text.split())
-    
-    return cleaned_text.lower()
+
+def clean_many(html_contents: List[str]) -> List[str]:
+    """Clean a batch of HTML strings; same output as `clean_text` on each"""
+    try:
+        return alphabetic_plan().clean_many(html_contents)
+    except HTMLStageError:
+        # Retry one by one so a bad document only blanks itself
+        return [clean_text(html_content) for html_content in html_contents]
 
 # Example usage and test cases
 if __name__ == "__main__":
@@ -1,7 +1,8 @@
-from bs4 import BeautifulSoup
+from cleaning_engine import processing_plan, strip_html
 import re
 import logging
-from typing import Optional
+from collections import Counter
+from typing import List, Optional
 
 # Configure logging
 logging.basicConfig(
@@ -14,11 +15,21 @@ class TextProcessingError(Exception):
     """Custom exception for text processing errors"""
     pass
 
+# Words too common to be keywords or search terms
+COMMON_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'is', 'are'})
+
+_TERM_RE = re.compile(r'\w+')
+
+def tokenize_terms(text: str) -> List[str]:
+    """Split text into lowercase word tokens, in order, common words included"""
+    return _TERM_RE.findall(text.lower())
+
 def clean_text(
     text: str,
     preserve_numbers: bool = True,
     preserve_urls: bool = True,
-    max_length: Optional[int] = None
+    max_length: Optional[int] = None,
+    strip_markup: bool = True
 ) -> str:
     """
     Clean and normalize text content.
@@ -28,6 +39,8 @@ def clean_text(
         preserve_numbers: Whether to keep numbers in text
         preserve_urls: Whether to keep URLs in text
         max_length: Maximum length of output text
+        strip_markup: Whether the input may contain HTML; pass False for
+            text that has already been through `strip_html`
         
     Returns:
         Cleaned text string
@@ -36,39 +49,28 @@ def clean_text(
         if not text:
             return ""
 
-        # Remove HTML tags
-        soup = BeautifulSoup(text, 'html.parser')
-        text = soup.get_text()
+        plan = processing_plan(preserve_numbers, preserve_urls, max_length, strip_markup)
+        return plan.clean(text)
 
-        # Preserve URLs if requested
-        urls = []
-        if preserve_urls:
-            url_pattern = r'https?://\S+'
-            urls = re.findall(url_pattern, text)
-
-        # Remove special characters and extra whitespace
-        text = re.sub(r'[^\w\s]', ' ', text)
-        
-        # Handle numbers
-        if not preserve_numbers:
-            text = re.sub(r'\d+', '', text)
-
-        # Normalize whitespace
-        text = ' '.join(text.split())
-
-        # Reinsert URLs if preserved
-        if preserve_urls and urls:
-            for url in urls:
-                text = text + f" {url}"
-
-        # Truncate if maximum length specified
-        if max_length and len(text) > max_length:
-            text = text[:max_length].rsplit(' ', 1)[0] + '...'
+    except Exception as e:
+        error_msg = f"Error cleaning text: {str(e)}"
+        logger.error(error_msg)
+        raise TextProcessingError(error_msg)
 
-        return text.strip()
+def clean_many(
+    texts: List[str],
+    preserve_numbers: bool = True,
+    preserve_urls: bool = True,
+    max_length: Optional[int] = None,
+    strip_markup: bool = True
+) -> List[str]:
+    """Clean a batch of texts; same options and output as `clean_text`"""
+    try:
+        plan = processing_plan(preserve_numbers, preserve_urls, max_length, strip_markup)
+        return plan.clean_many(text or "" for text in texts)
 
     except Exception as e:
-        error_msg = f"Error cleaning text: {str(e)}"
+        error_msg = f"Error cleaning texts: {str(e)}"
         logger.error(error_msg)
         raise TextProcessingError(error_msg)
 
@@ -76,18 +78,10 @@ def extract_keywords(text: str, max_keywords: int = 5) -> list:
     """Extract key words from text"""
     try:
         # Remove common words and punctuation
-        common_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'is', 'are'}
-        words = text.lower().split()
-        words = [w for w in words if w not in common_words and len(w) > 2]
+        words = [w for w in tokenize_terms(text) if w not in COMMON_WORDS and len(w) > 2]
         
-        # Count word frequencies
-        word_freq = {}
-        for word in words:
-            word_freq[word] = word_freq.get(word, 0) + 1
-            
-        # Sort by frequency and return top words
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        return [word for word, _ in sorted_words[:max_keywords]]
+        # Count word frequencies; ties keep first-seen order
+        return [word for word, _ in Counter(words).most_common(max_keywords)]
         
     except Exception as e:
         logger.error(f"Error extracting keywords: {e}")